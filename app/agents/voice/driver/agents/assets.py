@@ -0,0 +1,169 @@
+"""
+Prompt and tool-schema assets of every agent, built once per process.
+
+The system prompts are large f-strings and the tool schemas are ToolsSchema
+objects; both only depend on the (agent, language) pair. Each agent module
+registers its builders here, and load_bot_models builds them for every
+supported language (before the zygote forks) so that all sessions share them.
+The stored messages are read-only; AgentAssets.messages() hands each session
+its own list, since LLMContext appends the conversation to it.
+
+Each agent's system prompt is its module's STATIC_PROMPT followed by a short
+language suffix. STATIC_PROMPT is identical for every language and session,
+so providers can serve it from their prompt cache as a shared prefix; values
+that vary go in the suffix only (the "static" column below is that prefix).
+
+Token counts of every prompt and tool schema, as the LLM sees them on each
+call:
+
+    python -m app.agents.voice.driver.agents.assets
+"""
+import json
+import os
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Tuple
+
+from loguru import logger
+
+from pipecat.adapters.schemas.tools_schema import ToolsSchema
+
+from app.schemas import LanguageCode
+
+
+# Encoding of the gpt-4.1/gpt-4o family used by OpenAILLMService
+TOKEN_ENCODING = "o200k_base"
+
+
+@dataclass(frozen=True)
+class AgentAssets:
+    """Everything about an agent that only depends on its language."""
+
+    agent_name: str
+    language: str
+    system_messages: Tuple[Mapping[str, str], ...]
+    tools: ToolsSchema
+    opening_utterance: str
+
+    def messages(self) -> List[Dict[str, str]]:
+        """A fresh copy of the system messages for one session's LLMContext."""
+        return [dict(message) for message in self.system_messages]
+
+
+# agent_name -> (prompt builder, tool schema builder, opening utterance per language)
+_BUILDERS: Dict[str, Tuple[Callable[[str], List[dict]], Callable[[], ToolsSchema], Dict[str, str]]] = {}
+# One ToolsSchema per agent; the schemas do not depend on the language
+_TOOLS: Dict[str, ToolsSchema] = {}
+_ASSETS: Dict[Tuple[str, str], AgentAssets] = {}
+_lock = threading.Lock()
+
+
+def _build(agent_name: str, language: str) -> AgentAssets:
+    build_prompt, build_tools, opening_utterances = _BUILDERS[agent_name]
+    if agent_name not in _TOOLS:
+        _TOOLS[agent_name] = build_tools()
+    return AgentAssets(
+        agent_name=agent_name,
+        language=language,
+        system_messages=tuple(MappingProxyType(dict(message)) for message in build_prompt(language)),
+        tools=_TOOLS[agent_name],
+        opening_utterance=opening_utterances.get(language, opening_utterances["ta"]),
+    )
+
+
+def register_agent(
+    agent_name: str,
+    build_prompt: Callable[[str], List[dict]],
+    build_tools: Callable[[], ToolsSchema],
+    opening_utterances: Dict[str, str],
+):
+    """Called by each agent module with the functions its assets are built from."""
+    _BUILDERS[agent_name] = (build_prompt, build_tools, opening_utterances)
+
+
+def get_agent_assets(agent_name: str, language: str) -> AgentAssets:
+    """Assets of `agent_name` in `language`; languages outside LanguageCode are built on first use."""
+    assets = _ASSETS.get((agent_name, language))
+    if assets is None:
+        if agent_name not in _BUILDERS:
+            raise ValueError(f"Unknown agent_name: {agent_name}")
+        with _lock:
+            assets = _ASSETS.get((agent_name, language))
+            if assets is None:
+                assets = _ASSETS[(agent_name, language)] = _build(agent_name, language)
+    return assets
+
+
+def build_all_assets():
+    """Build the assets of every registered agent in every LanguageCode; cheap once built."""
+    built = len(_ASSETS)
+    for agent_name in list(_BUILDERS):
+        for language in LanguageCode:
+            get_agent_assets(agent_name, language.value)
+    if len(_ASSETS) > built:
+        logger.info(f"[ASSETS] Built prompt and tool assets for {len(_ASSETS) - built} agent/language pairs")
+
+
+def token_counter() -> Tuple[Callable[[str], int], bool]:
+    """Exact counts with tiktoken when installed, otherwise ~4 characters per token."""
+    try:
+        import tiktoken
+    except ImportError:
+        return (lambda text: (len(text) + 3) // 4), False
+    encoding = tiktoken.get_encoding(TOKEN_ENCODING)
+    return (lambda text: len(encoding.encode(text))), True
+
+
+def token_report() -> List[Dict[str, object]]:
+    """Prompt and tool-schema token counts of every built agent/language pair."""
+    from pipecat.adapters.services.open_ai_adapter import OpenAILLMAdapter
+
+    count, exact = token_counter()
+    adapter = OpenAILLMAdapter()
+    prompts = {
+        key: "".join(message["content"] for message in assets.system_messages)
+        for key, assets in _ASSETS.items()
+    }
+    # The part of an agent's prompt shared by all its languages, which the
+    # provider can serve from its prompt cache
+    static_prefixes = {
+        agent_name: os.path.commonprefix([prompt for (name, _), prompt in prompts.items() if name == agent_name])
+        for agent_name, _ in prompts
+    }
+    rows = []
+    for (agent_name, language), assets in sorted(_ASSETS.items()):
+        prompt = prompts[(agent_name, language)]
+        tools = json.dumps(adapter.to_provider_tools_format(assets.tools), ensure_ascii=False)
+        rows.append({
+            "agent": agent_name,
+            "language": language,
+            "prompt_chars": len(prompt),
+            "prompt_tokens": count(prompt),
+            "static_tokens": count(static_prefixes[agent_name]),
+            "tools_tokens": count(tools),
+            "exact": exact,
+        })
+    return rows
+
+
+def main():
+    # Importing the agents registers them
+    import app.agents.voice.driver.agents.not_getting_rides.agent  # noqa: F401
+    import app.agents.voice.driver.agents.rc_dl_issues.agent  # noqa: F401
+    import app.agents.voice.driver.agents.ride_related_issues.agent  # noqa: F401
+
+    build_all_assets()
+    rows = token_report()
+    exact = all(row["exact"] for row in rows)
+    print(f"Token counts ({TOKEN_ENCODING})" if exact else "Token counts (~estimate, pip install tiktoken for exact counts)")
+    print(f"{'agent':<22} {'lang':<5} {'chars':>7} {'prompt':>7} {'static':>7} {'tools':>6} {'total':>6}")
+    for row in sorted(rows, key=lambda row: row["prompt_tokens"] + row["tools_tokens"], reverse=True):
+        print(
+            f"{row['agent']:<22} {row['language']:<5} {row['prompt_chars']:>7} {row['prompt_tokens']:>7} {row['static_tokens']:>7} "
+            f"{row['tools_tokens']:>6} {row['prompt_tokens'] + row['tools_tokens']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -8,9 +8,20 @@ from pipecat.adapters.schemas.tools_schema import ToolsSchema
 
 from app.core.session_manager import get_session_manager
 from app.agents.voice.driver.llm import get_llm_service
-from app.agents.voice.driver.agents.not_getting_rides.function_handler import NotGettingRidesHandlers
-from app.agents.voice.driver.agents.not_getting_rides.system_prompt import get_not_getting_rides_system_prompt
+from app.agents.voice.driver.utils.prefetch import ToolPrefetch, start_prefetch
+from app.agents.voice.driver.agents.not_getting_rides.function_handler import (
+    DEFAULT_TIME_QUANTITY,
+    DEFAULT_TIME_TILL_NOT_GETTING_RIDES,
+    NotGettingRidesHandlers,
+    call_mcp_tool,
+)
+from app.agents.voice.driver.agents.not_getting_rides.system_prompt import GREETINGS, get_not_getting_rides_system_prompt
 from app.agents.voice.driver.agents.not_getting_rides.tool_schema import get_not_getting_rides_tool_schema
+from app.agents.voice.driver.agents.assets import get_agent_assets, register_agent
+from app.schemas import AgentName
+
+
+register_agent(AgentName.NOT_GETTING_RIDES.value, get_not_getting_rides_system_prompt, get_not_getting_rides_tool_schema, GREETINGS)
 
 
 
@@ -50,8 +61,27 @@ class NotGettingRidesAgent:
     def get_llm(self) -> LLMService:
         return self.llm
 
-    def get_system_prompt(self) -> str:
-        return get_not_getting_rides_system_prompt(language=self.language)
+    def get_system_prompt(self) -> list:
+        return get_agent_assets(AgentName.NOT_GETTING_RIDES.value, self.language).messages()
 
     def get_tools(self) -> ToolsSchema:
-        return get_not_getting_rides_tool_schema()
\ No newline at end of file
+        return get_agent_assets(AgentName.NOT_GETTING_RIDES.value, self.language).tools
+
+    def get_opening_utterance(self) -> str:
+        """Fixed first bot turn, the greeting the system prompt asks the LLM for."""
+        return get_agent_assets(AgentName.NOT_GETTING_RIDES.value, self.language).opening_utterance
+
+    async def start_prefetch(self) -> ToolPrefetch:
+        """
+        Start get_driver_info for the default window while the greeting
+        plays. Wasted if the driver names another window.
+        """
+        driver_number = await self.session_manager.get_value(self.session_id, "driver_number")
+        calls = []
+        if driver_number:
+            calls.append(("get_driver_info", {
+                "mobile_number": driver_number,
+                "time_till_not_getting_rides": DEFAULT_TIME_TILL_NOT_GETTING_RIDES,
+                "time_quantity": DEFAULT_TIME_QUANTITY,
+            }))
+        return await start_prefetch(self.session_id, call_mcp_tool, calls)
@@ -4,11 +4,16 @@ import os
 from loguru import logger
 from pipecat.services.llm_service import FunctionCallParams
 from app.core.session_manager import get_session_manager
+from app.agents.voice.driver.utils.prefetch import call_tool_with_prefetch
 
 from typing import Dict
 
 MCP_SERVER_URL = os.getenv("MCP_SERVER_URL", "http://localhost:8000")
 
+# Window the system prompt tells the LLM to use when the driver gives none
+DEFAULT_TIME_TILL_NOT_GETTING_RIDES = 2
+DEFAULT_TIME_QUANTITY = "HOUR"
+
 async def call_mcp_tool(tool_name: str, parameters: dict = None):
     """Call MCP server tool"""
     async with httpx.AsyncClient(timeout=25) as client:
@@ -76,7 +81,7 @@ class NotGettingRidesHandlers:
 
         logger.info(f"time_till_not_getting_rides: {time_till_not_getting_rides}, time_quantity: {time_quantity}")
 
-        result = await call_mcp_tool("get_driver_info", {"mobile_number": mobile_number, "time_till_not_getting_rides": time_till_not_getting_rides, "time_quantity": time_quantity})
+        result = await call_tool_with_prefetch(session_id, call_mcp_tool, "get_driver_info", {"mobile_number": mobile_number, "time_till_not_getting_rides": time_till_not_getting_rides, "time_quantity": time_quantity})
 
         if isinstance(result, dict):
             if result.get("success") == False:
@@ -2,9 +2,15 @@ from pipecat.services.llm_service import LLMService
 from pipecat.adapters.schemas.tools_schema import ToolsSchema
 from app.core.session_manager import get_session_manager
 from app.agents.voice.driver.llm import get_llm_service
-from app.agents.voice.driver.agents.rc_dl_issues.function_handler import RC_DL_IssuesHandlers
-from app.agents.voice.driver.agents.rc_dl_issues.system_prompt import get_rc_dl_issues_system_prompt
+from app.agents.voice.driver.utils.prefetch import ToolPrefetch, start_prefetch
+from app.agents.voice.driver.agents.rc_dl_issues.function_handler import RC_DL_IssuesHandlers, call_mcp_tool
+from app.agents.voice.driver.agents.rc_dl_issues.system_prompt import INITIAL_MOVE, get_rc_dl_issues_system_prompt
 from app.agents.voice.driver.agents.rc_dl_issues.tool_schema import get_rc_dl_issues_tool_schema
+from app.agents.voice.driver.agents.assets import get_agent_assets, register_agent
+from app.schemas import AgentName
+
+
+register_agent(AgentName.RC_DL_ISSUES.value, get_rc_dl_issues_system_prompt, get_rc_dl_issues_tool_schema, INITIAL_MOVE)
 
 
 class RC_DL_IssuesAgent:
@@ -33,8 +39,19 @@ class RC_DL_IssuesAgent:
     def get_llm(self) -> LLMService:
         return self.llm
         
-    def get_system_prompt(self) -> str:
-        return get_rc_dl_issues_system_prompt(language=self.language)
+    def get_system_prompt(self) -> list:
+        return get_agent_assets(AgentName.RC_DL_ISSUES.value, self.language).messages()
 
     def get_tools(self) -> ToolsSchema:
-        return get_rc_dl_issues_tool_schema()
\ No newline at end of file
+        return get_agent_assets(AgentName.RC_DL_ISSUES.value, self.language).tools
+
+    def get_opening_utterance(self) -> str:
+        """Fixed first bot turn, STEP 1 of the system prompt."""
+        return get_agent_assets(AgentName.RC_DL_ISSUES.value, self.language).opening_utterance
+
+    async def start_prefetch(self) -> ToolPrefetch:
+        """Start get_doc_status while the greeting plays."""
+        driver_number = await self.session_manager.get_value(self.session_id, "driver_number")
+        calls = [("get_doc_status", {"mobile_number": driver_number})] if driver_number else []
+        return await start_prefetch(self.session_id, call_mcp_tool, calls)
+
@@ -4,6 +4,7 @@ import os
 from loguru import logger
 from pipecat.services.llm_service import FunctionCallParams
 from app.core.session_manager import get_session_manager
+from app.agents.voice.driver.utils.prefetch import call_tool_with_prefetch
 
 from typing import Dict
 
@@ -59,7 +60,7 @@ class RC_DL_IssuesHandlers:
             await params.result_callback(error_result)
             return
 
-        result = await call_mcp_tool("get_doc_status", {"mobile_number": mobile_number})
+        result = await call_tool_with_prefetch(session_id, call_mcp_tool, "get_doc_status", {"mobile_number": mobile_number})
 
         await params.result_callback(result)
 
@@ -42,26 +42,7 @@ DL_DOCUMENT = {
 }
 
 
-def get_rc_dl_issues_system_prompt(language: str = "ta"):
-    """
-    Generate the system prompt for the RC/DL issues agent.
-    
-    Args:
-        language: Language code (ta, kn, hi, ml, en). Defaults to "ta".
-    
-    Returns:
-        List of message dictionaries for the LLM context.
-    """
-    irrelevant_response = IRRELEVANT_QUESTION_RESPONSES.get(language, IRRELEVANT_QUESTION_RESPONSES["ta"])
-    support_team = SUPPORT_TEAM.get(language, SUPPORT_TEAM["ta"])
-    initial_move = INITIAL_MOVE.get(language, INITIAL_MOVE["ta"])
-    rc_document = RC_DOCUMENT.get(language, RC_DOCUMENT["ta"])
-    dl_document = DL_DOCUMENT.get(language, DL_DOCUMENT["ta"])
-    
-    return [
-        {
-            "role": "system",
-            "content": f"""
+STATIC_PROMPT = """
             You are a Nammayatri support agent specifically designed to help drivers with documentations like RC, DL, etc. related issues.
             Be empathetic, helpful, and professional when dealing with driver concerns.
             
@@ -69,7 +50,7 @@ def get_rc_dl_issues_system_prompt(language: str = "ta"):
 
             You have access to these tools:
             1. get_doc_status - Get the status of the driver's documents (RC, DL, etc.).
-            2. bot_fail_to_resolve - Tool to escalate the call to {support_team} team.
+            2. bot_fail_to_resolve - Tool to escalate the call to [SUPPORT TEAM] team.
 
             
 
@@ -77,15 +58,15 @@ def get_rc_dl_issues_system_prompt(language: str = "ta"):
             NAMMA YATRI DRIVER SUPPORT WORKFLOW FOR DOCUMENTATION ISSUES:
 
             STEP 1: ASK ABOUT THE ISSUE
-            "{initial_move}"
+            "[OPENING QUESTION]"
 
             STEP 2: HANDLE BASED ON ISSUE TYPE
 
-            **IF THE DRIVER CANNOT UPLOAD {rc_document} OR {dl_document}:**
+            **IF THE DRIVER CANNOT UPLOAD [RC] OR [DL]:**
             - Apologize to the driver for the inconvenience they are facing.
-            - Immediately use the bot_fail_to_resolve tool to escalate the call to the {support_team} team, as upload issues require manual intervention.
+            - Immediately use the bot_fail_to_resolve tool to escalate the call to the [SUPPORT TEAM] team, as upload issues require manual intervention.
 
-            **IF THE DRIVER CANNOT ACTIVATE {rc_document} OR {dl_document}:**
+            **IF THE DRIVER CANNOT ACTIVATE [RC] OR [DL]:**
             - Apologize to the driver for the inconvenience they are facing.
             - Call the get_doc_status tool to check the current status of their documents.
             - Inform the driver about the status returned by the tool clearly and in detail.
@@ -94,11 +75,41 @@ def get_rc_dl_issues_system_prompt(language: str = "ta"):
             STEP 3: ASK FOR FURTHER ASSISTANCE
             After explaining the document status, ask the driver if they need any further assistance.
             
-            If they need more help, use the bot_fail_to_resolve tool to escalate the call to the {support_team} team.
+            If they need more help, use the bot_fail_to_resolve tool to escalate the call to the [SUPPORT TEAM] team.
 
-            If the driver asks irrelevant questions other than nammayatri issues, tell them: "{irrelevant_response}"
+            If the driver asks irrelevant questions other than nammayatri issues, tell them: "[IRRELEVANT QUESTION RESPONSE]"
 
             Be patient, clear, and professional in all interactions.
             """
-        }
+
+
+def get_rc_dl_issues_system_prompt(language: str = "ta"):
+    """
+    Generate the system prompt for the RC/DL issues agent.
+    
+    Args:
+        language: Language code (ta, kn, hi, ml, en). Defaults to "ta".
+    
+    Returns:
+        List of message dictionaries for the LLM context.
+    """
+    irrelevant_response = IRRELEVANT_QUESTION_RESPONSES.get(language, IRRELEVANT_QUESTION_RESPONSES["ta"])
+    support_team = SUPPORT_TEAM.get(language, SUPPORT_TEAM["ta"])
+    initial_move = INITIAL_MOVE.get(language, INITIAL_MOVE["ta"])
+    rc_document = RC_DOCUMENT.get(language, RC_DOCUMENT["ta"])
+    dl_document = DL_DOCUMENT.get(language, DL_DOCUMENT["ta"])
+    
+    return [
+        {
+            "role": "system",
+            "content": STATIC_PROMPT + f"""
+            LANGUAGE DETAILS:
+            The placeholders in square brackets above stand for these values in the driver's language:
+            [OPENING QUESTION]: {initial_move}
+            [SUPPORT TEAM]: {support_team}
+            [RC]: {rc_document}
+            [DL]: {dl_document}
+            [IRRELEVANT QUESTION RESPONSE]: {irrelevant_response}
+            """,
+        },
     ]
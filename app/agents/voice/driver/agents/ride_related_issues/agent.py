@@ -8,9 +8,15 @@ from pipecat.adapters.schemas.tools_schema import ToolsSchema
 
 from app.core.session_manager import get_session_manager
 from app.agents.voice.driver.llm import get_llm_service
-from app.agents.voice.driver.agents.ride_related_issues.system_prompt import get_ride_related_issues_system_prompt
-from app.agents.voice.driver.agents.ride_related_issues.function_handler import RideIssueHandlers
+from app.agents.voice.driver.agents.ride_related_issues.system_prompt import INITIAL_MOVE, get_ride_related_issues_system_prompt
+from app.agents.voice.driver.utils.prefetch import ToolPrefetch, start_prefetch
+from app.agents.voice.driver.agents.ride_related_issues.function_handler import RideIssueHandlers, call_mcp_tool
 from app.agents.voice.driver.agents.ride_related_issues.tool_schema import get_ride_related_issues_tool_schema
+from app.agents.voice.driver.agents.assets import get_agent_assets, register_agent
+from app.schemas import AgentName
+
+
+register_agent(AgentName.RIDE_RELATED_ISSUES.value, get_ride_related_issues_system_prompt, get_ride_related_issues_tool_schema, INITIAL_MOVE)
 
 
 class RideIssueAgent:
@@ -40,8 +46,19 @@ class RideIssueAgent:
     def get_llm(self) -> LLMService:
         return self.llm
 
-    def get_system_prompt(self) -> str:
-        return get_ride_related_issues_system_prompt(language=self.language)
+    def get_system_prompt(self) -> list:
+        return get_agent_assets(AgentName.RIDE_RELATED_ISSUES.value, self.language).messages()
 
     def get_tools(self) -> ToolsSchema:
-        return get_ride_related_issues_tool_schema()
\ No newline at end of file
+        return get_agent_assets(AgentName.RIDE_RELATED_ISSUES.value, self.language).tools
+
+    def get_opening_utterance(self) -> str:
+        """Fixed first bot turn, STEP 1 of the system prompt."""
+        return get_agent_assets(AgentName.RIDE_RELATED_ISSUES.value, self.language).opening_utterance
+
+    async def start_prefetch(self) -> ToolPrefetch:
+        """
+        Nothing to prefetch: get_ride_details needs the issue type, which is
+        only known once the driver describes the issue.
+        """
+        return await start_prefetch(self.session_id, call_mcp_tool, [])
@@ -6,6 +6,7 @@ from loguru import logger
 
 from pipecat.services.llm_service import FunctionCallParams
 from app.core.session_manager import get_session_manager
+from app.agents.voice.driver.utils.prefetch import call_tool_with_prefetch
 
 
 MCP_SERVER_URL = os.getenv("MCP_SERVER_URL", "http://localhost:8000")
@@ -58,7 +59,7 @@ class RideIssueHandlers:
             await params.result_callback(error_result)
             return
 
-        result = await call_mcp_tool("get_ride_details", {"ride_id": ride_id, "issue_type": issue_type})
+        result = await call_tool_with_prefetch(session_id, call_mcp_tool, "get_ride_details", {"ride_id": ride_id, "issue_type": issue_type})
         await params.result_callback(result)
 
     @staticmethod
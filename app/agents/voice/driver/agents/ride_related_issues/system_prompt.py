@@ -25,24 +25,7 @@ INITIAL_MOVE = {
   "en": "Hi, welcome to Namma Yatri support. Can I help you?"
 }
 
-def get_ride_related_issues_system_prompt(language: str = "ta"):
-    """
-    Generate the system prompt for the ride related issues agent.
-    
-    Args:
-        language: Language code (ta, kn, hi, ml, en). Defaults to "ta".
-    
-    Returns:
-        List of message dictionaries for the LLM context.
-    """
-    irrelevant_response = IRRELEVANT_QUESTION_RESPONSES.get(language, IRRELEVANT_QUESTION_RESPONSES["ta"])
-    support_team = SUPPORT_TEAM.get(language, SUPPORT_TEAM["ta"])
-    initial_move = INITIAL_MOVE.get(language, INITIAL_MOVE["ta"])
-    
-    return [
-        {
-            "role": "system",
-            "content": f"""
+STATIC_PROMPT = """
             You are a Nammayatri support agent specifically designed to help drivers.
             Be empathetic, helpful, and professional when dealing with driver concerns.
             
@@ -50,12 +33,12 @@ def get_ride_related_issues_system_prompt(language: str = "ta"):
 
             You have access to these tools:
             1. get_ride_details - Get the ride details like distance, fare, toll charges, etc. Parameters: issue (required) - can be 'TOLL_CHARGES' or 'FARE'
-            2. bot_fail_to_resolve - tool to escalate the call to {support_team} team.
+            2. bot_fail_to_resolve - tool to escalate the call to [SUPPORT TEAM] team.
 
             NAMMA YATRI DRIVER SUPPORT WORKFLOW:
 
             STEP 1: ASK ABOUT THE ISSUE
-            {initial_move} Ask the driver what specific issue they are facing with their ride.
+            [OPENING QUESTION] Ask the driver what specific issue they are facing with their ride.
 
             STEP 2: APOLOGIZE AND GET RIDE DETAILS
             Apologize to the driver for the inconvenience they are facing.
@@ -71,12 +54,38 @@ def get_ride_related_issues_system_prompt(language: str = "ta"):
             STEP 3: ASK FOR FURTHER ASSISTANCE
             After explaining the ride details, ask the driver if they need any further assistance regarding the this issue.
             
-            If they need more help or are not satisfied with the explanation, use the bot_fail_to_resolve tool to escalate the call to the {support_team} team.
+            If they need more help or are not satisfied with the explanation, use the bot_fail_to_resolve tool to escalate the call to the [SUPPORT TEAM] team.
 
 
-            If the driver asks irrelevant questions unrelated to ride issues, tell them: "{irrelevant_response}"
+            If the driver asks irrelevant questions unrelated to ride issues, tell them: "[IRRELEVANT QUESTION RESPONSE]"
 
             Be patient, clear, and professional in all interactions.
             """
-        }
+
+
+def get_ride_related_issues_system_prompt(language: str = "ta"):
+    """
+    Generate the system prompt for the ride related issues agent.
+    
+    Args:
+        language: Language code (ta, kn, hi, ml, en). Defaults to "ta".
+    
+    Returns:
+        List of message dictionaries for the LLM context.
+    """
+    irrelevant_response = IRRELEVANT_QUESTION_RESPONSES.get(language, IRRELEVANT_QUESTION_RESPONSES["ta"])
+    support_team = SUPPORT_TEAM.get(language, SUPPORT_TEAM["ta"])
+    initial_move = INITIAL_MOVE.get(language, INITIAL_MOVE["ta"])
+    
+    return [
+        {
+            "role": "system",
+            "content": STATIC_PROMPT + f"""
+            LANGUAGE DETAILS:
+            The placeholders in square brackets above stand for these values in the driver's language:
+            [OPENING QUESTION]: {initial_move}
+            [SUPPORT TEAM]: {support_team}
+            [IRRELEVANT QUESTION RESPONSE]: {irrelevant_response}
+            """,
+        },
     ]
\ No newline at end of file
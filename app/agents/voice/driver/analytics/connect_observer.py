@@ -0,0 +1,19 @@
+from pipecat.frames.frames import BotStartedSpeakingFrame
+from pipecat.observers.base_observer import BaseObserver, FramePushed
+
+from app.core.connect_metrics import report_connect_phase
+
+
+class FirstBotAudioObserver(BaseObserver):
+    """Reports the "first_bot_audio" connect phase when the bot first starts speaking."""
+
+    def __init__(self, session_id: str):
+        super().__init__()
+        self._session_id = session_id
+        self._reported = False
+
+    async def on_push_frame(self, data: FramePushed):
+        if self._reported or not isinstance(data.frame, BotStartedSpeakingFrame):
+            return
+        self._reported = True
+        report_connect_phase(self._session_id, "first_bot_audio")
@@ -0,0 +1,52 @@
+import time
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+
+class StartupTimings:
+    """
+    Ordered monotonic marks taken while a bot process comes up.
+
+    time.monotonic() is system-wide on Linux, so marks taken in app/main.py
+    (e.g. when the process was spawned) can be compared with marks taken
+    inside the bot process.
+    """
+
+    def __init__(self, marks: Optional[Dict[str, float]] = None):
+        self._marks: Dict[str, float] = dict(marks or {})
+
+    def mark(self, name: str, ts: Optional[float] = None):
+        """Record a mark, keeping the first timestamp if it was already recorded."""
+        self._marks.setdefault(name, ts if ts is not None else time.monotonic())
+
+    def get(self, name: str) -> Optional[float]:
+        return self._marks.get(name)
+
+    def breakdown(self) -> List[Tuple[str, float]]:
+        """
+        Get the duration of every phase between two consecutive marks.
+
+        Returns:
+            List of ("previous->current", seconds) tuples in mark order
+        """
+        ordered = sorted(self._marks.items(), key=lambda item: item[1])
+        return [
+            (f"{prev_name}->{name}", ts - prev_ts)
+            for (prev_name, prev_ts), (name, ts) in zip(ordered, ordered[1:])
+        ]
+
+    def elapsed(self, start: str, end: str) -> Optional[float]:
+        if start not in self._marks or end not in self._marks:
+            return None
+        return self._marks[end] - self._marks[start]
+
+    def to_dict(self) -> Dict[str, float]:
+        return dict(self._marks)
+
+    def log(self, session_id: str):
+        phases = ", ".join(f"{phase}={secs * 1000:.0f}ms" for phase, secs in self.breakdown())
+        critical_path = self.elapsed("dispatched", "joined")
+        logger.info(f"[STARTUP] Session {session_id} startup breakdown: {phases}")
+        if critical_path is not None:
+            logger.info(f"[STARTUP] Session {session_id} dispatch to join: {critical_path * 1000:.0f}ms")
@@ -8,12 +8,20 @@ from app.core import config
 
 from loguru import logger
 
+_tracing_configured = False
+
 
 def setup_tracing(service_name: str):
+    global _tracing_configured
+
     if not config.ENABLE_TRACING:
         logger.info("Tracing is disabled. Skipping setup.")
         return
 
+    # Several sessions can share one process, the provider is set only once
+    if _tracing_configured:
+        return
+
     resource = Resource(attributes={SERVICE_NAME: service_name})
     provider = TracerProvider(resource=resource)
 
@@ -22,4 +30,5 @@ def setup_tracing(service_name: str):
 
     processor = BatchSpanProcessor(exporter)
     provider.add_span_processor(processor)
-    trace.set_tracer_provider(provider)
\ No newline at end of file
+    trace.set_tracer_provider(provider)
+    _tracing_configured = True
\ No newline at end of file
@@ -0,0 +1,249 @@
+import math
+import time
+from typing import Any, Dict, List
+
+from loguru import logger
+from opentelemetry import trace
+
+from pipecat.frames.frames import (
+    BotStoppedSpeakingFrame,
+    FunctionCallInProgressFrame,
+    FunctionCallResultFrame,
+    LLMFullResponseEndFrame,
+    LLMTextFrame,
+    MetricsFrame,
+    TranscriptionFrame,
+    TTSAudioRawFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+    VADUserStoppedSpeakingFrame,
+)
+from pipecat.metrics.metrics import LLMUsageMetricsData
+from pipecat.observers.base_observer import BaseObserver, FramePushed
+from pipecat.transports.base_output import BaseOutputTransport
+
+from app.core import config
+from app.core.session_manager import get_session_manager
+from app.agents.voice.driver.tts.filler import ToolCallFiller
+
+
+# Stamps taken for every user turn, in the order they normally happen
+TURN_STAMPS = [
+    "vad_stop",
+    "turn_decision",
+    "stt_final",
+    "tool_start",
+    "tool_end",
+    "llm_first_token",
+    "llm_done",
+    "tts_first_byte",
+    "first_audio_out",
+    "bot_stopped",
+]
+
+# Segment name -> (start stamp, end stamp)
+TURN_SEGMENTS = {
+    "turn_detection": ("vad_stop", "turn_decision"),
+    "stt": ("vad_stop", "stt_final"),
+    "tools": ("tool_start", "tool_end"),
+    "llm_ttft": ("turn_decision", "llm_first_token"),
+    "llm_total": ("llm_first_token", "llm_done"),
+    "tts_ttfb": ("llm_first_token", "tts_first_byte"),
+    "playout": ("tts_first_byte", "first_audio_out"),
+    "total": ("vad_stop", "first_audio_out"),
+    "bot_speech": ("first_audio_out", "bot_stopped"),
+}
+
+# Session key the list of turn breakdowns is stored under
+TURN_LATENCY_SESSION_KEY = "turn_latencies"
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percentile / 100 * len(ordered)) - 1)]
+
+
+class TurnLatencyObserver(BaseObserver):
+    """
+    Stamps each user turn from the end of the user's speech to the end of the
+    bot's reply, so a slow turn can be attributed to turn detection, STT, the
+    LLM, tools or TTS.
+
+    A turn opens on UserStartedSpeakingFrame and is recorded when the bot stops
+    speaking, or when the user starts the next turn first. Observers see a
+    frame once per hop, so every stamp keeps the first sighting, except
+    vad_stop and stt_final, which keep the last one before the turn decision
+    and the LLM response respectively. Filler audio is not counted as TTS
+    output.
+
+    The LLM's usage metrics (PipelineParams.enable_usage_metrics) are summed
+    per turn, including the prompt tokens the provider served from its prompt
+    cache, so cache hits can be lined up against llm_ttft.
+
+    Each turn's breakdown is appended to the session record, and exported as
+    a "turn_latency" span when tracing is enabled.
+    """
+
+    def __init__(self, session_id: str):
+        super().__init__()
+        self._session_id = session_id
+        self._stamps: Dict[str, float] = {}
+        self._filler_frame_ids = set()
+        self._usage: Dict[str, int] = {}
+        self._metrics_frame_ids = set()
+        self.turns: List[Dict[str, Any]] = []
+
+    def _stamp(self, name: str, overwrite: bool = False):
+        if overwrite or name not in self._stamps:
+            self._stamps[name] = time.monotonic()
+
+    async def on_push_frame(self, data: FramePushed):
+        frame = data.frame
+
+        if isinstance(frame, UserStartedSpeakingFrame):
+            if "turn_decision" in self._stamps:
+                await self._finish_turn(interrupted=True)
+        elif isinstance(frame, VADUserStoppedSpeakingFrame):
+            if "turn_decision" not in self._stamps:
+                self._stamp("vad_stop", overwrite=True)
+        elif isinstance(frame, UserStoppedSpeakingFrame):
+            self._stamp("turn_decision")
+        elif isinstance(frame, TranscriptionFrame):
+            if "llm_first_token" not in self._stamps:
+                self._stamp("stt_final", overwrite=True)
+        elif isinstance(frame, FunctionCallInProgressFrame):
+            self._stamp("tool_start")
+        elif isinstance(frame, FunctionCallResultFrame):
+            self._stamp("tool_end", overwrite=True)
+        elif isinstance(frame, LLMTextFrame):
+            self._stamp("llm_first_token")
+        elif isinstance(frame, LLMFullResponseEndFrame):
+            if "llm_first_token" in self._stamps:
+                self._stamp("llm_done")
+        elif isinstance(frame, TTSAudioRawFrame):
+            if isinstance(data.src, ToolCallFiller):
+                self._filler_frame_ids.add(frame.id)
+            elif frame.id in self._filler_frame_ids or "llm_first_token" not in self._stamps:
+                pass
+            elif isinstance(data.src, BaseOutputTransport):
+                if "tts_first_byte" in self._stamps:
+                    self._stamp("first_audio_out")
+            else:
+                self._stamp("tts_first_byte")
+        elif isinstance(frame, BotStoppedSpeakingFrame):
+            if "first_audio_out" in self._stamps:
+                self._stamp("bot_stopped")
+                await self._finish_turn()
+        elif isinstance(frame, MetricsFrame):
+            if frame.id not in self._metrics_frame_ids:
+                self._metrics_frame_ids.add(frame.id)
+                self._add_usage(frame)
+
+    def _add_usage(self, frame: MetricsFrame):
+        for data in frame.data:
+            if isinstance(data, LLMUsageMetricsData):
+                tokens = data.value
+                self._usage["llm_calls"] = self._usage.get("llm_calls", 0) + 1
+                for field, value in (
+                    ("prompt_tokens", tokens.prompt_tokens),
+                    ("cached_tokens", tokens.cache_read_input_tokens or 0),
+                    ("completion_tokens", tokens.completion_tokens),
+                ):
+                    self._usage[field] = self._usage.get(field, 0) + value
+
+    @staticmethod
+    def _breakdown(stamps: Dict[str, float]) -> Dict[str, float]:
+        segments = {}
+        for segment, (start, end) in TURN_SEGMENTS.items():
+            if start in stamps and end in stamps:
+                segments[segment] = stamps[end] - stamps[start]
+        return segments
+
+    async def _finish_turn(self, interrupted: bool = False):
+        stamps, self._stamps = self._stamps, {}
+        usage, self._usage = self._usage, {}
+        self._filler_frame_ids = set()
+        self._metrics_frame_ids = set()
+        origin = stamps.get("vad_stop", stamps.get("turn_decision"))
+        if origin is None:
+            return
+
+        segments = self._breakdown(stamps)
+        turn = {
+            "turn": len(self.turns) + 1,
+            "interrupted": interrupted,
+            "stamps": {name: stamps[name] - origin for name in TURN_STAMPS if name in stamps},
+            "segments": segments,
+        }
+        if usage:
+            turn["llm_usage"] = usage
+        self.turns.append(turn)
+
+        logger.info(
+            f"[TURN LATENCY] Session {self._session_id} turn {turn['turn']}"
+            f"{' (interrupted)' if interrupted else ''}: "
+            + ", ".join(f"{segment}={secs * 1000:.0f}ms" for segment, secs in segments.items())
+            + (
+                f", prompt_tokens={usage['prompt_tokens']} (cached {usage['cached_tokens']})"
+                if usage else ""
+            )
+        )
+
+        session_manager = get_session_manager()
+        turns = await session_manager.get_value(self._session_id, TURN_LATENCY_SESSION_KEY, [])
+        await session_manager.set_value(self._session_id, TURN_LATENCY_SESSION_KEY, turns + [turn])
+
+        if config.ENABLE_TRACING:
+            self._export_span(turn, origin, stamps)
+
+    def _export_span(self, turn: Dict[str, Any], origin: float, stamps: Dict[str, float]):
+        # Spans take wall-clock nanoseconds, the stamps are monotonic
+        offset_ns = time.time_ns() - int(time.monotonic() * 1e9)
+        attributes = {"session_id": self._session_id, "turn": turn["turn"], "interrupted": turn["interrupted"]}
+        attributes.update({f"stamp.{name}_ms": secs * 1000 for name, secs in turn["stamps"].items()})
+        attributes.update({f"segment.{name}_ms": secs * 1000 for name, secs in turn["segments"].items()})
+        attributes.update({f"llm_usage.{name}": value for name, value in turn.get("llm_usage", {}).items()})
+        span = trace.get_tracer(__name__).start_span(
+            "turn_latency",
+            start_time=int(origin * 1e9) + offset_ns,
+            attributes=attributes,
+        )
+        span.end(end_time=int(max(stamps.values()) * 1e9) + offset_ns)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """p50/p95 of every segment over the session's turns, in seconds."""
+        summary = {}
+        for segment in TURN_SEGMENTS:
+            values = [turn["segments"][segment] for turn in self.turns if segment in turn["segments"]]
+            if values:
+                summary[segment] = {
+                    "p50": _percentile(values, 50),
+                    "p95": _percentile(values, 95),
+                    "count": len(values),
+                }
+        return summary
+
+    def usage_summary(self) -> Dict[str, int]:
+        """LLM token counts summed over the session's turns."""
+        totals: Dict[str, int] = {}
+        for turn in self.turns:
+            for field, value in turn.get("llm_usage", {}).items():
+                totals[field] = totals.get(field, 0) + value
+        return totals
+
+    def log_summary(self):
+        summary = self.summary()
+        if not summary:
+            return
+        usage = self.usage_summary()
+        logger.info(
+            f"[TURN LATENCY] Session {self._session_id} summary over {len(self.turns)} turns: "
+            + ", ".join(
+                f"{segment} p50={values['p50'] * 1000:.0f}ms p95={values['p95'] * 1000:.0f}ms"
+                for segment, values in summary.items()
+            )
+            + (
+                f", {usage['cached_tokens']}/{usage['prompt_tokens']} prompt tokens cached"
+                if usage.get("prompt_tokens") else ""
+            )
+        )
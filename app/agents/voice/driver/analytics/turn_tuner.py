@@ -0,0 +1,361 @@
+"""
+Offline turn-taking tuner over recorded calls.
+
+Replays call recordings through SileroVADAnalyzer and LocalSmartTurnAnalyzerV3
+for a grid of VADParams and smart-turn thresholds, and reports per language
+how long each combination takes to end the caller's turn and how often it
+ends a turn the caller had not finished:
+
+    python -m app.agents.voice.driver.analytics.turn_tuner recordings/ --output turn_tuning.json
+
+Recordings are read from the given files or directories, as WAV, FLAC or
+Opus/OGG (whatever RECORDING_CODEC they were uploaded in). The language is
+taken from the parent directory (bot.py records into recordings/<language>/).
+Stereo recordings (RECORDING_CHANNELS=2) carry the caller on the left
+channel; mono recordings have the bot mixed in, which counts bot speech as
+caller speech.
+
+Silero confidences are computed once per recording and the VAD state machine
+is re-run per grid point, mirroring VADAnalyzer. Turn decisions follow
+pipecat's input transport: when the VAD stops, smart-turn runs on the speech
+segment, and a segment it calls incomplete ends after the smart-turn
+stop_secs of silence unless the caller speaks again first.
+
+A turn counts as premature when the caller starts speaking again within
+--resume-window seconds of the decision, by a fixed reference detector that
+does not depend on the grid.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+project_root = Path(__file__).parent.parent.parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import soundfile
+from loguru import logger
+
+from pipecat.audio.turn.smart_turn.local_smart_turn_v3 import LocalSmartTurnAnalyzerV3
+from pipecat.audio.utils import calculate_audio_volume, create_file_resampler, exp_smoothing
+from pipecat.audio.vad.silero import SileroVADAnalyzer
+from pipecat.audio.vad.vad_analyzer import VADParams
+
+from app.core import config
+from app.core.audio_codec import RECORDING_CODECS
+from app.schemas import LanguageCode
+
+
+SAMPLE_RATE = 16000
+WINDOW_SAMPLES = 512
+WINDOW_SECS = WINDOW_SAMPLES / SAMPLE_RATE
+# VADAnalyzer's volume smoothing factor
+VOLUME_SMOOTHING = 0.2
+# SileroVADAnalyzer resets its model state every 5s of wall time, which in a live call is 5s of audio
+VAD_RESET_WINDOWS = round(5.0 / WINDOW_SECS)
+# Smart-turn looks at most this far back from the VAD stop
+TURN_MAX_SECS = 8
+# Reference detector for "the caller spoke again"
+REFERENCE_CONFIDENCE = 0.6
+REFERENCE_MIN_SECS = 0.25
+# Latency histogram bins, in seconds; the last bin takes everything above
+HISTOGRAM_BIN_SECS = 0.1
+HISTOGRAM_MAX_SECS = 3.5
+# Parameters bot.py runs with today
+BASELINE = {"confidence": 0.3, "start_secs": 0.2, "stop_secs": 0.7, "turn_threshold": config.SMART_TURN_THRESHOLD}
+# Extensions of the recordings picked up from directories
+RECORDING_EXTENSIONS = tuple(extension for extension, _, _, _ in RECORDING_CODECS.values())
+
+
+def _floats(value: str) -> List[float]:
+    return [float(item) for item in value.split(",")]
+
+
+def _percentile(values: List[float], percentile: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percentile / 100 * len(ordered)) - 1)]
+
+
+def find_recordings(paths: List[str]) -> List[str]:
+    recordings = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                recordings += [os.path.join(root, name) for name in sorted(files) if name.endswith(RECORDING_EXTENSIONS)]
+        else:
+            recordings.append(path)
+    return recordings
+
+
+def recording_language(path: str, default: str) -> str:
+    parent = os.path.basename(os.path.dirname(os.path.abspath(path)))
+    return parent if parent in {code.value for code in LanguageCode} else default
+
+
+def load_caller_audio(path: str) -> Tuple[np.ndarray, int]:
+    """The caller's track of a recording as 16kHz int16, and the recording's channel count."""
+    samples, sample_rate = soundfile.read(path, dtype="int16", always_2d=True)
+    channels = samples.shape[1]
+    caller = np.ascontiguousarray(samples[:, 0])
+    if sample_rate != SAMPLE_RATE:
+        resampler = create_file_resampler()
+        caller = np.frombuffer(
+            asyncio.run(resampler.resample(caller.tobytes(), sample_rate, SAMPLE_RATE)), dtype=np.int16
+        )
+    return caller, channels
+
+
+class RecordedCall:
+    """Per-window VAD inputs of one recording, and cached smart-turn probabilities."""
+
+    def __init__(self, path: str, vad: SileroVADAnalyzer, turn: LocalSmartTurnAnalyzerV3):
+        self.path = path
+        self.audio, self.channels = load_caller_audio(path)
+        self._turn = turn
+        self._probabilities: Dict[Tuple[int, int], float] = {}
+        self.inference_secs: List[float] = []
+
+        count = len(self.audio) // WINDOW_SAMPLES
+        self.confidences = np.zeros(count, dtype=np.float32)
+        self.volumes = np.zeros(count, dtype=np.float32)
+        volume = 0.0
+        for i in range(count):
+            if i % VAD_RESET_WINDOWS == 0:
+                # Replay runs faster than real time, so reset by audio time instead
+                vad._model.reset_states()
+                vad._last_reset_time = time.time()
+            window = self.audio[i * WINDOW_SAMPLES:(i + 1) * WINDOW_SAMPLES].tobytes()
+            self.confidences[i] = vad.voice_confidence(window)
+            volume = exp_smoothing(calculate_audio_volume(window, SAMPLE_RATE), volume, VOLUME_SMOOTHING)
+            self.volumes[i] = volume
+
+    def reference_onsets(self, min_volume: float) -> np.ndarray:
+        """Times at which reference speech starts."""
+        speech = (self.confidences >= REFERENCE_CONFIDENCE) & (self.volumes >= min_volume)
+        min_windows = max(1, round(REFERENCE_MIN_SECS / WINDOW_SECS))
+        onsets, run = [], 0
+        for i, is_speech in enumerate(speech):
+            run = run + 1 if is_speech else 0
+            if run == min_windows:
+                onsets.append((i - min_windows + 1) * WINDOW_SECS)
+        return np.array(onsets)
+
+    def turn_probability(self, start: int, stop: int) -> float:
+        """Smart-turn probability for the speech from window `start` up to the VAD stop at window `stop`."""
+        key = (start, stop)
+        if key not in self._probabilities:
+            first = max(start, stop - int(TURN_MAX_SECS / WINDOW_SECS)) * WINDOW_SAMPLES
+            segment = self.audio[first:(stop + 1) * WINDOW_SAMPLES].astype(np.float32) / 32768.0
+            started_at = time.perf_counter()
+            self._probabilities[key] = self._turn._predict_endpoint(segment)["probability"]
+            self.inference_secs.append(time.perf_counter() - started_at)
+        return self._probabilities[key]
+
+
+def vad_segments(call: RecordedCall, params: VADParams) -> List[Tuple[int, int, int]]:
+    """
+    (speech start, speech end, VAD stop) window indexes of every speech
+    segment, following VADAnalyzer's state machine. The speech start is where
+    the analyzer started STARTING, which is where smart-turn's segment begins.
+    """
+    speaking = (call.confidences >= params.confidence) & (call.volumes >= params.min_volume)
+    start_frames = round(params.start_secs / WINDOW_SECS)
+    stop_frames = round(params.stop_secs / WINDOW_SECS)
+
+    segments = []
+    state, count = "quiet", 0
+    starting_at = speech_end = None
+    for i, is_speech in enumerate(speaking):
+        if is_speech:
+            if state == "quiet":
+                state, count, starting_at = "starting", 1, i
+            elif state == "starting":
+                count += 1
+            elif state == "stopping":
+                state, count = "speaking", 0
+        else:
+            if state == "starting":
+                state, count = "quiet", 0
+            elif state == "speaking":
+                state, count, speech_end = "stopping", 1, i
+            elif state == "stopping":
+                count += 1
+
+        if state == "starting" and count >= start_frames:
+            state, count = "speaking", 0
+            segments.append([starting_at, None, None])
+        if state == "stopping" and count >= stop_frames:
+            state, count = "quiet", 0
+            segments[-1][1:] = [speech_end, i]
+    return [tuple(segment) for segment in segments if segment[2] is not None]
+
+
+def simulate_turns(
+    call: RecordedCall,
+    segments: List[Tuple[int, int, int]],
+    onsets: np.ndarray,
+    threshold: float,
+    turn_stop_secs: float,
+    resume_window: float,
+) -> List[Tuple[float, bool]]:
+    """(end-of-turn latency, premature) of every turn the caller's segments add up to."""
+    inference = float(np.mean(call.inference_secs)) if call.inference_secs else 0.0
+    turns = []
+    turn_start = None
+    for index, (start, speech_end, stop) in enumerate(segments):
+        if turn_start is None:
+            turn_start = start
+        end_secs = speech_end * WINDOW_SECS
+        if call.turn_probability(turn_start, stop) > threshold:
+            decided_at = (stop + 1) * WINDOW_SECS + inference
+        else:
+            # Incomplete: the turn goes on if the caller speaks again before the smart-turn timeout
+            next_start = segments[index + 1][0] * WINDOW_SECS if index + 1 < len(segments) else math.inf
+            if next_start < end_secs + turn_stop_secs:
+                continue
+            decided_at = end_secs + turn_stop_secs
+        resumed = onsets[(onsets > decided_at) & (onsets <= decided_at + resume_window)]
+        turns.append((decided_at - end_secs, bool(len(resumed))))
+        turn_start = None
+    return turns
+
+
+def histogram(latencies: List[float]) -> List[int]:
+    bins = [0] * (int(HISTOGRAM_MAX_SECS / HISTOGRAM_BIN_SECS) + 1)
+    for latency in latencies:
+        bins[min(int(max(latency, 0) / HISTOGRAM_BIN_SECS), len(bins) - 1)] += 1
+    return bins
+
+
+def sparkline(bins: List[int]) -> str:
+    bars = " ▁▂▃▄▅▆▇█"
+    peak = max(bins) or 1
+    return "".join(bars[math.ceil(count / peak * (len(bars) - 1))] for count in bins)
+
+
+def tune_language(calls: List[RecordedCall], grid: Dict[str, List[float]], args) -> List[Dict[str, Any]]:
+    results = []
+    for confidence, start_secs, stop_secs in itertools.product(grid["confidence"], grid["start_secs"], grid["stop_secs"]):
+        params = VADParams(confidence=confidence, start_secs=start_secs, stop_secs=stop_secs, min_volume=args.min_volume)
+        per_call = [(call, vad_segments(call, params), call.reference_onsets(args.min_volume)) for call in calls]
+        for threshold in grid["turn_threshold"]:
+            turns = []
+            for call, segments, onsets in per_call:
+                turns += simulate_turns(call, segments, onsets, threshold, args.turn_stop_secs, args.resume_window)
+            latencies = [latency for latency, _ in turns]
+            results.append({
+                "confidence": confidence,
+                "start_secs": start_secs,
+                "stop_secs": stop_secs,
+                "turn_threshold": threshold,
+                "turns": len(turns),
+                "latency_p50": _percentile(latencies, 50),
+                "latency_p90": _percentile(latencies, 90),
+                "premature_rate": sum(premature for _, premature in turns) / len(turns) if turns else None,
+                "histogram": histogram(latencies),
+            })
+    return results
+
+
+def recommend(results: List[Dict[str, Any]], slack: float) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    The baseline, and the fastest combination (by p50, then p90) whose
+    premature rate is at most the baseline's plus `slack`.
+    """
+    baseline = next((result for result in results if all(result[key] == value for key, value in BASELINE.items())), None)
+    scored = [result for result in results if result["turns"]]
+    if baseline and baseline["turns"]:
+        scored = [result for result in scored if result["premature_rate"] <= baseline["premature_rate"] + slack]
+    best = min(scored, key=lambda result: (result["latency_p50"], result["latency_p90"]), default=None)
+    return baseline, best
+
+
+def print_language(language: str, calls: List[RecordedCall], results: List[Dict[str, Any]], baseline, best, top: int):
+    mono = sum(call.channels == 1 for call in calls)
+    print(f"\n== {language}: {len(calls)} recordings" + (f" ({mono} mono, bot audio mixed in)" if mono else ""))
+    print(f"histogram: {HISTOGRAM_BIN_SECS * 1000:.0f}ms bins from 0 to {HISTOGRAM_MAX_SECS}s+")
+    print(f"{'conf':>5} {'start':>5} {'stop':>5} {'turn':>5} {'turns':>6} {'p50':>6} {'p90':>6} {'early':>6}  histogram")
+    rows = sorted(
+        (result for result in results if result["turns"]),
+        key=lambda result: (result["latency_p50"], result["latency_p90"]),
+    )
+    shown = rows[:top] + [row for row in (baseline, best) if row and row not in rows[:top]]
+    for row in shown:
+        marks = (" baseline" if row is baseline else "") + (" recommended" if row is best else "")
+        print(
+            f"{row['confidence']:>5.2f} {row['start_secs']:>5.2f} {row['stop_secs']:>5.2f} {row['turn_threshold']:>5.2f} "
+            f"{row['turns']:>6} {row['latency_p50']:>6.2f} {row['latency_p90']:>6.2f} {row['premature_rate']:>6.1%}  "
+            f"{sparkline(row['histogram'])}{marks}"
+        )
+    if best:
+        print(
+            f"recommended for {language}: VADParams(confidence={best['confidence']}, start_secs={best['start_secs']}, "
+            f"stop_secs={best['stop_secs']}), SMART_TURN_THRESHOLD={best['turn_threshold']}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("paths", nargs="+", help="Recordings (WAV, FLAC or OGG) or directories of them")
+    parser.add_argument("--confidence", type=_floats, default=[0.3, 0.4, 0.5, 0.6], help="VAD confidences to try")
+    parser.add_argument("--start-secs", type=_floats, default=[0.2], help="VAD start_secs to try")
+    parser.add_argument("--stop-secs", type=_floats, default=[0.2, 0.3, 0.4, 0.5, 0.6, 0.7], help="VAD stop_secs to try")
+    parser.add_argument(
+        "--turn-threshold",
+        type=_floats,
+        default=sorted({0.3, 0.5, 0.7, BASELINE["turn_threshold"]}),
+        help="SMART_TURN_THRESHOLD values to try",
+    )
+    parser.add_argument("--min-volume", type=float, default=VADParams().min_volume, help="VAD min_volume")
+    parser.add_argument("--turn-stop-secs", type=float, default=3.0, help="Smart-turn stop_secs")
+    parser.add_argument("--resume-window", type=float, default=1.0, help="Seconds after a decision in which speech makes it premature")
+    parser.add_argument("--slack", type=float, default=0.01, help="Premature rate allowed above the baseline's")
+    parser.add_argument("--default-language", default="unknown", help="Language of recordings outside a language directory")
+    parser.add_argument("--top", type=int, default=10, help="Fastest combinations printed per language")
+    parser.add_argument("--output", help="Write every combination, with histograms, to this JSON file")
+    args = parser.parse_args()
+
+    grid = {
+        "confidence": args.confidence,
+        "start_secs": args.start_secs,
+        "stop_secs": args.stop_secs,
+        "turn_threshold": args.turn_threshold,
+    }
+    vad = SileroVADAnalyzer(sample_rate=SAMPLE_RATE)
+    vad.set_sample_rate(SAMPLE_RATE)
+    turn = LocalSmartTurnAnalyzerV3()
+
+    by_language: Dict[str, List[RecordedCall]] = {}
+    for path in find_recordings(args.paths):
+        try:
+            call = RecordedCall(path, vad, turn)
+        except Exception as e:
+            logger.error(f"[TURN TUNER] Skipping {path}: {e}")
+            continue
+        by_language.setdefault(recording_language(path, args.default_language), []).append(call)
+
+    report = {}
+    for language, calls in sorted(by_language.items()):
+        results = tune_language(calls, grid, args)
+        baseline, best = recommend(results, args.slack)
+        print_language(language, calls, results, baseline, best, args.top)
+        report[language] = {"recordings": [call.path for call in calls], "recommended": best, "baseline": baseline, "results": results}
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
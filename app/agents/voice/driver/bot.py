@@ -1,14 +1,15 @@
+import time
+
+# Taken before the heavy pipecat/daily/onnx import tree below so the startup
+# breakdown can show how long the imports take.
+_interpreter_started_at = time.monotonic()
+
 import argparse
 import asyncio
-import io
-import os
 import sys
-import wave
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
-import aiofiles
-import boto3
 from zoneinfo import ZoneInfo
 
 
@@ -28,11 +29,11 @@ from pipecat.processors.aggregators.llm_response_universal import LLMContextAggr
 
 
 from pipecat.processors.frameworks.rtvi import RTVIConfig, RTVIProcessor, RTVIObserver
-from pipecat.audio.vad.vad_analyzer import VADParams
+from pipecat.audio.vad.vad_analyzer import VADAnalyzer, VADParams
 from pipecat.frames.frames import LLMRunFrame
-from pipecat.audio.turn.smart_turn.local_smart_turn_v3 import LocalSmartTurnAnalyzerV3
+from pipecat.audio.turn.base_turn_analyzer import BaseTurnAnalyzer
 from pipecat.transcriptions.language import Language
-from pipecat.frames.frames import FilterEnableFrame, CancelFrame, LLMContextFrame
+from pipecat.frames.frames import FilterEnableFrame, CancelFrame, LLMContextFrame, LLMMessagesAppendFrame
 
 from pipecat.audio.filters.koala_filter import KoalaFilter
 from pipecat.audio.filters.aic_filter import AICFilter
@@ -51,14 +52,30 @@ from pipecat.utils.tracing.conversation_context_provider import (
 
 from loguru import logger
 
-from app.agents.voice.driver.tts import get_tts_service
+from app.agents.voice.driver.tts import get_tts_service, get_tts_voice
+from app.agents.voice.driver.tts.cache import (
+    CachedSpeechPlayer,
+    CachedSpeechRecorder,
+    TTSAudioCache,
+    fixed_utterances,
+)
+from app.agents.voice.driver.tts.filler import ToolCallFiller
 from app.agents.voice.driver.stt import get_stt_service
 from app.agents.voice.driver.llm import get_llm_service
+from app.agents.voice.driver.llm.speculative import SpeculativeOpenAILLMService, SpeculativeTurnTrigger
 
 
 from app.agents.voice.driver.utils.handover import HandoverFrame
 
-from app.agents.voice.driver.utils.bot_words import get_bot_words
+from app.agents.voice.driver.utils.bot_words import get_bot_words, get_filler_words
+from app.agents.voice.driver.utils.recording import create_recording
+from app.agents.voice.driver.utils.adaptive_vad import AdaptiveVADController
+from app.agents.voice.driver.utils.smart_turn import ThresholdSmartTurnAnalyzerV3
+from app.agents.voice.driver.utils.batched_inference import (
+    BatchedSmartTurnAnalyzer,
+    BatchedVADAnalyzer,
+    get_inference_service,
+)
 from app.core import config
 from app.core.session_manager import get_session_manager
 from app.core.session_manager import SessionManager
@@ -66,65 +83,78 @@ from app.core.session_manager import SessionManager
 from app.agents.voice.driver.agents.not_getting_rides.agent import NotGettingRidesAgent
 from app.agents.voice.driver.agents.ride_related_issues.agent import RideIssueAgent
 from app.agents.voice.driver.agents.rc_dl_issues.agent import RC_DL_IssuesAgent
+from app.agents.voice.driver.agents.assets import build_all_assets
+from app.agents.voice.driver.llm.context_compactor import ContextCompactor
 
 from app.agents.voice.driver.analytics.tracing_setup import setup_tracing
+from app.agents.voice.driver.analytics.startup_timings import StartupTimings
+from app.agents.voice.driver.analytics.connect_observer import FirstBotAudioObserver
+from app.agents.voice.driver.analytics.turn_latency import TurnLatencyObserver
+from app.core.connect_metrics import close_connect_reporting, report_connect_phase
 from langfuse import get_client
 from opentelemetry import trace
 
 load_dotenv(override=True)
 
+_imports_done_at = time.monotonic()
 
 
+class BotModels:
+    """
+    Per-session analyzers and audio filter that load ONNX models.
 
-def upload_to_s3_from_memory(audio_data: bytes, bucket_name: str, object_key: str):
-    """Upload audio data directly from memory to S3 using boto3."""
-    s3 = boto3.client('s3', region_name=config.AWS_REGION)
-    with io.BytesIO(audio_data) as buffer:
-        buffer.seek(0)  # Reset buffer position to start
-        s3.upload_fileobj(buffer, bucket_name, object_key)
-    logger.info(f"Audio uploaded successfully to s3://{bucket_name}/{object_key}")
+    Building these is the slowest part of starting a bot, so warm workers
+    build them before a session is handed over and pass them to run_bot.
+    """
 
+    def __init__(self, vad_analyzer: VADAnalyzer, turn_analyzer: BaseTurnAnalyzer, audio_in_filter=None):
+        self.vad_analyzer = vad_analyzer
+        self.turn_analyzer = turn_analyzer
+        self.audio_in_filter = audio_in_filter
 
-async def save_audio_file(audio: bytes, filename: str, sample_rate: int, num_channels: int):
-    """Save audio data to a WAV file locally and optionally to S3. Both operations are independent."""
-    if len(audio) > 0 :
-        with io.BytesIO() as buffer:
-            with wave.open(buffer, "wb") as wf:
-                wf.setsampwidth(2)
-                wf.setnchannels(num_channels)
-                wf.setframerate(sample_rate)
-                wf.writeframes(audio)
-            audio_data = buffer.getvalue()
-            
-            # Save to local file (independent operation)
-            if config.ENABLE_LOCAL_STORAGE:
-                try:
-                    async with aiofiles.open(filename, "wb") as file:
-                        await file.write(audio_data)
-                    logger.info(f"Audio saved to {filename}")
-                except Exception as e:
-                    logger.error(f"Failed to save audio to local file: {e}")
 
-            
-            # Upload to S3 if enabled (independent operation - doesn't depend on local file)
-            if config.ENABLE_S3_STORAGE:
-                try:
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    object_key = filename
-                    
-                    # Upload to S3 directly from memory buffer (independent from local save)
-                    await asyncio.to_thread(
-                        upload_to_s3_from_memory,
-                        audio_data,
-                        config.S3_BUCKET_NAME,
-                        object_key
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to upload audio to S3: {e}")
-
-
-
-async def run_bot(room_url: str, token: str, session_id: str, driver_number: str, language_code: str, agent_name: str, current_version_of_app: Optional[str] = None, latest_version_of_app: Optional[str] = None, ride_id: Optional[str] = None):
+def load_audio_in_filter():
+    """Build the configured Koala or AIC input filter, if any."""
+    if (config.ENABLE_KOALA_FILTER):
+        return KoalaFilter(access_key=config.KOALA_ACCESS_KEY)
+    elif (config.ENABLE_AIC_FILTER):
+        return AICFilter(license_key=config.AIC_ACCESS_KEY,enhancement_level=1.0)
+    return None
+
+
+def load_bot_models(with_audio_in_filter: bool = True) -> BotModels:
+    """
+    Load the VAD, smart-turn and optional audio filter models for one session.
+
+    Args:
+        with_audio_in_filter: Also build the Koala/AIC filter. The zygote leaves
+            it out and builds it after forking, since those native SDKs are not
+            known to survive a fork.
+    """
+    # Prompts and tool schemas are shared by every session; built on the first call
+    build_all_assets()
+
+    vad_params = VADParams(confidence=0.3,
+        start_secs=0.2,
+        stop_secs=0.7,)
+    if config.ENABLE_BATCHED_INFERENCE:
+        # Sessions in this process share one VAD and one smart-turn model
+        service = get_inference_service()
+        return BotModels(
+            vad_analyzer=BatchedVADAnalyzer(service, params=vad_params),
+            turn_analyzer=BatchedSmartTurnAnalyzer(service, threshold=config.SMART_TURN_THRESHOLD),
+            audio_in_filter=load_audio_in_filter() if with_audio_in_filter else None,
+        )
+    return BotModels(
+        vad_analyzer=SileroVADAnalyzer(params=vad_params),
+        turn_analyzer=ThresholdSmartTurnAnalyzerV3(threshold=config.SMART_TURN_THRESHOLD),
+        audio_in_filter=load_audio_in_filter() if with_audio_in_filter else None,
+    )
+
+
+async def run_bot(room_url: str, token: str, session_id: str, driver_number: str, language_code: str, agent_name: str, current_version_of_app: Optional[str] = None, latest_version_of_app: Optional[str] = None, ride_id: Optional[str] = None, models: Optional[BotModels] = None, startup_timings: Optional[StartupTimings] = None):
+    startup_timings = startup_timings or StartupTimings()
+
     # Initialize session manager
     session_manager = get_session_manager()
     
@@ -149,6 +179,26 @@ async def run_bot(room_url: str, token: str, session_id: str, driver_number: str
 
     tts = get_tts_service(language=language_code) 
 
+    tts_processors = [tts]
+    tts_cache = None
+    if config.ENABLE_TTS_CACHE:
+        tts_cache = TTSAudioCache(config.TTS_CACHE_DIR, get_tts_voice(language_code))
+        tts_cache_recorder = CachedSpeechRecorder(tts_cache)
+        tts_processors = [
+            CachedSpeechPlayer(tts_cache, tts_cache_recorder, recordable=fixed_utterances(language_code)),
+            tts,
+            tts_cache_recorder,
+        ]
+
+    # Always in the pipeline, so tool turns are measured with the filler off too.
+    # The filler only plays from the TTS cache, so it needs the cache on
+    tool_call_filler = ToolCallFiller(
+        tts_cache,
+        get_filler_words(language_code),
+        after_secs=config.FILLER_AUDIO_AFTER_SECS,
+        enabled=config.ENABLE_FILLER_AUDIO,
+    )
+
 
     agent = None
 
@@ -162,6 +212,9 @@ async def run_bot(room_url: str, token: str, session_id: str, driver_number: str
     if not agent:
         raise ValueError(f"Invalid agent_name: {agent_name}. Must be 'not_getting_rides' or 'ride_related_issues'")
 
+    # Overlap the agent's lookup with joining the room and the greeting
+    prefetch = await agent.start_prefetch() if config.ENABLE_TOOL_PREFETCH else None
+
     messages = agent.get_system_prompt()
     llm = agent.get_llm()
 
@@ -183,6 +236,17 @@ async def run_bot(room_url: str, token: str, session_id: str, driver_number: str
     context = LLMContext(messages, tools=tools)
     context_aggregator = LLMContextAggregatorPair(context)
 
+    context_processors = []
+    if config.ENABLE_CONTEXT_COMPACTION:
+        context_processors = [
+            ContextCompactor(
+                session_id,
+                context,
+                keep_turns=config.LLM_CONTEXT_KEEP_TURNS,
+                max_tokens=config.LLM_CONTEXT_MAX_TOKENS,
+            )
+        ]
+
 
     # Register function handlers with session_id captured in closure
     # Create wrapper functions that have access to session_id
@@ -212,21 +276,20 @@ async def run_bot(room_url: str, token: str, session_id: str, driver_number: str
 
 
 
+    if models is None:
+        models = load_bot_models()
+        startup_timings.mark("models_loaded")
+
     daily_params = DailyParams(
         audio_in_enabled=True,
         audio_out_enabled=True,
-        vad_analyzer=SileroVADAnalyzer(params=VADParams(confidence=0.3,
-        start_secs=0.2,
-        stop_secs=0.7,)),
+        vad_analyzer=models.vad_analyzer,
         # vad_analyzer=None,
-        turn_analyzer=LocalSmartTurnAnalyzerV3(),
+        turn_analyzer=models.turn_analyzer,
     )
 
-
-    if (config.ENABLE_KOALA_FILTER):
-        daily_params.audio_in_filter = KoalaFilter(access_key=config.KOALA_ACCESS_KEY)
-    elif (config.ENABLE_AIC_FILTER):
-        daily_params.audio_in_filter  = AICFilter(license_key=config.AIC_ACCESS_KEY,enhancement_level=1.0)
+    if models.audio_in_filter is not None:
+        daily_params.audio_in_filter = models.audio_in_filter
 
     setup_tracing(service_name="ny-driver-bot")
 
@@ -242,18 +305,52 @@ async def run_bot(room_url: str, token: str, session_id: str, driver_number: str
     # Create STT debug processor
     # stt_debug = STTDebugProcessor()
 
-    audiobuffer = AudioBufferProcessor()
+    # Hands the recording over in chunks, so the call is never held in memory whole
+    audiobuffer = AudioBufferProcessor(buffer_size=config.RECORDING_CHUNK_BYTES, num_channels=config.RECORDING_CHANNELS)
+    recording = None
+    if config.ENABLE_RECORDING:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        recording = create_recording(
+            f"recordings/{language_code}/{driver_number}_{timestamp}.wav",
+            local=config.ENABLE_LOCAL_STORAGE,
+            spool_dir=config.RECORDING_SPOOL_DIR if config.ENABLE_S3_STORAGE else None,
+            codec=config.RECORDING_CODEC,
+        )
+        audiobuffer.add_event_handler("on_audio_data", recording.on_audio_data)
 
     handoverFrame = HandoverFrame(session_id, session_manager)
+
+    vad_processors = []
+    if config.ENABLE_ADAPTIVE_VAD:
+        vad_processors = [
+            AdaptiveVADController(
+                session_id,
+                models.vad_analyzer.params,
+                confidence_range=(config.ADAPTIVE_VAD_CONFIDENCE_MIN, config.ADAPTIVE_VAD_CONFIDENCE_MAX),
+                stop_secs_range=(config.ADAPTIVE_VAD_STOP_SECS_MIN, config.ADAPTIVE_VAD_STOP_SECS_MAX),
+                warmup_secs=config.ADAPTIVE_VAD_WARMUP_SECS,
+            )
+        ]
+
+    speculation_processors = []
+    if isinstance(llm, SpeculativeOpenAILLMService):
+        speculation_processors = [
+            SpeculativeTurnTrigger(llm, context_aggregator.user(), stable_secs=config.SPECULATIVE_LLM_STABLE_SECS)
+        ]
+
     pipeline = Pipeline(
         [
             transport.input(),  # Transport user input
+            *vad_processors,  # VAD parameters adapted to the caller's noise
             rtvi,  # RTVI processor
             stt,
             # stt_debug,  # STT output for debugging
+            *context_processors,  # Old tool results summarized, context kept within its budget
+            *speculation_processors,  # Speculative LLM requests on stable interim transcripts
             context_aggregator.user(),  # User responses
             llm,  # LLM
-            tts,  # TTS
+            tool_call_filler,  # Filler audio during slow tool calls
+            *tts_processors,  # TTS, with fixed utterances played from the cache
             transport.output(),  # Transport bot output
             audiobuffer,
             handoverFrame,
@@ -265,10 +362,13 @@ async def run_bot(room_url: str, token: str, session_id: str, driver_number: str
     conversation_id = f"{driver_number}-{session_id}-{timestamp}"
 
 
+    turn_latency_observer = TurnLatencyObserver(session_id)
+
     task_params ={
-        "params": PipelineParams(allow_interruptions=True),
+        # Usage metrics carry the LLM's prompt and cached-token counts per call
+        "params": PipelineParams(allow_interruptions=True, enable_usage_metrics=True),
         "cancel_on_idle_timeout": True,
-        "observers": [RTVIObserver(rtvi)],
+        "observers": [RTVIObserver(rtvi), FirstBotAudioObserver(session_id), turn_latency_observer],
     }
 
     if config.ENABLE_TRACING:
@@ -318,6 +418,7 @@ async def run_bot(room_url: str, token: str, session_id: str, driver_number: str
     async def on_client_connected(transport, client):
         nonlocal timer_task
         logger.info("Client connected")
+        report_connect_phase(session_id, "client_connected")
         
         # Update session with connection info
         await session_manager.set_value(session_id, "connected_at", datetime.now().isoformat())
@@ -327,9 +428,19 @@ async def run_bot(room_url: str, token: str, session_id: str, driver_number: str
         session_data = await session_manager.get_session(session_id)
         logger.info(f"Session data: {session_data}")
 
-        await audiobuffer.start_recording()
+        if recording:
+            await audiobuffer.start_recording()
     
-        await task.queue_frames([LLMRunFrame()])
+        if config.ENABLE_STATIC_GREETING:
+            # Speak the fixed greeting (from the TTS cache when warm) and record
+            # it as the assistant's first turn, without waiting on the LLM
+            opening_utterance = agent.get_opening_utterance()
+            await task.queue_frames([
+                LLMMessagesAppendFrame(messages=[{"role": "assistant", "content": opening_utterance}], run_llm=False),
+                TTSSpeakFrame(opening_utterance),
+            ])
+        else:
+            await task.queue_frames([LLMRunFrame()])
 
         # Start 3-minute timer
         async def timer_function():
@@ -340,18 +451,6 @@ async def run_bot(room_url: str, token: str, session_id: str, driver_number: str
         logger.info(f"Started 3-minute timer for session {session_id}")
 
 
-    
-    @audiobuffer.event_handler("on_audio_data")
-    async def in_audio_data(buffer, audio, sample_rate, num_channels):
-        if config.ENABLE_RECORDING:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"recordings/{driver_number}_{timestamp}.wav"
-            if config.ENABLE_LOCAL_STORAGE:
-                os.makedirs("recordings", exist_ok=True)
-            await save_audio_file(audio, filename, sample_rate, num_channels)
-        else:
-            logger.info("Audio recording is disabled")
-
 
     @transport.event_handler("on_client_disconnected")
     async def on_client_disconnected(transport, client):
@@ -362,6 +461,8 @@ async def run_bot(room_url: str, token: str, session_id: str, driver_number: str
         await session_manager.set_value(session_id, "disconnected_at", datetime.now().isoformat())
         await session_manager.set_value(session_id, "status", "disconnected")
         
+        turn_latency_observer.log_summary()
+
         # Example: Retrieve final session data before cleanup
         final_session_data = await session_manager.get_session(session_id)
         logger.info(f"Final session data: {final_session_data}")
@@ -379,6 +480,9 @@ async def run_bot(room_url: str, token: str, session_id: str, driver_number: str
 
     @transport.event_handler("on_joined")
     async def on_joined(transport, participant):
+        startup_timings.mark("joined")
+        startup_timings.log(session_id)
+        report_connect_phase(session_id, "bot_joined")
         await task.queue_frame(FilterEnableFrame(True))
 
 
@@ -391,6 +495,14 @@ async def run_bot(room_url: str, token: str, session_id: str, driver_number: str
             logger.info("Main task cancelled. Exiting gracefully.")
         except Exception as e:
             logger.error(f"Pipeline runner error: {e}")
+        finally:
+            if prefetch:
+                prefetch.cancel()
+            if recording:
+                await recording.close()
+            if isinstance(llm, SpeculativeOpenAILLMService):
+                logger.info(f"[SPECULATIVE LLM] Session {session_id}: {llm.stats()}")
+            await close_connect_reporting()
 
     
 
@@ -440,9 +552,15 @@ def parse_args():
     parser.add_argument("--latest-version-of-app", type=str, required=True, help="Latest version of app")
     parser.add_argument("--agent-name", type=str, required=True, help="Agent name")
     parser.add_argument("--ride-id", type=str, required=False, help="Ride ID")
+    parser.add_argument("--dispatched-at", type=float, required=False, help="Monotonic time at which app/main.py spawned this bot")
 
     return parser.parse_args()
 
 if __name__ == "__main__":
     args = parse_args()
-    asyncio.run(run_bot(args.url, args.token, args.session_id, args.driver_number, args.language_code, args.agent_name, args.current_version_of_app, args.latest_version_of_app, args.ride_id))
\ No newline at end of file
+    startup_timings = StartupTimings()
+    if args.dispatched_at:
+        startup_timings.mark("dispatched", args.dispatched_at)
+    startup_timings.mark("interpreter_started", _interpreter_started_at)
+    startup_timings.mark("imports_done", _imports_done_at)
+    asyncio.run(run_bot(args.url, args.token, args.session_id, args.driver_number, args.language_code, args.agent_name, args.current_version_of_app, args.latest_version_of_app, args.ride_id, startup_timings=startup_timings))
\ No newline at end of file
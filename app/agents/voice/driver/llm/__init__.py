@@ -1,10 +1,16 @@
 from pipecat.services.openai.llm import OpenAILLMService
 from pipecat.services.google.llm import GoogleLLMService
 from app.core import config
+from app.agents.voice.driver.llm.speculative import SpeculativeOpenAILLMService
 
 
 def get_llm_service():
     if config.LLM_PROVIDER == "openai":
+        if config.ENABLE_SPECULATIVE_LLM:
+            return SpeculativeOpenAILLMService(
+                api_key=config.OPENAI_API_KEY,
+                max_edit_distance=config.SPECULATIVE_LLM_MAX_EDIT_DISTANCE,
+            )
         return OpenAILLMService(api_key=config.OPENAI_API_KEY)
     elif config.LLM_PROVIDER == "gemini":
         return GoogleLLMService(api_key=config.GEMINI_API_KEY)
@@ -0,0 +1,231 @@
+"""
+Bounded LLM context for long calls.
+
+The session's LLMContext grows with every turn, and the JSON results of the
+lookup tools (get_driver_info, get_ride_details, get_doc_status) stay in it
+verbatim, so every later request re-sends them. ContextCompactor keeps the
+last `keep_turns` turns as they are, replaces older lookup results with a
+short summary and, if the context is still over `max_tokens`, drops the
+oldest turns. The system prompt is never touched. Summaries keep every
+scalar field and the ids and statuses of list items, and tell the LLM to
+call the tool again if it needs the rest.
+
+Compaction runs when the user starts speaking. That is usually between
+turns, but can be while the bot is still replying (the user interrupts, or
+speaks over it). A request already sent is not affected, since its messages
+are copied when it starts, and a turn whose tool call is still running is
+never dropped.
+"""
+import json
+from typing import Any, Dict, List, Set, Tuple
+
+from loguru import logger
+
+from pipecat.frames.frames import Frame, UserStartedSpeakingFrame
+from pipecat.processors.aggregators.llm_context import LLMContext
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from app.agents.voice.driver.agents.assets import token_counter
+
+
+# Tools whose results are large lookups worth summarizing once they are old
+COMPACTED_TOOLS = {"get_driver_info", "get_ride_details", "get_doc_status"}
+# Prefix of a summarized tool result, so the LLM knows details were left out
+SUMMARY_PREFIX = "[Summary of an earlier result; call the tool again for details] "
+# Items of a list kept in a summary, and the fields kept per item (also as
+# suffixes, e.g. ride_id, rideStatus), so the LLM can still tell them apart
+SUMMARY_LIST_ITEMS = 5
+SUMMARY_ITEM_FIELDS = ("id", "status", "state", "type")
+# Per-message overhead of the chat format, in tokens
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def _is_item_field(key: str) -> bool:
+    name = key.rsplit(".", 1)[-1]
+    return any(
+        name.lower() == field or name.lower().endswith("_" + field) or name.endswith(field.capitalize())
+        for field in SUMMARY_ITEM_FIELDS
+    )
+
+
+def _list_item(item: Any) -> str:
+    if isinstance(item, (dict, list)):
+        return " ".join(f"{key}={value}" for key, value in _flatten(item) if _is_item_field(key))
+    return "" if item is None else str(item)
+
+
+def _flatten(value: Any, prefix: str = "") -> List[Tuple[str, Any]]:
+    if isinstance(value, dict):
+        items = []
+        for key, item in value.items():
+            items.extend(_flatten(item, f"{prefix}.{key}" if prefix else str(key)))
+        return items
+    if isinstance(value, list):
+        if not value:
+            return []
+        kept = [text for text in (_list_item(item) for item in value[:SUMMARY_LIST_ITEMS]) if text]
+        more = len(value) - SUMMARY_LIST_ITEMS
+        summary = f"{len(value)} items" + (f": {', '.join(kept)}" if kept else "") + (f", +{more} more" if more > 0 else "")
+        return [(prefix, f"[{summary}]")]
+    if value is None or value == "":
+        return []
+    return [(prefix, value)]
+
+
+def summarize_tool_result(content: str, max_chars: int) -> str:
+    """
+    A short summary of a JSON tool result: its scalar fields (nested ones
+    dotted), without empty values, with lists reduced to their length and
+    the ids and statuses of their first items, cut at `max_chars`.
+    """
+    try:
+        result = json.loads(content)
+    except (TypeError, ValueError):
+        summary = str(content)
+    else:
+        fields = _flatten(result)
+        summary = "; ".join(f"{key}={value}" if key else str(value) for key, value in fields)
+    if len(summary) > max_chars:
+        summary = summary[:max_chars].rstrip() + "..."
+    return SUMMARY_PREFIX + summary
+
+
+class ContextCompactor(FrameProcessor):
+    """
+    Placed before the user context aggregator; compacts `context` in place
+    whenever the user starts a new turn.
+
+    A turn starts at a user message and runs until the next one, so tool
+    calls and their results always stay in the turn that made them.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        context: LLMContext,
+        keep_turns: int = 4,
+        max_tokens: int = 6000,
+        summary_chars: int = 400,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._session_id = session_id
+        self._context = context
+        self._keep_turns = keep_turns
+        self._max_tokens = max_tokens
+        self._summary_chars = summary_chars
+        self._count, _ = token_counter()
+        self._compacted_ids: Set[str] = set()
+        self._turn = 0
+
+    def _message_tokens(self, message: Any) -> int:
+        if not isinstance(message, dict):
+            return 0
+        tokens = MESSAGE_OVERHEAD_TOKENS
+        content = message.get("content")
+        if isinstance(content, str):
+            tokens += self._count(content)
+        elif content:
+            tokens += self._count(json.dumps(content, ensure_ascii=False))
+        if message.get("tool_calls"):
+            tokens += self._count(json.dumps(message["tool_calls"], ensure_ascii=False))
+        return tokens
+
+    def context_tokens(self) -> int:
+        """Estimated prompt tokens of the context's messages (tools not included)."""
+        return sum(self._message_tokens(message) for message in self._context.get_messages())
+
+    @staticmethod
+    def _turn_starts(messages: List[Any]) -> Tuple[int, List[int]]:
+        """End of the leading system messages, and the index each turn starts at."""
+        system_end = 0
+        while (
+            system_end < len(messages)
+            and isinstance(messages[system_end], dict)
+            and messages[system_end].get("role") == "system"
+        ):
+            system_end += 1
+        starts = [
+            i for i in range(system_end, len(messages))
+            if isinstance(messages[i], dict) and messages[i].get("role") == "user"
+        ]
+        # Anything between the system prompt and the first user message (the greeting)
+        if system_end < len(messages) and (not starts or starts[0] != system_end):
+            starts.insert(0, system_end)
+        return system_end, starts
+
+    def _compact_tool_results(self, messages: List[Any]) -> int:
+        function_names: Dict[str, str] = {}
+        compacted = 0
+        for message in messages:
+            if not isinstance(message, dict):
+                continue
+            for tool_call in message.get("tool_calls") or []:
+                function_names[tool_call.get("id")] = tool_call.get("function", {}).get("name")
+            tool_call_id = message.get("tool_call_id")
+            if (
+                message.get("role") == "tool"
+                and tool_call_id not in self._compacted_ids
+                and function_names.get(tool_call_id) in COMPACTED_TOOLS
+                and message.get("content") not in ("IN_PROGRESS", "COMPLETED", "CANCELLED")
+            ):
+                summary = summarize_tool_result(message["content"], self._summary_chars)
+                self._compacted_ids.add(tool_call_id)
+                if len(summary) < len(message["content"]):
+                    message["content"] = summary
+                    compacted += 1
+        return compacted
+
+    @staticmethod
+    def _in_progress(messages: List[Any]) -> bool:
+        return any(
+            isinstance(message, dict) and message.get("role") == "tool" and message.get("content") == "IN_PROGRESS"
+            for message in messages
+        )
+
+    def compact(self):
+        """Summarize old lookup results, then drop the oldest turns while over budget."""
+        messages = self._context.get_messages()
+        before = self.context_tokens()
+        system_end, starts = self._turn_starts(messages)
+        old_turns = max(len(starts) - self._keep_turns, 0)
+
+        compacted = 0
+        if old_turns:
+            compacted = self._compact_tool_results(messages[system_end:starts[old_turns]])
+
+        tokens = self.context_tokens()
+        dropped = 0
+        while tokens > self._max_tokens and dropped < old_turns:
+            turn = messages[starts[dropped]:starts[dropped + 1]]
+            if self._in_progress(turn):
+                break
+            tokens -= sum(self._message_tokens(message) for message in turn)
+            dropped += 1
+        if dropped:
+            self._context.set_messages(messages[:system_end] + messages[starts[dropped]:])
+
+        self._turn += 1
+        if compacted or dropped:
+            logger.info(
+                f"[CONTEXT] Session {self._session_id} turn {self._turn}: ~{before} -> ~{tokens} prompt tokens, "
+                f"summarized {compacted} tool results, dropped {dropped} turns"
+            )
+        else:
+            logger.info(f"[CONTEXT] Session {self._session_id} turn {self._turn}: ~{tokens} prompt tokens")
+        if tokens > self._max_tokens:
+            logger.warning(
+                f"[CONTEXT] Session {self._session_id} is still over its {self._max_tokens} token budget "
+                f"after compaction"
+            )
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, UserStartedSpeakingFrame):
+            try:
+                self.compact()
+            except Exception as e:
+                logger.error(f"[CONTEXT] Session {self._session_id}: failed to compact the context: {e}")
+
+        await self.push_frame(frame, direction)
@@ -0,0 +1,260 @@
+"""
+Speculative LLM requests started on a stable interim transcript.
+
+Normally the LLM request starts only after the final transcript and the
+smart-turn decision. SpeculativeTurnTrigger watches the transcript while the
+driver is still talking and, once it stops changing, asks
+SpeculativeOpenAILLMService to start the request early. When the real request
+arrives, the speculative response is used if the final user text is within an
+edit-distance threshold of the speculated text, and cancelled otherwise.
+
+Only the request is speculative: the buffered chunks are replayed through the
+normal response handling, so function calls still run only for the real turn.
+"""
+import asyncio
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from pipecat.frames.frames import (
+    Frame,
+    InterimTranscriptionFrame,
+    TranscriptionFrame,
+    UserStartedSpeakingFrame,
+)
+from pipecat.processors.aggregators.llm_context import LLMContext
+from pipecat.processors.aggregators.llm_response_universal import LLMUserAggregator
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.services.openai.llm import OpenAILLMService
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", "", text.lower())).strip()
+
+
+def normalized_edit_distance(a: str, b: str) -> float:
+    """Levenshtein distance between two texts, as a fraction of the longer one."""
+    a, b = _normalize(a), _normalize(b)
+    if not a and not b:
+        return 0.0
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1] / max(len(a), len(b))
+
+
+class _Speculation:
+    """One speculative request and the chunks it has streamed so far."""
+
+    def __init__(self, text: str, base_messages: List[Any]):
+        self.text = text
+        self.base_messages = base_messages
+        self.started_at = time.monotonic()
+        self.first_chunk_at: Optional[float] = None
+        self.chunks: List[Any] = []
+        self.done = False
+        self.error: Optional[Exception] = None
+        self.task: Optional[asyncio.Task] = None
+        self._updated = asyncio.Event()
+
+    def notify(self):
+        self._updated.set()
+
+    async def replay(self):
+        """Buffered chunks, then the rest of the stream as it arrives."""
+        index = 0
+        while True:
+            if index < len(self.chunks):
+                yield self.chunks[index]
+                index += 1
+            elif self.done:
+                if self.error:
+                    raise self.error
+                return
+            else:
+                self._updated.clear()
+                await self._updated.wait()
+
+
+class SpeculativeOpenAILLMService(OpenAILLMService):
+    """
+    OpenAILLMService that can start the next user turn's request early.
+
+    Counts user turns, speculative hits and misses, and the time saved per hit:
+    the head start the speculative request had, capped at its time to first
+    token.
+    """
+
+    def __init__(self, *, max_edit_distance: float = 0.15, **kwargs):
+        """
+        Args:
+            max_edit_distance: Largest normalized edit distance between the
+                speculated and the final user text for the speculative
+                response to be used
+        """
+        super().__init__(**kwargs)
+        self._max_edit_distance = max_edit_distance
+        self._speculation: Optional[_Speculation] = None
+        self.turns = 0
+        self.hits = 0
+        self.misses = 0
+        self.saved_secs = 0.0
+
+    async def speculate(self, context: LLMContext, text: str):
+        """Start a request for `context` followed by a user message with `text`."""
+        if self._speculation and self._speculation.text == text:
+            return
+        await self._cancel_speculation()
+
+        base_messages = list(context.get_messages())
+        speculative_context = LLMContext(
+            messages=base_messages + [{"role": "user", "content": text}],
+            tools=context.tools,
+            tool_choice=context.tool_choice,
+        )
+        speculation = _Speculation(text, base_messages)
+        speculation.task = self.create_task(self._run_speculation(speculation, speculative_context))
+        self._speculation = speculation
+        logger.debug(f"[SPECULATIVE LLM] Speculating on: {text}")
+
+    async def _run_speculation(self, speculation: _Speculation, context: LLMContext):
+        stream = None
+        try:
+            params = self.get_llm_adapter().get_llm_invocation_params(context)
+            stream = await self.get_chat_completions(params)
+            async for chunk in stream:
+                if speculation.first_chunk_at is None and chunk.choices:
+                    speculation.first_chunk_at = time.monotonic()
+                speculation.chunks.append(chunk)
+                speculation.notify()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            speculation.error = e
+        finally:
+            speculation.done = True
+            speculation.notify()
+            if stream is not None:
+                # Stops generation server-side when the speculation is cancelled
+                try:
+                    await stream.close()
+                except Exception:
+                    pass
+
+    async def _cancel_speculation(self):
+        speculation, self._speculation = self._speculation, None
+        if speculation and speculation.task and not speculation.done:
+            await self.cancel_task(speculation.task)
+
+    def _final_user_text(self, speculation: _Speculation, context: LLMContext) -> Optional[str]:
+        """The user text `context` adds on top of the speculation's base, if that is all it adds."""
+        messages = context.get_messages()
+        if len(messages) != len(speculation.base_messages) + 1 or messages[:-1] != speculation.base_messages:
+            return None
+        content = messages[-1].get("content") if isinstance(messages[-1], dict) else None
+        return content if isinstance(content, str) else None
+
+    async def _stream_chat_completions_universal_context(self, context: LLMContext):
+        messages = context.get_messages()
+        if messages and isinstance(messages[-1], dict) and messages[-1].get("role") == "user":
+            self.turns += 1
+
+        speculation, self._speculation = self._speculation, None
+        if speculation is None:
+            return await super()._stream_chat_completions_universal_context(context)
+
+        final_text = self._final_user_text(speculation, context)
+        distance = normalized_edit_distance(speculation.text, final_text) if final_text is not None else None
+        if distance is not None and distance <= self._max_edit_distance and speculation.error is None:
+            requested_at = time.monotonic()
+            saved = min(requested_at, speculation.first_chunk_at or requested_at) - speculation.started_at
+            self.hits += 1
+            self.saved_secs += saved
+            logger.info(
+                f"[SPECULATIVE LLM] Hit (edit distance {distance:.2f}), saved {saved * 1000:.0f}ms, "
+                f"hit rate {self.hits}/{self.turns}"
+            )
+            return speculation.replay()
+
+        if speculation.task and not speculation.done:
+            await self.cancel_task(speculation.task)
+        self.misses += 1
+        reason = f"edit distance {distance:.2f}" if distance is not None else "context changed"
+        logger.info(f"[SPECULATIVE LLM] Miss ({reason}), hit rate {self.hits}/{self.turns}")
+        return await super()._stream_chat_completions_universal_context(context)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "turns": self.turns,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / self.turns if self.turns else None,
+            "saved_secs": self.saved_secs,
+        }
+
+    async def cleanup(self):
+        await self._cancel_speculation()
+        await super().cleanup()
+
+
+class SpeculativeTurnTrigger(FrameProcessor):
+    """
+    Placed between the STT service and the user context aggregator. Starts a
+    speculative request once the user's text has not changed for `stable_secs`.
+
+    The text is what the user aggregator has collected for the turn so far plus
+    the latest interim transcript, i.e. what the aggregator would push if the
+    turn ended now.
+    """
+
+    def __init__(
+        self,
+        llm: SpeculativeOpenAILLMService,
+        user_aggregator: LLMUserAggregator,
+        stable_secs: float = 0.3,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._llm = llm
+        self._user_aggregator = user_aggregator
+        self._stable_secs = stable_secs
+        self._interim = ""
+        self._timer: Optional[asyncio.Task] = None
+
+    async def _restart_timer(self):
+        if self._timer:
+            await self.cancel_task(self._timer)
+        self._timer = self.create_task(self._speculate_when_stable())
+
+    async def _speculate_when_stable(self):
+        await asyncio.sleep(self._stable_secs)
+        self._timer = None
+        text = " ".join(part for part in (self._user_aggregator.aggregation_string(), self._interim) if part).strip()
+        if text:
+            await self._llm.speculate(self._user_aggregator.context, text)
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, UserStartedSpeakingFrame):
+            self._interim = ""
+        elif isinstance(frame, InterimTranscriptionFrame):
+            if frame.text.strip() != self._interim:
+                self._interim = frame.text.strip()
+                await self._restart_timer()
+        elif isinstance(frame, TranscriptionFrame):
+            self._interim = ""
+            await self._restart_timer()
+
+        await self.push_frame(frame, direction)
+
+    async def cleanup(self):
+        if self._timer:
+            await self.cancel_task(self._timer)
+            self._timer = None
+        await super().cleanup()
@@ -1,4 +1,6 @@
 import os
+from typing import Any, Dict
+
 from pipecat.services.sarvam.tts import SarvamTTSService
 from pipecat.services.google.tts import GoogleTTSService
 from pipecat.services.openai.tts import OpenAITTSService
@@ -7,47 +9,79 @@ from pipecat.transcriptions.language import Language
 from app.core import config
 
 
-def get_tts_service(language: str):
+def get_tts_voice(language: str) -> Dict[str, Any]:
+    """
+    Provider, voice and prosody used to speak a language.
+
+    Shared by get_tts_service and the TTS audio cache, so cached audio is keyed
+    by exactly the settings the live service would use.
+    """
     if config.TTS_PROVIDER == "sarvam":
+        return {
+            "provider": "sarvam",
+            "voice": "manisha",
+            "model": "bulbul:v2",
+            "language": Language.TA
+            if language == "ta"
+            else Language.KN
+            if language == "kn"
+            else Language.HI
+            if language == "hi"
+            else Language.ML
+            if language == "ml"
+            else Language.EN,
+            "pitch": config.SARVAM_PITCH,
+            "pace": config.SARVAM_PACE,
+        }
+    elif config.TTS_PROVIDER == "google":
+        return {
+            "provider": "google",
+            "voice": "ml-IN-Chirp3-HD-Autonoe" if language == "ml" else "kn-IN-Chirp3-HD-Autonoe" if language == "kn" else "ta-IN-Chirp3-HD-Autonoe" if language == "ta" else "hi-IN-Chirp3-HD-Autonoe",
+            "language": Language.TA
+            if language == "ta"
+            else Language.KA
+            if language == "ka"
+            else Language.HI
+            if language == "hi"
+            else Language.ML,
+        }
+    elif config.TTS_PROVIDER == "openai":
+        return {
+            "provider": "openai",
+            "voice": "ballad",
+            "language": Language.TA_IN if language == "ta" else Language.KN_IN if language == "kn" else Language.HI_IN,
+        }
+    else:
+        raise ValueError(f"Invalid TTS provider: {config.TTS_PROVIDER}")
+
+
+def get_tts_service(language: str):
+    voice = get_tts_voice(language)
+
+    if voice["provider"] == "sarvam":
         return SarvamTTSService(
             api_key=config.SARVAM_API_KEY,
-            voice_id="manisha",
-            model="bulbul:v2",
+            voice_id=voice["voice"],
+            model=voice["model"],
             params=SarvamTTSService.InputParams(
-                language=Language.TA
-                if language == "ta"
-                else Language.KN
-                if language == "kn"
-                else Language.HI
-                if language == "hi"
-                else Language.ML
-                if language == "ml"
-                else Language.EN,
-                pitch=config.SARVAM_PITCH,
-                pace=config.SARVAM_PACE,
+                language=voice["language"],
+                pitch=voice["pitch"],
+                pace=voice["pace"],
             )
         )
-    elif config.TTS_PROVIDER == "google":
+    elif voice["provider"] == "google":
         return GoogleTTSService(
-            voice_id="ml-IN-Chirp3-HD-Autonoe" if language == "ml" else "kn-IN-Chirp3-HD-Autonoe" if language == "kn" else "ta-IN-Chirp3-HD-Autonoe" if language == "ta" else "hi-IN-Chirp3-HD-Autonoe",
+            voice_id=voice["voice"],
             params=GoogleTTSService.InputParams(
-                language=Language.TA
-                if language == "ta"
-                else Language.KA
-                if language == "ka"
-                else Language.HI
-                if language == "hi"
-                else Language.ML
+                language=voice["language"]
             ),
             credentials=config.GOOGLE_TEST_CREDENTIALS,
             interim_results=True,
         )
 
-    elif config.TTS_PROVIDER == "openai":
+    elif voice["provider"] == "openai":
         return OpenAITTSService(
             api_key=config.OPENAI_API_KEY,
-            voice="ballad",
-            language = Language.TA_IN if language == "ta" else Language.KN_IN if language == "kn" else Language.HI_IN,
+            voice=voice["voice"],
+            language=voice["language"],
         )
-    else:
-        raise ValueError(f"Invalid TTS provider: {config.TTS_PROVIDER}")    
\ No newline at end of file
@@ -0,0 +1,239 @@
+"""
+On-disk cache of synthesized audio for fixed utterances.
+
+Utterances that never change (BOT_WORDS, fillers, greetings,
+irrelevant-question responses) are synthesized once and stored as raw 16-bit mono PCM, keyed by
+the TTS voice settings, the text and the sample rate. A cached TTSSpeakFrame
+is then played straight from disk without a TTS round trip.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+from pipecat.frames.frames import (
+    AggregationType,
+    BotStartedSpeakingFrame,
+    BotStoppedSpeakingFrame,
+    Frame,
+    InterruptionFrame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    StartFrame,
+    TTSAudioRawFrame,
+    TTSSpeakFrame,
+    TTSStartedFrame,
+    TTSStoppedFrame,
+    TTSTextFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+
+# Size of the audio frames cached speech is played back in
+PLAYBACK_CHUNK_SECS = 0.5
+
+
+def fixed_utterances(language: str) -> List[str]:
+    """Every fixed utterance the bot may speak in a language."""
+    from app.agents.voice.driver.utils.bot_words import BOT_WORDS, get_filler_words
+    from app.agents.voice.driver.agents.not_getting_rides import system_prompt as not_getting_rides_prompt
+    from app.agents.voice.driver.agents.rc_dl_issues import system_prompt as rc_dl_issues_prompt
+    from app.agents.voice.driver.agents.ride_related_issues import system_prompt as ride_related_issues_prompt
+
+    texts = list(BOT_WORDS.get(language, {}).values())
+    texts.append(get_filler_words(language))
+    for module in (not_getting_rides_prompt, rc_dl_issues_prompt, ride_related_issues_prompt):
+        for name in ("GREETINGS", "INITIAL_MOVE", "IRRELEVANT_QUESTION_RESPONSES"):
+            text = getattr(module, name, {}).get(language)
+            if text:
+                texts.append(text)
+    return list(dict.fromkeys(texts))
+
+
+class TTSAudioCache:
+    """
+    Raw PCM per (voice settings, text, sample rate) under `cache_dir`.
+
+    Entries read from disk are kept in memory for the life of the process.
+    """
+
+    def __init__(self, cache_dir: str, voice: Dict[str, Any]):
+        self.cache_dir = cache_dir
+        self.voice = {name: str(value) for name, value in voice.items()}
+        self._memory: Dict[str, bytes] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, text: str, sample_rate: int) -> str:
+        material = json.dumps({**self.voice, "text": text.strip(), "sample_rate": sample_rate}, sort_keys=True)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pcm")
+
+    def contains(self, text: str, sample_rate: int) -> bool:
+        key = self.key(text, sample_rate)
+        return key in self._memory or os.path.exists(self._path(key))
+
+    def _read(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    async def get(self, text: str, sample_rate: int) -> Optional[bytes]:
+        """Cached audio for a text, or None."""
+        key = self.key(text, sample_rate)
+        audio = self._memory.get(key)
+        if audio is None:
+            audio = await asyncio.to_thread(self._read, key)
+            if audio is not None:
+                self._memory[key] = audio
+        if audio is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return audio
+
+    def _replace(self, path: str, data: bytes):
+        # Write to a unique temporary file then rename, so bots and sessions
+        # storing the same entry at once never read or write a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _write(self, key: str, text: str, sample_rate: int, audio: bytes):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._replace(self._path(key), audio)
+        metadata = {**self.voice, "text": text, "sample_rate": sample_rate}
+        self._replace(
+            os.path.join(self.cache_dir, f"{key}.json"),
+            json.dumps(metadata, ensure_ascii=False).encode("utf-8"),
+        )
+
+    async def put(self, text: str, sample_rate: int, audio: bytes):
+        key = self.key(text, sample_rate)
+        self._memory[key] = audio
+        try:
+            await asyncio.to_thread(self._write, key, text, sample_rate, audio)
+            logger.info(f"[TTS CACHE] Stored {len(audio) / (2 * sample_rate):.1f}s of audio for: {text[:40]}")
+        except OSError as e:
+            logger.error(f"[TTS CACHE] Failed to store audio: {e}")
+
+
+class CachedSpeechRecorder(FrameProcessor):
+    """
+    Placed after the TTS service. Captures the audio the service produces for
+    utterances CachedSpeechPlayer let through on a miss and stores it.
+    """
+
+    def __init__(self, cache: TTSAudioCache, resume_tts: bool = False, **kwargs):
+        """
+        Args:
+            cache: Cache to store captured audio in
+            resume_tts: Push BotStoppedSpeakingFrame upstream after each stored
+                utterance. Only for pipelines without an output transport
+                (cache warming), where nothing else resumes a TTS service that
+                pauses after a TTSSpeakFrame.
+        """
+        super().__init__(**kwargs)
+        self._cache = cache
+        self._resume_tts = resume_tts
+        self._pending: Deque[Tuple[str, int]] = deque()
+        self._audio: Optional[bytearray] = None
+
+    def expect(self, text: str, sample_rate: int):
+        """Capture the next TTS response as the audio for `text`."""
+        self._pending.append((text, sample_rate))
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, InterruptionFrame):
+            self._pending.clear()
+            self._audio = None
+        elif self._pending and direction == FrameDirection.DOWNSTREAM:
+            if isinstance(frame, TTSStartedFrame):
+                self._audio = bytearray()
+            elif isinstance(frame, TTSAudioRawFrame) and self._audio is not None:
+                self._audio.extend(frame.audio)
+            elif isinstance(frame, TTSStoppedFrame) and self._audio is not None:
+                text, sample_rate = self._pending.popleft()
+                audio, self._audio = bytes(self._audio), None
+                if audio:
+                    await self._cache.put(text, sample_rate, audio)
+                if self._resume_tts:
+                    await self.push_frame(BotStoppedSpeakingFrame(), FrameDirection.UPSTREAM)
+
+        await self.push_frame(frame, direction)
+
+
+class CachedSpeechPlayer(FrameProcessor):
+    """
+    Placed right before the TTS service. Plays TTSSpeakFrames found in the
+    cache and hands fixed utterances that miss to the recorder.
+
+    A miss is only recorded while the LLM is not responding and the bot is
+    silent, so the captured TTS response cannot contain other speech.
+    """
+
+    def __init__(
+        self,
+        cache: TTSAudioCache,
+        recorder: CachedSpeechRecorder,
+        recordable: Iterable[str] = (),
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._cache = cache
+        self._recorder = recorder
+        self._recordable = set(recordable)
+        self._sample_rate = 0
+        self._llm_responding = False
+        self._bot_speaking = False
+
+    async def _play(self, text: str, audio: bytes):
+        chunk_size = int(self._sample_rate * PLAYBACK_CHUNK_SECS) * 2
+        await self.push_frame(TTSStartedFrame())
+        for start in range(0, len(audio), chunk_size):
+            await self.push_frame(
+                TTSAudioRawFrame(audio=audio[start:start + chunk_size], sample_rate=self._sample_rate, num_channels=1)
+            )
+        # Same order as the TTS service: the spoken text follows its audio
+        await self.push_frame(TTSTextFrame(text, aggregated_by=AggregationType.SENTENCE))
+        await self.push_frame(TTSStoppedFrame())
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, StartFrame):
+            self._sample_rate = frame.audio_out_sample_rate
+        elif isinstance(frame, LLMFullResponseStartFrame):
+            self._llm_responding = True
+        elif isinstance(frame, LLMFullResponseEndFrame):
+            self._llm_responding = False
+        elif isinstance(frame, BotStartedSpeakingFrame):
+            self._bot_speaking = True
+        elif isinstance(frame, BotStoppedSpeakingFrame):
+            self._bot_speaking = False
+        elif isinstance(frame, TTSSpeakFrame) and self._sample_rate:
+            audio = await self._cache.get(frame.text, self._sample_rate)
+            if audio:
+                logger.debug(f"[TTS CACHE] Playing cached audio for: {frame.text[:40]}")
+                await self._play(frame.text, audio)
+                return
+            if frame.text in self._recordable and not self._llm_responding and not self._bot_speaking:
+                self._recorder.expect(frame.text, self._sample_rate)
+
+        await self.push_frame(frame, direction)
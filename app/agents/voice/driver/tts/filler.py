@@ -0,0 +1,195 @@
+"""
+Filler audio played while a slow tool call is running.
+
+Lookups like get_driver_info take several seconds, during which the caller
+hears silence and often talks over the bot. Once a tool call has been running
+for longer than a threshold, a short cached filler ("one moment, let me
+check") is played, and cut off with a short fade when the result comes back.
+"""
+import array
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+from pipecat.frames.frames import (
+    Frame,
+    FunctionCallCancelFrame,
+    FunctionCallInProgressFrame,
+    FunctionCallResultFrame,
+    InterruptionFrame,
+    LLMTextFrame,
+    StartFrame,
+    TTSAudioRawFrame,
+    TTSSpeakFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from app.agents.voice.driver.tts.cache import TTSAudioCache
+
+
+# Size of the audio frames filler audio is played back in
+FILLER_CHUNK_SECS = 0.04
+# How far playback may run ahead of real time, bounding how late a cut takes effect
+FILLER_LEAD_SECS = 0.2
+# Length of the fade applied where playback is cut
+FILLER_FADE_OUT_SECS = 0.03
+
+
+def _fade_out(audio: bytes) -> bytes:
+    samples = array.array("h", audio[: len(audio) - len(audio) % 2])
+    count = len(samples)
+    for i in range(count):
+        samples[i] = int(samples[i] * (count - i) / count)
+    return samples.tobytes()
+
+
+class ToolCallFiller(FrameProcessor):
+    """
+    Placed between the LLM and the TTS processors. Plays `text` from the TTS
+    audio cache once a tool call has been running for `after_secs`.
+
+    Filler audio is pushed in small chunks paced to real time, so stopping it
+    only leaves FILLER_LEAD_SECS of audio queued in the output transport. It is
+    not added to the LLM context. The filler is off without a `cache`, and
+    skipped while it is missing from the cache; app/main.py runs
+    warm_cache.py, which synthesizes it, when the pod starts.
+
+    Each turn with a tool call is logged with the tool time, when the response
+    started after the user stopped speaking, how much of that was silence, and
+    how long the filler played, so turns can be compared with the filler on
+    and off (`enabled`).
+    """
+
+    def __init__(
+        self,
+        cache: Optional[TTSAudioCache],
+        text: str,
+        after_secs: float = 1.5,
+        enabled: bool = True,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._cache = cache
+        self._text = text
+        self._after_secs = after_secs
+        self._enabled = enabled and bool(text) and cache is not None
+        self._sample_rate = 0
+        self._missed = False
+
+        self._tool_calls: Dict[str, str] = {}
+        self._filler_task: Optional[asyncio.Task] = None
+        self._stop = asyncio.Event()
+
+        self._user_stopped_at: Optional[float] = None
+        self._reset_turn()
+
+    def _reset_turn(self):
+        self._turn_tools: List[str] = []
+        self._tools_started_at: Optional[float] = None
+        self._tools_done_at: Optional[float] = None
+        self._filler_started_at: Optional[float] = None
+        self._filler_secs = 0.0
+
+    async def _play_filler(self):
+        try:
+            await asyncio.wait_for(self._stop.wait(), self._after_secs)
+            return
+        except asyncio.TimeoutError:
+            pass
+
+        audio = await self._cache.get(self._text, self._sample_rate)
+        if not audio:
+            if not self._missed:
+                self._missed = True
+                logger.warning(f"[FILLER] Filler not in the TTS cache (yet), skipping it: {self._text}")
+            return
+
+        sample_rate = self._sample_rate
+        chunk_size = int(sample_rate * FILLER_CHUNK_SECS) * 2
+        started_at = self._filler_started_at = time.monotonic()
+        logger.info(f"[FILLER] Tool call running for {self._after_secs}s, playing filler")
+
+        position = 0
+        while position < len(audio):
+            if self._stop.is_set():
+                # Fade out from where playback stopped instead of ending mid-waveform
+                fade = _fade_out(audio[position:position + int(sample_rate * FILLER_FADE_OUT_SECS) * 2])
+                if fade:
+                    await self.push_frame(TTSAudioRawFrame(audio=fade, sample_rate=sample_rate, num_channels=1))
+                    position += len(fade)
+                break
+
+            chunk = audio[position:position + chunk_size]
+            await self.push_frame(TTSAudioRawFrame(audio=chunk, sample_rate=sample_rate, num_channels=1))
+            position += len(chunk)
+
+            ahead = position / (2 * sample_rate) - (time.monotonic() - started_at) - FILLER_LEAD_SECS
+            if ahead > 0:
+                try:
+                    await asyncio.wait_for(self._stop.wait(), ahead)
+                except asyncio.TimeoutError:
+                    pass
+
+        self._filler_secs += position / (2 * sample_rate)
+
+    async def _stop_filler(self):
+        if self._filler_task:
+            self._stop.set()
+            await self._filler_task
+            self._filler_task = None
+
+    def _log_turn(self, response_at: float):
+        if self._user_stopped_at is None or self._tools_started_at is None:
+            return
+        response_secs = response_at - self._user_stopped_at
+        first_audio_at = self._filler_started_at or response_at
+        silence_secs = first_audio_at - self._user_stopped_at
+        tool_secs = (self._tools_done_at or response_at) - self._tools_started_at
+        logger.info(
+            f"[FILLER] Tool turn ({', '.join(self._turn_tools)}): tools {tool_secs:.2f}s, "
+            f"response after {response_secs:.2f}s, silence {silence_secs:.2f}s, "
+            f"filler {self._filler_secs:.2f}s (filler {'on' if self._enabled else 'off'})"
+        )
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, StartFrame):
+            self._sample_rate = frame.audio_out_sample_rate
+        elif isinstance(frame, UserStoppedSpeakingFrame):
+            self._user_stopped_at = time.monotonic()
+            self._reset_turn()
+        elif isinstance(frame, FunctionCallInProgressFrame) and direction == FrameDirection.DOWNSTREAM:
+            self._tool_calls[frame.tool_call_id] = frame.function_name
+            self._turn_tools.append(frame.function_name)
+            if self._tools_started_at is None:
+                self._tools_started_at = time.monotonic()
+            if self._enabled and self._sample_rate and self._filler_task is None:
+                self._stop.clear()
+                self._filler_task = self.create_task(self._play_filler())
+        elif isinstance(frame, (FunctionCallResultFrame, FunctionCallCancelFrame)) and direction == FrameDirection.DOWNSTREAM:
+            self._tool_calls.pop(frame.tool_call_id, None)
+            if not self._tool_calls:
+                self._tools_done_at = time.monotonic()
+                await self._stop_filler()
+        elif isinstance(frame, InterruptionFrame):
+            self._tool_calls.clear()
+            await self._stop_filler()
+            self._reset_turn()
+        elif isinstance(frame, (LLMTextFrame, TTSSpeakFrame)) and direction == FrameDirection.DOWNSTREAM:
+            # Other speech is about to start, e.g. the escalation message
+            await self._stop_filler()
+            if self._turn_tools and not self._tool_calls:
+                self._log_turn(time.monotonic())
+                self._reset_turn()
+
+        await self.push_frame(frame, direction)
+
+    async def cleanup(self):
+        if self._filler_task:
+            await self.cancel_task(self._filler_task)
+            self._filler_task = None
+        await super().cleanup()
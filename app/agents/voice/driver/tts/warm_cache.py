@@ -0,0 +1,69 @@
+"""
+Synthesize every fixed utterance into the TTS audio cache ahead of time.
+
+Pods are single-use, so TTS_CACHE_DIR is a node volume shared by every pod
+on the node, and app/main.py runs this in the background when a pod starts.
+Only utterances missing from the cache are synthesized, so after the first
+pod on a node it has nothing to do. To warm a cache by hand:
+
+    python -m app.agents.voice.driver.tts.warm_cache --languages kn ta hi ml
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+
+project_root = Path(__file__).parent.parent.parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from dotenv import load_dotenv
+from loguru import logger
+
+from pipecat.frames.frames import EndFrame, TTSSpeakFrame
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineParams, PipelineTask
+
+load_dotenv(override=True)
+
+from app.core import config
+from app.agents.voice.driver.tts import get_tts_service, get_tts_voice
+from app.agents.voice.driver.tts.cache import (
+    CachedSpeechPlayer,
+    CachedSpeechRecorder,
+    TTSAudioCache,
+    fixed_utterances,
+)
+
+
+async def warm_language(language: str, cache_dir: str):
+    params = PipelineParams()
+    cache = TTSAudioCache(cache_dir, get_tts_voice(language))
+    texts = [
+        text for text in fixed_utterances(language)
+        if not cache.contains(text, params.audio_out_sample_rate)
+    ]
+    if not texts:
+        logger.info(f"[TTS CACHE] {language}: all fixed utterances already cached")
+        return
+
+    logger.info(f"[TTS CACHE] {language}: synthesizing {len(texts)} utterances")
+    recorder = CachedSpeechRecorder(cache, resume_tts=True)
+    player = CachedSpeechPlayer(cache, recorder, recordable=texts)
+    task = PipelineTask(Pipeline([player, get_tts_service(language), recorder]), params=params)
+    await task.queue_frames([TTSSpeakFrame(text) for text in texts] + [EndFrame()])
+    await PipelineRunner(handle_sigint=False).run(task)
+
+
+async def main(languages, cache_dir: str):
+    for language in languages:
+        await warm_language(language, cache_dir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--languages", nargs="+", default=["kn", "ta", "hi", "ml"], help="Language codes to warm")
+    parser.add_argument("--cache-dir", default=config.TTS_CACHE_DIR, help="Directory to store the audio in")
+    args = parser.parse_args()
+    asyncio.run(main(args.languages, args.cache_dir))
@@ -0,0 +1,182 @@
+"""
+Per-session VAD parameters adapted to the caller's background noise.
+
+Drivers call from loud auto-rickshaws as well as quiet rooms, and one fixed
+VADParams does not fit both: in noise, engine and traffic bursts pass a low
+confidence threshold and short pauses end the turn early (each false turn is
+an extra LLM round), while quiet callers wait out a stop_secs sized for noise.
+
+AdaptiveVADController measures the input's noise floor and speech level and
+moves confidence and stop_secs between configured bounds.
+"""
+from typing import List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from pipecat.audio.vad.vad_analyzer import VADParams
+from pipecat.frames.frames import (
+    CancelFrame,
+    EndFrame,
+    Frame,
+    InputAudioRawFrame,
+    VADParamsUpdateFrame,
+    VADUserStartedSpeakingFrame,
+    VADUserStoppedSpeakingFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+
+# Length of the blocks whose energy is measured
+BLOCK_SECS = 0.01
+# SNRs (dB) treated as a quiet and as a noisy call; in between, parameters are interpolated
+QUIET_SNR_DB = 35.0
+NOISY_SNR_DB = 12.0
+# Smallest parameter changes worth resetting the VAD for
+MIN_CONFIDENCE_CHANGE = 0.05
+MIN_STOP_SECS_CHANGE = 0.1
+
+
+def block_levels(audio: bytes, sample_rate: int, block_secs: float = BLOCK_SECS) -> np.ndarray:
+    """RMS level in dBFS of every full `block_secs` block of 16-bit mono audio."""
+    samples = np.frombuffer(audio, dtype=np.int16)
+    block = max(int(sample_rate * block_secs), 1)
+    count = len(samples) // block
+    if not count:
+        return np.empty(0, dtype=np.float32)
+    blocks = samples[:count * block].astype(np.float32).reshape(count, block) / 32768.0
+    rms = np.sqrt(np.mean(blocks * blocks, axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-6))
+
+
+def noise_profile(levels: np.ndarray) -> Tuple[float, float]:
+    """
+    Noise floor and speech level (dBFS) of a stretch of call audio.
+
+    The floor is the 10th percentile of the block levels, which lands in the
+    pauses, and the speech level is the 90th percentile, which lands in the
+    caller's speech as long as they speak for more than a tenth of the time.
+    """
+    noise_floor, speech_level = np.percentile(levels, [10, 90])
+    return float(noise_floor), float(speech_level)
+
+
+def adapt_vad_params(
+    base: VADParams,
+    snr_db: float,
+    confidence_range: Tuple[float, float],
+    stop_secs_range: Tuple[float, float],
+) -> VADParams:
+    """
+    VAD parameters for a call with `snr_db`: the low ends of the ranges at
+    QUIET_SNR_DB and above, the high ends at NOISY_SNR_DB and below.
+    """
+    noisiness = float(np.clip((QUIET_SNR_DB - snr_db) / (QUIET_SNR_DB - NOISY_SNR_DB), 0.0, 1.0))
+    confidence = confidence_range[0] + noisiness * (confidence_range[1] - confidence_range[0])
+    stop_secs = stop_secs_range[0] + noisiness * (stop_secs_range[1] - stop_secs_range[0])
+    return base.model_copy(update={"confidence": round(confidence, 2), "stop_secs": round(stop_secs, 2)})
+
+
+class AdaptiveVADController(FrameProcessor):
+    """
+    Placed right after transport.input(). Measures the caller's input audio
+    and pushes VADParamsUpdateFrame upstream to the input transport.
+
+    The first estimate is made once the caller has finished a first utterance
+    and `warmup_secs` of audio have been seen; before that (typically while
+    the greeting plays) the speech level would only be noise, so the base
+    parameters are kept. It is refreshed every `update_secs` over the last
+    `window_secs`. set_params resets the
+    VAD's state, so new parameters are only sent while the caller is not
+    speaking, and only when they differ enough from the current ones.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        base_params: VADParams,
+        confidence_range: Tuple[float, float],
+        stop_secs_range: Tuple[float, float],
+        warmup_secs: float = 3.0,
+        update_secs: float = 2.0,
+        window_secs: float = 20.0,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._session_id = session_id
+        self._params = base_params
+        self._confidence_range = confidence_range
+        self._stop_secs_range = stop_secs_range
+        self._warmup_blocks = int(warmup_secs / BLOCK_SECS)
+        self._update_blocks = int(update_secs / BLOCK_SECS)
+        self._window_blocks = int(window_secs / BLOCK_SECS)
+
+        self._levels: List[np.ndarray] = []
+        self._level_count = 0
+        self._blocks_since_update = 0
+        self._estimated = False
+        self._heard_speech = False
+        self._speaking = False
+        self._pending: Optional[VADParams] = None
+        self._updates = 0
+        self._snr_db: Optional[float] = None
+
+    def _add_audio(self, frame: InputAudioRawFrame):
+        levels = block_levels(frame.audio, frame.sample_rate)
+        if not len(levels):
+            return
+        self._levels.append(levels)
+        self._level_count += len(levels)
+        self._blocks_since_update += len(levels)
+        while self._level_count - len(self._levels[0]) >= self._window_blocks:
+            self._level_count -= len(self._levels.pop(0))
+
+    def _estimate(self):
+        levels = np.concatenate(self._levels)
+        noise_floor, speech_level = noise_profile(levels)
+        self._snr_db = speech_level - noise_floor
+        params = adapt_vad_params(self._params, self._snr_db, self._confidence_range, self._stop_secs_range)
+        if (
+            abs(params.confidence - self._params.confidence) >= MIN_CONFIDENCE_CHANGE
+            or abs(params.stop_secs - self._params.stop_secs) >= MIN_STOP_SECS_CHANGE
+        ):
+            logger.info(
+                f"[ADAPTIVE VAD] Session {self._session_id}: noise floor {noise_floor:.1f}dBFS, "
+                f"SNR {self._snr_db:.1f}dB -> confidence {params.confidence}, stop_secs {params.stop_secs}"
+            )
+            self._pending = params
+        else:
+            self._pending = None
+
+    async def _apply_pending(self):
+        if self._pending is None or self._speaking:
+            return
+        self._params, self._pending = self._pending, None
+        self._updates += 1
+        await self.push_frame(VADParamsUpdateFrame(params=self._params), FrameDirection.UPSTREAM)
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, InputAudioRawFrame):
+            self._add_audio(frame)
+            ready = self._heard_speech and self._level_count >= self._warmup_blocks
+            if ready and (not self._estimated or self._blocks_since_update >= self._update_blocks):
+                self._estimated = True
+                self._blocks_since_update = 0
+                self._estimate()
+            await self._apply_pending()
+        elif isinstance(frame, VADUserStartedSpeakingFrame):
+            self._speaking = True
+        elif isinstance(frame, VADUserStoppedSpeakingFrame):
+            self._speaking = False
+            self._heard_speech = True
+            await self._apply_pending()
+        elif isinstance(frame, (EndFrame, CancelFrame)) and self._snr_db is not None:
+            logger.info(
+                f"[ADAPTIVE VAD] Session {self._session_id} ended with SNR {self._snr_db:.1f}dB, "
+                f"confidence {self._params.confidence}, stop_secs {self._params.stop_secs} "
+                f"({self._updates} updates)"
+            )
+
+        await self.push_frame(frame, direction)
@@ -0,0 +1,301 @@
+"""
+Batched VAD and smart-turn inference shared by every session in a process.
+
+Each pipecat SileroVADAnalyzer and LocalSmartTurnAnalyzerV3 loads its own
+ONNX session and runs one window at a time on its own thread. With several
+sessions in one process (inprocess mode), BatchedInferenceService holds one
+Silero session and one smart-turn session instead, gathers the VAD windows
+and turn-end queries of all sessions into micro-batches and runs each batch
+as a single ONNX call on a fixed thread pool.
+
+The analyzers keep pipecat's interface: pipecat still calls voice_confidence
+and _predict_endpoint from each analyzer's own executor thread, which blocks
+until its batch has run. Threads are started on first use in the process
+that uses them, so the zygote can build analyzers before it forks.
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from pipecat.audio.turn.smart_turn.base_smart_turn import BaseSmartTurn
+from pipecat.audio.vad.vad_analyzer import VADAnalyzer, VADParams
+
+from app.core import config
+
+
+# Seconds after which a stream's Silero state is reset, as SileroVADAnalyzer does
+VAD_RESET_STATES_SECS = 5.0
+# Smart-turn looks at the last 8 seconds of 16kHz audio
+TURN_WINDOW_SAMPLES = 8 * 16000
+
+
+def _model_path(package_path: str, model_name: str) -> str:
+    from importlib import resources
+
+    return str(resources.files(package_path).joinpath(model_name))
+
+
+def _onnx_session(path: str):
+    import onnxruntime
+
+    # One intra-op thread: parallelism comes from the service's pool, and no
+    # onnxruntime thread pool exists to be lost across the zygote's fork
+    options = onnxruntime.SessionOptions()
+    options.inter_op_num_threads = 1
+    options.intra_op_num_threads = 1
+    options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    return onnxruntime.InferenceSession(path, providers=["CPUExecutionProvider"], sess_options=options)
+
+
+class _MicroBatcher:
+    """
+    Collects blocking requests from many threads into batches of at most
+    `max_batch`, waiting at most `max_wait_secs` after the first request of a
+    batch, and runs `run_batch` on the batch in `executor`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run_batch: Callable[[List[Any]], List[Any]],
+        max_batch: int,
+        max_wait_secs: float,
+    ):
+        self.name = name
+        self._run_batch = run_batch
+        self.max_batch = max_batch
+        self.max_wait_secs = max_wait_secs
+        self._queue: "queue.Queue[Tuple[Any, Future]]" = queue.Queue()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self.requests = 0
+        self.batches = 0
+        self.max_batch_seen = 0
+
+    def start(self, executor: ThreadPoolExecutor):
+        self._executor = executor
+        threading.Thread(target=self._collect, name=f"{self.name}-batcher", daemon=True).start()
+
+    def submit(self, item: Any) -> Any:
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future.result()
+
+    def _collect(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait_secs
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self.requests += len(batch)
+            self.batches += 1
+            self.max_batch_seen = max(self.max_batch_seen, len(batch))
+            self._executor.submit(self._run, batch)
+
+    def _run(self, batch: List[Tuple[Any, Future]]):
+        try:
+            results = self._run_batch([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch": self.requests / self.batches if self.batches else 0,
+            "max_batch": self.max_batch_seen,
+        }
+
+
+class _VADStream:
+    """Silero recurrent state of one session's audio stream."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.state = np.zeros((2, 1, 128), dtype=np.float32)
+        self.context: Optional[np.ndarray] = None
+        self.reset_at = time.time()
+
+
+class BatchedInferenceService:
+    """
+    One Silero VAD and one smart-turn ONNX session for the whole process,
+    run in batches on `threads` worker threads.
+    """
+
+    def __init__(
+        self,
+        threads: int = 2,
+        vad_max_batch: int = 32,
+        vad_max_wait_secs: float = 0.002,
+        turn_max_batch: int = 8,
+        turn_max_wait_secs: float = 0.01,
+    ):
+        from transformers import WhisperFeatureExtractor
+
+        self.threads = threads
+        self._vad_session = _onnx_session(_model_path("pipecat.audio.vad.data", "silero_vad.onnx"))
+        self._turn_session = _onnx_session(
+            _model_path("pipecat.audio.turn.smart_turn.data", "smart-turn-v3.1-cpu.onnx")
+        )
+        self._feature_extractor = WhisperFeatureExtractor(chunk_length=8)
+        # Flipped off if the model rejects a batch dimension above 1
+        self._turn_batching = True
+
+        self._vad = _MicroBatcher("vad", self._run_vad_batch, vad_max_batch, vad_max_wait_secs)
+        self._turn = _MicroBatcher("smart-turn", self._run_turn_batch, turn_max_batch, turn_max_wait_secs)
+        self._started_pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._started_pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._started_pid != os.getpid():
+                executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="batched-inference")
+                self._vad.start(executor)
+                self._turn.start(executor)
+                self._started_pid = os.getpid()
+                logger.info(f"[INFERENCE] Batched VAD/smart-turn inference started on {self.threads} threads")
+
+    # VAD
+
+    def vad_confidence(self, stream: _VADStream, audio: np.ndarray, sample_rate: int) -> float:
+        """Voice confidence of one 32ms window (512 samples at 16kHz, 256 at 8kHz)."""
+        self._ensure_started()
+        if time.time() - stream.reset_at >= VAD_RESET_STATES_SECS:
+            stream.reset()
+        return self._vad.submit((stream, audio, sample_rate))
+
+    def _run_vad_batch(self, items: List[Tuple[_VADStream, np.ndarray, int]]) -> List[float]:
+        results: Dict[int, float] = {}
+        for sample_rate in {sample_rate for _, _, sample_rate in items}:
+            indexes = [i for i, item in enumerate(items) if item[2] == sample_rate]
+            context_size = 64 if sample_rate == 16000 else 32
+            streams = [items[i][0] for i in indexes]
+            contexts = [
+                stream.context if stream.context is not None else np.zeros((1, context_size), dtype=np.float32)
+                for stream in streams
+            ]
+            x = np.concatenate(
+                [np.concatenate(contexts, axis=0), np.stack([items[i][1] for i in indexes])], axis=1
+            )
+            state = np.concatenate([stream.state for stream in streams], axis=1)
+            out, state = self._vad_session.run(
+                None, {"input": x, "state": state, "sr": np.array(sample_rate, dtype=np.int64)}
+            )
+            for row, (i, stream) in enumerate(zip(indexes, streams)):
+                stream.state = state[:, row:row + 1, :]
+                stream.context = x[row:row + 1, -context_size:]
+                results[i] = float(out[row][0])
+        return [results[i] for i in range(len(items))]
+
+    # Smart turn
+
+    def turn_probability(self, audio: np.ndarray) -> float:
+        """Probability that the turn in `audio` (16kHz float32) is complete."""
+        self._ensure_started()
+        if len(audio) > TURN_WINDOW_SAMPLES:
+            audio = audio[-TURN_WINDOW_SAMPLES:]
+        elif len(audio) < TURN_WINDOW_SAMPLES:
+            audio = np.pad(audio, (TURN_WINDOW_SAMPLES - len(audio), 0))
+        # Feature extraction stays on the calling session's thread
+        features = self._feature_extractor(
+            audio,
+            sampling_rate=16000,
+            return_tensors="np",
+            padding="max_length",
+            max_length=TURN_WINDOW_SAMPLES,
+            truncation=True,
+            do_normalize=True,
+        ).input_features.astype(np.float32)
+        return self._turn.submit(features)
+
+    def _run_turn_batch(self, items: List[np.ndarray]) -> List[float]:
+        if self._turn_batching and len(items) > 1:
+            try:
+                outputs = self._turn_session.run(None, {"input_features": np.concatenate(items, axis=0)})
+                return [float(probability) for probability in outputs[0].reshape(len(items), -1)[:, 0]]
+            except Exception as e:
+                self._turn_batching = False
+                logger.warning(f"[INFERENCE] Smart-turn model does not take batches, running queries one by one: {e}")
+        return [float(self._turn_session.run(None, {"input_features": features})[0].reshape(-1)[0]) for features in items]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"threads": self.threads, "vad": self._vad.stats(), "smart_turn": self._turn.stats()}
+
+
+class BatchedVADAnalyzer(VADAnalyzer):
+    """Silero VAD for one session, run through a BatchedInferenceService."""
+
+    def __init__(self, service: BatchedInferenceService, *, sample_rate: Optional[int] = None, params: Optional[VADParams] = None):
+        super().__init__(sample_rate=sample_rate, params=params)
+        self._service = service
+        self._stream = _VADStream()
+
+    def set_sample_rate(self, sample_rate: int):
+        if sample_rate != 16000 and sample_rate != 8000:
+            raise ValueError(f"Silero VAD sample rate needs to be 16000 or 8000 (sample rate: {sample_rate})")
+        super().set_sample_rate(sample_rate)
+
+    def num_frames_required(self) -> int:
+        return 512 if self.sample_rate == 16000 else 256
+
+    def voice_confidence(self, buffer) -> float:
+        try:
+            audio = np.frombuffer(buffer, np.int16).astype(np.float32) / 32768.0
+            return self._service.vad_confidence(self._stream, audio, self.sample_rate)
+        except Exception as e:
+            logger.error(f"[INFERENCE] Error analyzing audio with batched Silero VAD: {e}")
+            return 0
+
+
+class BatchedSmartTurnAnalyzer(BaseSmartTurn):
+    """
+    smart-turn-v3 for one session, run through a BatchedInferenceService.
+    The turn is complete when the probability is above `threshold`.
+    """
+
+    def __init__(self, service: BatchedInferenceService, threshold: float = 0.5, **kwargs):
+        super().__init__(**kwargs)
+        self._service = service
+        self._threshold = threshold
+
+    def _predict_endpoint(self, audio_array: np.ndarray) -> Dict[str, Any]:
+        probability = self._service.turn_probability(audio_array)
+        return {"prediction": 1 if probability > self._threshold else 0, "probability": probability}
+
+
+_service: Optional[BatchedInferenceService] = None
+_service_lock = threading.Lock()
+
+
+def get_inference_service() -> BatchedInferenceService:
+    """The process-wide service, built on first use."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = BatchedInferenceService(
+                threads=config.BATCHED_INFERENCE_THREADS,
+                vad_max_wait_secs=config.BATCHED_VAD_MAX_WAIT_MS / 1000,
+                turn_max_wait_secs=config.BATCHED_TURN_MAX_WAIT_MS / 1000,
+            )
+        return _service
@@ -27,6 +27,15 @@ BOT_WORDS = {
     },
 }
 
+# Played while a slow tool call is running
+FILLER_WORDS = {
+    "ta": "ஒரு நிமிஷம், check பண்றேன்.",
+    "kn": "ಒಂದು ನಿಮಿಷ, check ಮಾಡ್ತೀನಿ.",
+    "hi": "एक मिनट, check कर रही हूँ.",
+    "ml": "ഒരു നിമിഷം, ഞാൻ പരിശോധിക്കുന്നു.",
+    "en": "One moment, let me check.",
+}
+
 
 def get_bot_words(language: str, key: str) -> str:
     """
@@ -40,4 +49,17 @@ def get_bot_words(language: str, key: str) -> str:
         String message for the specified language and key.
     """
     language_dict = BOT_WORDS.get(language, BOT_WORDS["kn"])
-    return language_dict.get(key, "")
\ No newline at end of file
+    return language_dict.get(key, "")
+
+
+def get_filler_words(language: str) -> str:
+    """
+    Get the filler played during slow tool calls for the specified language.
+
+    Args:
+        language: Language code (ta, kn, hi, ml).
+
+    Returns:
+        Filler text for the specified language.
+    """
+    return FILLER_WORDS.get(language, FILLER_WORDS["kn"])
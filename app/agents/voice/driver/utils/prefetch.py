@@ -0,0 +1,105 @@
+"""
+Tool calls started when the session starts, before the LLM asks for them.
+
+When the inputs of an agent's lookup are known as run_bot starts (the driver
+number), the agent fires its MCP lookup while the greeting plays; lookups
+that depend on what the driver says are not prefetched.
+The function handler then answers from the prefetched result, or awaits the
+request still in flight, instead of starting the lookup mid-conversation.
+"""
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from app.core.session_manager import get_session_manager
+
+
+# Session key the session's ToolPrefetch is stored under
+PREFETCH_SESSION_KEY = "tool_prefetch"
+
+CallTool = Callable[[str, Dict[str, Any]], Awaitable[Any]]
+
+
+def _key(tool_name: str, parameters: Dict[str, Any]) -> str:
+    return json.dumps([tool_name, parameters], sort_keys=True, default=str)
+
+
+class ToolPrefetch:
+    """
+    In-flight and finished tool calls of one session, keyed by tool name and
+    parameters.
+
+    A prefetched result answers only the first matching call. Later calls,
+    e.g. the LLM checking again after a notification was sent, go to the MCP
+    server so they see fresh data.
+    """
+
+    def __init__(self, session_id: str, call_tool: CallTool):
+        self.session_id = session_id
+        self._call_tool = call_tool
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def start(self, tool_name: str, parameters: Dict[str, Any]):
+        key = _key(tool_name, parameters)
+        if key not in self._tasks:
+            logger.info(f"[PREFETCH] Prefetching {tool_name} for session {self.session_id}")
+            self._tasks[key] = asyncio.create_task(self._call_tool(tool_name, parameters))
+
+    async def take(self, tool_name: str, parameters: Dict[str, Any]) -> Optional[Any]:
+        """
+        Prefetched result of a call, waiting for it if still in flight.
+
+        Returns None if the call was not prefetched or the prefetch failed, in
+        which case the caller makes the call itself.
+        """
+        task = self._tasks.pop(_key(tool_name, parameters), None)
+        if task is None:
+            return None
+
+        in_flight = not task.done()
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            return None
+        except Exception as e:
+            logger.error(f"[PREFETCH] Prefetched {tool_name} failed: {e}")
+            return None
+
+        if not result or (isinstance(result, dict) and result.get("success") is False):
+            logger.warning(f"[PREFETCH] Prefetched {tool_name} returned an error, calling it again")
+            return None
+        logger.info(f"[PREFETCH] {tool_name} answered from prefetch ({'awaited in-flight request' if in_flight else 'ready'})")
+        return result
+
+    def cancel(self):
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+
+
+async def start_prefetch(session_id: str, call_tool: CallTool, calls: List[Tuple[str, Dict[str, Any]]]) -> ToolPrefetch:
+    """
+    Start tool calls for a session and store them in the session.
+
+    Args:
+        session_id: Session to prefetch for
+        call_tool: The agent's MCP call, called as call_tool(tool_name, parameters)
+        calls: (tool_name, parameters) of each call to prefetch
+    """
+    prefetch = ToolPrefetch(session_id, call_tool)
+    for tool_name, parameters in calls:
+        prefetch.start(tool_name, parameters)
+    await get_session_manager().set_value(session_id, PREFETCH_SESSION_KEY, prefetch)
+    return prefetch
+
+
+async def call_tool_with_prefetch(session_id: str, call_tool: CallTool, tool_name: str, parameters: Dict[str, Any]) -> Any:
+    """Answer a tool call from the session's prefetch if it covers it, else call the tool."""
+    prefetch = await get_session_manager().get_value(session_id, PREFETCH_SESSION_KEY)
+    if prefetch is not None:
+        result = await prefetch.take(tool_name, parameters)
+        if result is not None:
+            return result
+    return await call_tool(tool_name, parameters)
@@ -0,0 +1,165 @@
+"""
+Call recording streamed out while the call runs.
+
+AudioBufferProcessor hands over fixed-size chunks of the mixed call audio
+(its buffer_size), which are appended to a local WAV file as they arrive. The
+WAV header is written with placeholder sizes and fixed up when the recording
+is closed, so memory stays bounded by the chunk size instead of growing with
+the call.
+
+Recordings stored in S3 are handed to the durable upload queue drained by
+app/main.py (see app/core/recording_uploader.py), which also encodes them
+with a compressed codec before upload; the bot only ever writes WAV.
+"""
+import asyncio
+import os
+from typing import Any, List, Optional
+
+from loguru import logger
+
+from app.core.audio_codec import RECORDING_CODECS, encoded_path, wav_header
+from app.core.recording_uploader import spool_recording
+
+
+class LocalWavSink:
+    """Appends audio to a WAV file and fixes its header on close."""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._file = None
+        self._size = 0
+
+    def open(self, sample_rate: int, num_channels: int):
+        self._sample_rate = sample_rate
+        self._num_channels = num_channels
+        os.makedirs(os.path.dirname(self.filename) or ".", exist_ok=True)
+        self._file = open(self.filename, "wb")
+        self._file.write(wav_header(sample_rate, num_channels, 0))
+
+    def write(self, audio: bytes):
+        self._file.write(audio)
+        self._size += len(audio)
+
+    def close(self):
+        self._file.seek(0)
+        self._file.write(wav_header(self._sample_rate, self._num_channels, self._size))
+        self._file.close()
+        logger.info(f"Audio saved to {self.filename}")
+
+    def abort(self):
+        if self._file:
+            self._file.close()
+
+
+class StreamingRecording:
+    """
+    Writes a call recording to its sinks from a single background task.
+
+    Attach `on_audio_data` as the AudioBufferProcessor's "on_audio_data"
+    handler. Pipecat runs each handler call in its own task, so chunks are
+    queued synchronously (keeping their order) and written by one writer.
+    """
+
+    def __init__(self, sinks: List[Any]):
+        self._sinks = sinks
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._writer: Optional[asyncio.Task] = None
+
+    async def on_audio_data(self, buffer, audio: bytes, sample_rate: int, num_channels: int):
+        if not audio:
+            return
+        self._queue.put_nowait((audio, sample_rate, num_channels))
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._write_loop())
+
+    async def _write_loop(self):
+        opened = False
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                break
+            audio, sample_rate, num_channels = item
+            for sink in list(self._sinks):
+                try:
+                    if not opened:
+                        await asyncio.to_thread(sink.open, sample_rate, num_channels)
+                    await asyncio.to_thread(sink.write, audio)
+                except Exception as e:
+                    logger.error(f"Failed to write audio to {type(sink).__name__}: {e}")
+                    self._sinks.remove(sink)
+                    await asyncio.to_thread(self._abort, sink)
+            opened = True
+
+        for sink in self._sinks:
+            try:
+                await asyncio.to_thread(sink.close)
+            except Exception as e:
+                logger.error(f"Failed to finish audio in {type(sink).__name__}: {e}")
+                await asyncio.to_thread(self._abort, sink)
+
+    @staticmethod
+    def _abort(sink):
+        try:
+            sink.abort()
+        except Exception as e:
+            logger.error(f"Failed to abort {type(sink).__name__}: {e}")
+
+    async def close(self):
+        """Write what is queued and finish every sink (fix the WAV header)."""
+        if self._writer is None:
+            return
+        self._queue.put_nowait(None)
+        await self._writer
+        self._writer = None
+
+
+class FinishedRecording(StreamingRecording):
+    """
+    Spools the call to a local WAV file and, once the call ends, hands it to
+    the recording upload queue, to be encoded with `codec` by the uploader.
+    """
+
+    def __init__(self, wav_path: str, codec: str, keep_local: bool, spool_dir: str):
+        super().__init__([LocalWavSink(wav_path)])
+        self._wav_path = wav_path
+        self._codec = codec
+        self._keep_local = keep_local
+        self._spool_dir = spool_dir
+
+    async def close(self):
+        await super().close()
+        if not os.path.exists(self._wav_path):
+            return
+
+        key = encoded_path(self._wav_path, self._codec)
+        try:
+            # The uploader in app/main.py takes it from here; the bot does not wait on encoding or S3
+            await asyncio.to_thread(
+                spool_recording,
+                self._spool_dir,
+                self._wav_path,
+                key,
+                RECORDING_CODECS[self._codec][1],
+                self._keep_local,
+                self._codec,
+            )
+        except Exception as e:
+            logger.error(f"Failed to spool audio for upload, keeping {self._wav_path}: {e}")
+
+
+def create_recording(
+    filename: str,
+    local: bool,
+    spool_dir: Optional[str],
+    codec: str = "wav",
+) -> StreamingRecording:
+    """
+    Recording to `filename` locally and/or uploaded through the upload queue
+    spooled in `spool_dir`.
+
+    The upload is encoded with `codec` and its key takes the codec's
+    extension; the local copy stays WAV.
+    """
+    if not spool_dir:
+        return StreamingRecording([LocalWavSink(filename)] if local else [])
+    return FinishedRecording(filename, codec, keep_local=local, spool_dir=spool_dir)
@@ -0,0 +1,25 @@
+"""
+LocalSmartTurnAnalyzerV3 with a configurable end-of-turn threshold.
+
+pipecat's analyzer calls a turn complete when the model's probability is
+above a fixed 0.5; analytics/turn_tuner.py tunes the threshold per language,
+and bot.py runs with config.SMART_TURN_THRESHOLD.
+"""
+from typing import Any, Dict
+
+import numpy as np
+
+from pipecat.audio.turn.smart_turn.local_smart_turn_v3 import LocalSmartTurnAnalyzerV3
+
+
+class ThresholdSmartTurnAnalyzerV3(LocalSmartTurnAnalyzerV3):
+    """The turn is complete when the smart-turn probability is above `threshold`."""
+
+    def __init__(self, threshold: float = 0.5, **kwargs):
+        super().__init__(**kwargs)
+        self._threshold = threshold
+
+    def _predict_endpoint(self, audio_array: np.ndarray) -> Dict[str, Any]:
+        result = super()._predict_endpoint(audio_array)
+        result["prediction"] = 1 if result["probability"] > self._threshold else 0
+        return result
@@ -0,0 +1,63 @@
+"""
+Warm bot worker.
+
+Spawned ahead of time by the worker pool in app/main.py. The worker pays for
+the interpreter, the pipecat/daily/onnx import tree and model loading before
+any session exists, then blocks on stdin until /start-session hands it the
+session arguments as a single JSON line.
+"""
+import time
+
+_interpreter_started_at = time.monotonic()
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+
+project_root = Path(__file__).parent.parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from loguru import logger
+
+from app.agents.voice.driver.bot import load_bot_models, run_bot
+from app.agents.voice.driver.analytics.startup_timings import StartupTimings
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--spawned-at", type=float, required=False, help="Monotonic time at which the pool spawned this worker")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    startup_timings = StartupTimings()
+    if args.spawned_at:
+        startup_timings.mark("spawned", args.spawned_at)
+    startup_timings.mark("interpreter_started", _interpreter_started_at)
+    startup_timings.mark("imports_done")
+
+    models = load_bot_models()
+    startup_timings.mark("models_loaded")
+    logger.info("[WORKER] Warm bot worker ready, waiting for a session")
+
+    line = sys.stdin.readline()
+    if not line:
+        logger.info("[WORKER] Worker pool closed the channel before handing over a session, exiting")
+        return
+
+    session = json.loads(line)
+    startup_timings.mark("session_received")
+    dispatched_at = session.pop("dispatched_at", None)
+    if dispatched_at:
+        startup_timings.mark("dispatched", dispatched_at)
+
+    logger.info(f"[WORKER] Received session {session.get('session_id')}")
+    asyncio.run(run_bot(**session, models=models, startup_timings=startup_timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Bot zygote.
+
+Started once by app/main.py in zygote mode. The zygote imports the bot
+module tree and loads the VAD and smart-turn models, then forks one child per
+session. Children share the imported modules and model weights with the
+zygote copy-on-write, so a session starts without an interpreter start,
+imports or ONNX loading, and the pod holds one copy of the weights.
+
+Protocol, over a unix socket, one connection per session:
+    app/main.py -> zygote: the run_bot keyword arguments as one JSON line
+    zygote -> app/main.py: {"pid": ...} once the child is forked
+    zygote -> app/main.py: {"pid": ..., "exit_code": ...} once the child exits
+
+The zygote itself stays single-threaded and never runs an event loop, so
+there is no thread or loop state for a child to inherit half-way. Both ONNX
+sessions are built with one intra-op thread, which means onnxruntime has no
+thread pool that would be missing in the child.
+"""
+import time
+
+_interpreter_started_at = time.monotonic()
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import selectors
+import signal
+import socket
+import sys
+from pathlib import Path
+
+
+project_root = Path(__file__).parent.parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from loguru import logger
+
+from app.agents.voice.driver.bot import load_audio_in_filter, load_bot_models, run_bot
+from app.agents.voice.driver.analytics.startup_timings import StartupTimings
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--socket", type=str, required=True, help="Unix socket path to accept sessions on")
+    return parser.parse_args()
+
+
+def _send(conn: socket.socket, message: dict):
+    try:
+        conn.sendall((json.dumps(message) + "\n").encode("utf-8"))
+    except OSError as e:
+        logger.warning(f"[ZYGOTE] Could not reply to app/main.py: {e}")
+
+
+def _run_child(session: dict, models) -> int:
+    """Run one session in a forked child and return its exit code."""
+    startup_timings = StartupTimings()
+    startup_timings.mark("forked")
+    dispatched_at = session.pop("dispatched_at", None)
+    if dispatched_at:
+        startup_timings.mark("dispatched", dispatched_at)
+
+    # Koala/AIC are built here rather than in the zygote, see load_bot_models
+    models.audio_in_filter = load_audio_in_filter()
+    startup_timings.mark("models_loaded")
+
+    logger.info(f"[ZYGOTE] Child {os.getpid()} running session {session.get('session_id')}")
+    try:
+        asyncio.run(run_bot(**session, models=models, startup_timings=startup_timings))
+        return 0
+    except Exception as e:
+        logger.exception(f"[ZYGOTE] Session {session.get('session_id')} crashed: {e}")
+        return 1
+
+
+class Zygote:
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self.selector = selectors.DefaultSelector()
+        self.listener: socket.socket = None
+        self.children = {}
+        self._wakeup_r, self._wakeup_w = os.pipe()
+
+    def listen(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(self.socket_path)
+        self.listener.listen(16)
+        self.selector.register(self.listener, selectors.EVENT_READ)
+
+        # SIGCHLD only writes to the wakeup pipe, children are reaped in the loop
+        os.set_blocking(self._wakeup_w, False)
+        signal.set_wakeup_fd(self._wakeup_w)
+        signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+        self.selector.register(self._wakeup_r, selectors.EVENT_READ)
+
+    def _close_inherited(self):
+        """Drop everything a forked child must not keep from the zygote."""
+        signal.set_wakeup_fd(-1)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        self.selector.close()
+        self.listener.close()
+        for conn in self.children.values():
+            conn.close()
+        os.close(self._wakeup_r)
+        os.close(self._wakeup_w)
+
+    def _accept(self, models):
+        conn, _ = self.listener.accept()
+        try:
+            conn.settimeout(5)
+            with conn.makefile("rb") as reader:
+                line = reader.readline()
+            conn.settimeout(None)
+            session = json.loads(line)
+        except (OSError, ValueError) as e:
+            logger.error(f"[ZYGOTE] Could not read session arguments: {e}")
+            conn.close()
+            return
+
+        pid = os.fork()
+        if pid == 0:
+            conn.close()
+            self._close_inherited()
+            exit_code = 1
+            try:
+                exit_code = _run_child(session, models)
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(exit_code)
+
+        self.children[pid] = conn
+        _send(conn, {"pid": pid})
+        logger.info(f"[ZYGOTE] Forked child {pid} for session {session.get('session_id')}")
+
+    def _reap(self):
+        os.read(self._wakeup_r, 512)
+
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            exit_code = os.waitstatus_to_exitcode(status)
+            conn = self.children.pop(pid, None)
+            logger.info(f"[ZYGOTE] Child {pid} exited with code {exit_code}")
+            if conn:
+                _send(conn, {"pid": pid, "exit_code": exit_code})
+                conn.close()
+
+    def serve(self, models):
+        logger.info(f"[ZYGOTE] Ready on {self.socket_path}")
+        while True:
+            for key, _ in self.selector.select():
+                if key.fileobj is self.listener:
+                    self._accept(models)
+                else:
+                    self._reap()
+
+
+def main():
+    args = parse_args()
+    startup_timings = StartupTimings()
+    startup_timings.mark("interpreter_started", _interpreter_started_at)
+    startup_timings.mark("imports_done")
+
+    models = load_bot_models(with_audio_in_filter=False)
+    startup_timings.mark("models_loaded")
+    logger.info(f"[ZYGOTE] Preloaded in {startup_timings.elapsed('interpreter_started', 'models_loaded'):.2f}s")
+    # Keep the collector from touching, and so copying, every preloaded object in each child
+    gc.freeze()
+
+    zygote = Zygote(args.socket)
+    zygote.listen()
+    zygote.serve(models)
+
+
+if __name__ == "__main__":
+    main()
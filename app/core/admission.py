@@ -0,0 +1,174 @@
+"""
+Admission control for /start-session, driven by measured pod load.
+"""
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from loguru import logger
+
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def read_cpu_usage() -> Optional[float]:
+    """CPU seconds used by the container (cgroup v2), or by this process tree as a fallback."""
+    stat = _read(f"{CGROUP_ROOT}/cpu.stat")
+    if stat:
+        for line in stat.splitlines():
+            key, _, value = line.partition(" ")
+            if key == "usage_usec":
+                return int(value) / 1_000_000
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def read_cpu_limit() -> float:
+    """CPUs the container may use: the cgroup v2 quota, else the CPUs the process can run on."""
+    cpu_max = _read(f"{CGROUP_ROOT}/cpu.max")
+    if cpu_max:
+        quota, _, period = cpu_max.partition(" ")
+        if quota != "max" and period:
+            return int(quota) / int(period)
+    return float(len(os.sched_getaffinity(0)))
+
+
+def _read_memory_stat(name: str) -> Optional[int]:
+    stat = _read(f"{CGROUP_ROOT}/memory.stat")
+    if stat:
+        for line in stat.splitlines():
+            key, _, value = line.partition(" ")
+            if key == name:
+                return int(value)
+    return None
+
+
+def read_memory() -> Tuple[Optional[int], Optional[int]]:
+    """
+    (used, limit) bytes of the container from cgroup v2, None where unknown.
+
+    Used is the working set, as the kubelet computes it: memory.current
+    minus inactive_file. memory.current also counts page cache, which grows
+    with the recordings and TTS audio written to disk and is reclaimed
+    before the container runs out of memory.
+    """
+    current = _read(f"{CGROUP_ROOT}/memory.current")
+    limit = _read(f"{CGROUP_ROOT}/memory.max")
+    used = None
+    if current:
+        used = int(current)
+        inactive_file = _read_memory_stat("inactive_file")
+        if inactive_file is not None:
+            used = max(used - inactive_file, 0)
+    return used, int(limit) if limit and limit != "max" else None
+
+
+class AdmissionController:
+    """
+    Samples CPU, memory and event-loop lag in the background and decides
+    whether the pod can take another session.
+
+    CPU is the share of the container's CPU limit used since the last sample,
+    so it covers bot processes as well as app/main.py. Event-loop lag is how
+    late a sleep on the app/main.py loop wakes up, which is the first thing to
+    grow when in-process pipelines fall behind.
+    """
+
+    def __init__(
+        self,
+        max_cpu: float,
+        max_memory: float,
+        max_loop_lag: float,
+        interval: float = 1.0,
+    ):
+        self.max_cpu = max_cpu
+        self.max_memory = max_memory
+        self.max_loop_lag = max_loop_lag
+        self.interval = interval
+
+        self.cpu: Optional[float] = None
+        self.memory: Optional[float] = None
+        self.loop_lag = 0.0
+        self.rejected = 0
+
+        self._cpu_limit = read_cpu_limit()
+        self._last_cpu: Optional[Tuple[float, float]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _sample_cpu(self):
+        usage = read_cpu_usage()
+        now = time.monotonic()
+        if usage is None:
+            return
+        if self._last_cpu:
+            last_usage, last_at = self._last_cpu
+            if now > last_at:
+                self.cpu = (usage - last_usage) / (now - last_at) / self._cpu_limit
+        self._last_cpu = (usage, now)
+
+    def _sample_memory(self):
+        used, limit = read_memory()
+        if used is not None and limit:
+            self.memory = used / limit
+
+    async def _sample_loop(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            # Decaying peak, so one stall keeps the pod closed for a few samples
+            lag = max(time.monotonic() - expected, 0.0)
+            self.loop_lag = max(lag, self.loop_lag * 0.5)
+            try:
+                self._sample_cpu()
+                self._sample_memory()
+            except Exception as e:
+                logger.error(f"[ADMISSION] Failed to sample pod load: {e}")
+
+    def start(self):
+        if self._task is None:
+            self._sample_cpu()
+            self._sample_memory()
+            self._task = asyncio.create_task(self._sample_loop())
+            logger.info(f"[ADMISSION] Admission control started ({self._cpu_limit:g} CPUs)")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def over_budget(self) -> Optional[str]:
+        """Reason the pod cannot take a session right now, or None if it can."""
+        if self.cpu is not None and self.cpu > self.max_cpu:
+            return f"CPU at {self.cpu:.0%} of limit"
+        if self.memory is not None and self.memory > self.max_memory:
+            return f"memory at {self.memory:.0%} of limit"
+        if self.loop_lag > self.max_loop_lag:
+            return f"event loop lagging {self.loop_lag * 1000:.0f}ms"
+        return None
+
+    def admit(self) -> Optional[str]:
+        """Like over_budget, but counts the rejection."""
+        reason = self.over_budget()
+        if reason:
+            self.rejected += 1
+            logger.warning(f"[ADMISSION] Rejecting session: {reason}")
+        return reason
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "cpu": self.cpu,
+            "memory": self.memory,
+            "loop_lag": self.loop_lag,
+            "saturated": self.over_budget() is not None,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,58 @@
+"""
+Compressed encoding of finished call recordings.
+
+Bots spool their recordings as WAV; the RecordingUploader in app/main.py
+encodes them before upload, in a process pool it creates once at startup, so
+encoding never runs in a bot process next to a live pipeline.
+"""
+import os
+import struct
+
+
+# Codec -> (file extension, content type, libsndfile format, libsndfile subtype)
+RECORDING_CODECS = {
+    "wav": (".wav", "audio/wav", "WAV", "PCM_16"),
+    "flac": (".flac", "audio/flac", "FLAC", "PCM_16"),
+    "opus": (".ogg", "audio/ogg", "OGG", "OPUS"),
+}
+
+# Frames read and written per block while encoding
+ENCODE_BLOCK_FRAMES = 64 * 1024
+
+
+def wav_header(sample_rate: int, num_channels: int, data_size: int) -> bytes:
+    """44-byte header of a 16-bit PCM WAV file holding `data_size` bytes of audio."""
+    byte_rate = sample_rate * num_channels * 2
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, num_channels, sample_rate, byte_rate, num_channels * 2, 16,
+        b"data", data_size,
+    )
+
+
+def encoded_path(wav_path: str, codec: str) -> str:
+    return os.path.splitext(wav_path)[0] + RECORDING_CODECS[codec][0]
+
+
+def encode_wav_file(wav_path: str, out_path: str, codec: str) -> int:
+    """
+    Encode a 16-bit PCM WAV file block by block. Runs in a pool worker.
+
+    Returns:
+        Size of the encoded file in bytes
+    """
+    import soundfile
+
+    _, _, file_format, subtype = RECORDING_CODECS[codec]
+    with soundfile.SoundFile(wav_path) as source:
+        with soundfile.SoundFile(
+            out_path, "w",
+            samplerate=source.samplerate,
+            channels=source.channels,
+            format=file_format,
+            subtype=subtype,
+        ) as target:
+            for block in source.blocks(blocksize=ENCODE_BLOCK_FRAMES, dtype="int16"):
+                target.write(block)
+    return os.path.getsize(out_path)
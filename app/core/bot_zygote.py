@@ -0,0 +1,112 @@
+"""
+Client side of the bot zygote (app/agents/voice/driver/zygote.py).
+"""
+import asyncio
+import json
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+
+class ZygoteSession:
+    """A bot forked by the zygote, stands in for a Popen in app/main.py."""
+
+    def __init__(self, pid: int, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.pid = pid
+        self._reader = reader
+        self._writer = writer
+
+    async def wait(self) -> int:
+        """
+        Wait for the forked bot to exit.
+
+        Returns:
+            The exit code reported by the zygote, or -1 if the zygote went away first
+        """
+        try:
+            line = await self._reader.readline()
+            if not line:
+                logger.warning(f"[ZYGOTE] Lost the zygote while bot {self.pid} was running")
+                return -1
+            return json.loads(line)["exit_code"]
+        finally:
+            self._writer.close()
+
+
+class BotZygote:
+    """
+    Runs the zygote process and asks it to fork a bot per session.
+
+    The zygote has already imported the bot and loaded its models, so a forked
+    bot skips the interpreter start, imports and model loading and shares the
+    model weights with every other bot on the pod.
+    """
+
+    def __init__(self, zygote_file: str, socket_path: str, cwd: Path):
+        self.zygote_file = zygote_file
+        self.socket_path = socket_path
+        self.cwd = cwd
+        self.proc: Optional[subprocess.Popen] = None
+        self.forked = 0
+        self.failures = 0
+
+    def start(self):
+        """Start the zygote, or restart it if it has died."""
+        if self.proc and self.proc.poll() is None:
+            return
+        if self.proc:
+            logger.warning(f"[ZYGOTE] Zygote {self.proc.pid} exited with return code {self.proc.returncode}, restarting")
+        self.proc = subprocess.Popen(
+            ["python3", self.zygote_file, "--socket", self.socket_path],
+            cwd=self.cwd,
+        )
+        logger.info(f"[ZYGOTE] Started zygote with PID: {self.proc.pid}")
+
+    async def spawn(self, session_args: Dict[str, Any]) -> Optional[ZygoteSession]:
+        """
+        Fork a bot for a session.
+
+        Args:
+            session_args: Keyword arguments for run_bot
+
+        Returns:
+            The forked bot, or None if the zygote is not ready or could not
+            fork and the caller has to cold-start a bot
+        """
+        payload = dict(session_args, dispatched_at=time.monotonic())
+        try:
+            reader, writer = await asyncio.open_unix_connection(self.socket_path)
+        except OSError as e:
+            self.failures += 1
+            logger.warning(f"[ZYGOTE] Zygote not reachable ({e}), falling back to a cold start")
+            return None
+
+        try:
+            writer.write((json.dumps(payload) + "\n").encode("utf-8"))
+            await writer.drain()
+            line = await asyncio.wait_for(reader.readline(), timeout=5)
+            pid = json.loads(line)["pid"]
+        except Exception as e:
+            self.failures += 1
+            writer.close()
+            logger.warning(f"[ZYGOTE] Zygote could not fork a bot ({e}), falling back to a cold start")
+            return None
+
+        self.forked += 1
+        return ZygoteSession(pid, reader, writer)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pid": self.proc.pid if self.proc else None,
+            "running": bool(self.proc and self.proc.poll() is None),
+            "forked": self.forked,
+            "failures": self.failures,
+        }
+
+    def shutdown(self):
+        if self.proc and self.proc.poll() is None:
+            self.proc.terminate()
+            logger.info("[ZYGOTE] Zygote terminated")
@@ -14,6 +14,9 @@ UVICORN_LOG_LEVEL = os.environ.get("UVICORN_LOG_LEVEL", "info")
 
 DAILY_API_KEY = os.environ.get("DAILY_API_KEY")
 DAILY_API_URL = os.environ.get("DAILY_SAMPLE_ROOM_URL", "https://api.daily.co/v1/")
+# Sign meeting tokens locally with DAILY_API_KEY instead of calling POST /meeting-tokens
+ENABLE_LOCAL_TOKEN_MINTING = os.environ.get("ENABLE_LOCAL_TOKEN_MINTING", "false").lower() == "true"
+DAILY_DOMAIN_ID = os.environ.get("DAILY_DOMAIN_ID")
 
 
 TTS_PROVIDER=os.environ.get("TTS_PROVIDER", "sarvam")
@@ -46,11 +49,67 @@ ENABLE_RECORDING = os.environ.get("ENABLE_RECORDING", "false").lower() == "true"
 S3_BUCKET_NAME = os.environ.get("S3_BUCKET_NAME", "ny-voicebot-recordings")
 ENABLE_S3_STORAGE = os.environ.get("ENABLE_S3_STORAGE", "false").lower() == "true"
 ENABLE_LOCAL_STORAGE = os.environ.get("ENABLE_LOCAL_STORAGE", "false").lower() == "true"
+# Bytes of audio per track handed to the recording sinks at a time (~10s at 24kHz)
+RECORDING_CHUNK_BYTES = int(os.environ.get("RECORDING_CHUNK_BYTES", str(480 * 1024)))
+# 1 mixes caller and bot; 2 keeps the caller on the left channel and the bot on the right,
+# which the offline turn tuner (analytics/turn_tuner.py) needs
+RECORDING_CHANNELS = int(os.environ.get("RECORDING_CHANNELS", "1"))
+# Codec recordings are uploaded in: "wav" (as recorded), "flac" or "opus" (encoded by the
+# uploader in app/main.py before upload). Local recordings are always WAV
+RECORDING_CODEC = os.environ.get("RECORDING_CODEC", "wav").lower()
+# Worker processes the recording uploader in app/main.py encodes recordings in
+RECORDING_ENCODE_WORKERS = int(os.environ.get("RECORDING_ENCODE_WORKERS", "1"))
+# Finished recordings wait here until app/main.py has uploaded them to S3. Must
+# outlive the pod (the pod manager mounts a node hostPath here) for spooled
+# recordings to survive a crash
+RECORDING_SPOOL_DIR = os.environ.get("RECORDING_SPOOL_DIR", "recordings/spool")
+# Recordings uploaded to S3 at the same time, per pod
+RECORDING_UPLOAD_CONCURRENCY = int(os.environ.get("RECORDING_UPLOAD_CONCURRENCY", "2"))
+# Upload attempts per recording before it is moved to the spool's failed/ directory
+RECORDING_UPLOAD_MAX_ATTEMPTS = int(os.environ.get("RECORDING_UPLOAD_MAX_ATTEMPTS", "8"))
+# Seconds a draining pod spends uploading what is still spooled before it exits
+RECORDING_UPLOAD_DRAIN_TIMEOUT = int(os.environ.get("RECORDING_UPLOAD_DRAIN_TIMEOUT", "60"))
 
 
 MAX_SESSION_TIME = 5 * 60 
 
 
+# How /start-session launches a bot: "subprocess" cold-starts a new
+# interpreter per call, "worker_pool" hands the session to a pre-imported worker,
+# "inprocess" runs the pipeline as an asyncio task inside app/main.py,
+# "zygote" forks the bot from a parent that has preloaded the models.
+BOT_LAUNCH_MODE = os.environ.get("BOT_LAUNCH_MODE", "subprocess")
+WORKER_POOL_SIZE = int(os.environ.get("WORKER_POOL_SIZE", "1"))
+ZYGOTE_SOCKET_PATH = os.environ.get("ZYGOTE_SOCKET_PATH", "/tmp/ny-voice-zygote.sock")
+# Daily rooms + owner tokens kept ready for /start-session (0 disables the pool)
+ROOM_POOL_SIZE = int(os.environ.get("ROOM_POOL_SIZE", "0"))
+# Seconds a pooled room may wait for a caller before it is discarded
+ROOM_POOL_TTL = int(os.environ.get("ROOM_POOL_TTL", "1800"))
+# Concurrent sessions advertised to the router; only used in "inprocess" mode.
+MAX_SESSIONS_PER_POD = int(os.environ.get("MAX_SESSIONS_PER_POD", "1"))
+# Smart-turn probability above which the caller's turn is complete (pipecat uses 0.5);
+# analytics/turn_tuner.py recommends one per language from recorded calls
+SMART_TURN_THRESHOLD = float(os.environ.get("SMART_TURN_THRESHOLD", "0.5"))
+# Run every session's VAD and smart-turn through one batched inference service
+# per process; only pays off with several sessions per process ("inprocess" mode).
+ENABLE_BATCHED_INFERENCE = os.environ.get("ENABLE_BATCHED_INFERENCE", "false").lower() == "true"
+# Threads running batched ONNX calls, per process
+BATCHED_INFERENCE_THREADS = int(os.environ.get("BATCHED_INFERENCE_THREADS", "2"))
+# Milliseconds a VAD window / turn-end query may wait for others to batch with
+BATCHED_VAD_MAX_WAIT_MS = float(os.environ.get("BATCHED_VAD_MAX_WAIT_MS", "2"))
+BATCHED_TURN_MAX_WAIT_MS = float(os.environ.get("BATCHED_TURN_MAX_WAIT_MS", "10"))
+# /start-session answers 429 while the pod is over any of these budgets:
+# share of the CPU / memory limit, and event-loop lag in seconds.
+ENABLE_ADMISSION_CONTROL = os.environ.get("ENABLE_ADMISSION_CONTROL", "true").lower() == "true"
+ADMISSION_MAX_CPU = float(os.environ.get("ADMISSION_MAX_CPU", "0.85"))
+ADMISSION_MAX_MEMORY = float(os.environ.get("ADMISSION_MAX_MEMORY", "0.85"))
+ADMISSION_MAX_LOOP_LAG = float(os.environ.get("ADMISSION_MAX_LOOP_LAG", "0.15"))
+# Seconds between capacity reports to the router
+CAPACITY_REPORT_INTERVAL = int(os.environ.get("CAPACITY_REPORT_INTERVAL", "10"))
+# Seconds a draining pod waits for its sessions before ending them and exiting
+DRAIN_TIMEOUT = int(os.environ.get("DRAIN_TIMEOUT", str(MAX_SESSION_TIME + 30)))
+
+
 ROUTER_URL = os.environ.get("ROUTER_URL", "http://router:8082")
 POD_NAME = os.environ.get("POD_NAME")
 POD_IP = os.environ.get("POD_IP")
@@ -59,6 +118,42 @@ NOTIFY_ENDPOINT = os.environ.get("NOTIFY_ENDPOINT")
 SARVAM_PITCH = os.environ.get("SARVAM_PITCH", "0.1")
 SARVAM_PACE = os.environ.get("SARVAM_PACE", "0.9")
 
+# Raw PCM of fixed utterances (bot words, greetings), played instead of calling TTS.
+# The pod manager mounts a node hostPath at TTS_CACHE_DIR so the cache outlives
+# single-use pods; app/main.py fills in missing entries at startup (tts/warm_cache.py)
+ENABLE_TTS_CACHE = os.environ.get("ENABLE_TTS_CACHE", "true").lower() == "true"
+TTS_CACHE_DIR = os.environ.get("TTS_CACHE_DIR", "tts_cache")
+# Open the call with the agent's fixed greeting instead of an LLM completion
+ENABLE_STATIC_GREETING = os.environ.get("ENABLE_STATIC_GREETING", "false").lower() == "true"
+# Start the agent's MCP lookup when the session starts instead of when the LLM calls the tool.
+# Every call adds an MCP request, also for callers who hang up or never need the lookup
+ENABLE_TOOL_PREFETCH = os.environ.get("ENABLE_TOOL_PREFETCH", "false").lower() == "true"
+# Start the LLM request on a stable interim transcript (OpenAI LLM only)
+ENABLE_SPECULATIVE_LLM = os.environ.get("ENABLE_SPECULATIVE_LLM", "false").lower() == "true"
+# Seconds the user's text must stay unchanged before speculating
+SPECULATIVE_LLM_STABLE_SECS = float(os.environ.get("SPECULATIVE_LLM_STABLE_SECS", "0.3"))
+# Largest edit distance (fraction of the text) at which the speculative response is kept
+SPECULATIVE_LLM_MAX_EDIT_DISTANCE = float(os.environ.get("SPECULATIVE_LLM_MAX_EDIT_DISTANCE", "0.15"))
+# Play cached filler audio while a slow tool call runs; needs ENABLE_TTS_CACHE
+ENABLE_FILLER_AUDIO = os.environ.get("ENABLE_FILLER_AUDIO", "false").lower() == "true"
+# Seconds a tool call must run before the filler plays
+FILLER_AUDIO_AFTER_SECS = float(os.environ.get("FILLER_AUDIO_AFTER_SECS", "1.5"))
+# Adapt VAD confidence and stop_secs to each caller's background noise
+ENABLE_ADAPTIVE_VAD = os.environ.get("ENABLE_ADAPTIVE_VAD", "false").lower() == "true"
+# Seconds of caller audio measured before the first adjustment
+ADAPTIVE_VAD_WARMUP_SECS = float(os.environ.get("ADAPTIVE_VAD_WARMUP_SECS", "3"))
+# Bounds for quiet (first value) to noisy (second value) callers
+ADAPTIVE_VAD_CONFIDENCE_MIN = float(os.environ.get("ADAPTIVE_VAD_CONFIDENCE_MIN", "0.3"))
+ADAPTIVE_VAD_CONFIDENCE_MAX = float(os.environ.get("ADAPTIVE_VAD_CONFIDENCE_MAX", "0.6"))
+ADAPTIVE_VAD_STOP_SECS_MIN = float(os.environ.get("ADAPTIVE_VAD_STOP_SECS_MIN", "0.5"))
+ADAPTIVE_VAD_STOP_SECS_MAX = float(os.environ.get("ADAPTIVE_VAD_STOP_SECS_MAX", "0.9"))
+# Summarize old tool results and drop old turns from the LLM context
+ENABLE_CONTEXT_COMPACTION = os.environ.get("ENABLE_CONTEXT_COMPACTION", "true").lower() == "true"
+# Most recent turns kept in the LLM context verbatim
+LLM_CONTEXT_KEEP_TURNS = int(os.environ.get("LLM_CONTEXT_KEEP_TURNS", "4"))
+# Token budget of the LLM context's messages; older turns are dropped above it
+LLM_CONTEXT_MAX_TOKENS = int(os.environ.get("LLM_CONTEXT_MAX_TOKENS", "6000"))
+
 ENABLE_TRACING = os.environ.get("ENABLE_TRACING", "false").lower() == "true"
 
 LANGFUSE_SECRET_KEY = os.getenv("LANGFUSE_SECRET_KEY")
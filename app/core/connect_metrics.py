@@ -0,0 +1,179 @@
+"""
+Connect-path latency breakdown, from /start-session to the first bot audio.
+
+Phases recorded in app/main.py are stored directly. Bot processes run
+outside app/main.py, so they post their phases to /internal/connect-phase
+on the pod over one HTTP session per process, closed by
+close_connect_reporting() when the bot's session ends. Timestamps are
+time.monotonic(), which is system-wide on Linux and can be compared across
+processes.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import aiohttp
+from loguru import logger
+
+from app.core.config import PORT
+from app.core.metrics import Gauge, Histogram
+
+
+CONNECT_PHASES = (
+    "request_received",
+    "room_created",
+    "token_issued",
+    "process_spawned",
+    "bot_joined",
+    "client_connected",
+    "first_bot_audio",
+)
+
+CONNECT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0, 20.0)
+
+# Per-session series are kept for the most recent sessions only so the
+# session label cannot grow the scrape without bound.
+MAX_TRACKED_SESSIONS = 100
+
+PHASE_SECONDS = Histogram(
+    "voice_connect_phase_seconds",
+    "Seconds spent reaching a connect phase from the previous one",
+    ["phase", "agent"],
+    buckets=CONNECT_BUCKETS,
+)
+SINCE_REQUEST_SECONDS = Histogram(
+    "voice_connect_since_request_seconds",
+    "Seconds from /start-session to reaching a connect phase",
+    ["phase", "agent"],
+    buckets=CONNECT_BUCKETS,
+)
+BOT_STARTUP_SECONDS = Histogram(
+    "voice_bot_startup_seconds",
+    "Seconds from handing a session to a bot (token issued) until the bot joined the room",
+    ["launch_mode"],
+    buckets=CONNECT_BUCKETS,
+)
+SESSION_PHASE_SECONDS = Gauge(
+    "voice_connect_session_phase_seconds",
+    "Seconds from /start-session to reaching a connect phase, per recent session",
+    ["session_id", "agent", "phase"],
+)
+
+_sessions: "OrderedDict[str, Dict]" = OrderedDict()
+_local_recording = False
+_report_tasks = set()
+_http_session: Optional[aiohttp.ClientSession] = None
+
+
+def enable_local_recording():
+    """Record reported phases in this process instead of posting them to the pod."""
+    global _local_recording
+    _local_recording = True
+
+
+def record_phase(
+    session_id: str,
+    phase: str,
+    ts: Optional[float] = None,
+    agent: Optional[str] = None,
+    launch_mode: Optional[str] = None,
+):
+    """
+    Record that a session reached a connect phase.
+
+    Only the first timestamp of a phase counts. Phases that arrive for a
+    session that was never started here (e.g. it already aged out) are dropped.
+
+    Args:
+        session_id: The session the phase belongs to
+        phase: One of CONNECT_PHASES
+        ts: time.monotonic() timestamp of the phase, defaults to now
+        agent: Agent name, only needed with the first phase of a session
+        launch_mode: BOT_LAUNCH_MODE the bot is started with, only needed
+            with the first phase of a session
+    """
+    if phase not in CONNECT_PHASES:
+        logger.warning(f"[CONNECT] Unknown connect phase {phase} for session {session_id}")
+        return
+    ts = ts if ts is not None else time.monotonic()
+
+    session = _sessions.get(session_id)
+    if session is None:
+        if phase != CONNECT_PHASES[0]:
+            return
+        session = {"agent": agent or "unknown", "launch_mode": launch_mode or "unknown", "marks": {}}
+        _sessions[session_id] = session
+        while len(_sessions) > MAX_TRACKED_SESSIONS:
+            expired_id, _ = _sessions.popitem(last=False)
+            SESSION_PHASE_SECONDS.remove(session_id=expired_id)
+
+    marks = session["marks"]
+    if phase in marks:
+        return
+    marks[phase] = ts
+
+    agent = session["agent"]
+    index = CONNECT_PHASES.index(phase)
+    previous = next((marks[p] for p in reversed(CONNECT_PHASES[:index]) if p in marks), None)
+    if previous is not None:
+        PHASE_SECONDS.observe(max(ts - previous, 0), phase=phase, agent=agent)
+
+    if phase == "bot_joined" and "token_issued" in marks:
+        BOT_STARTUP_SECONDS.observe(max(ts - marks["token_issued"], 0), launch_mode=session["launch_mode"])
+
+    started = marks.get(CONNECT_PHASES[0])
+    if started is not None:
+        since_request = max(ts - started, 0)
+        SINCE_REQUEST_SECONDS.observe(since_request, phase=phase, agent=agent)
+        SESSION_PHASE_SECONDS.set(since_request, session_id=session_id, agent=agent, phase=phase)
+        logger.debug(f"[CONNECT] Session {session_id} reached {phase} after {since_request * 1000:.0f}ms")
+
+
+def _get_http_session() -> aiohttp.ClientSession:
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=2))
+    return _http_session
+
+
+async def _post_phase(session_id: str, phase: str, ts: float):
+    try:
+        async with _get_http_session().post(
+            f"http://127.0.0.1:{PORT}/internal/connect-phase",
+            json={"session_id": session_id, "phase": phase, "ts": ts},
+        ) as response:
+            if response.status != 200:
+                logger.debug(f"[CONNECT] Reporting {phase} failed with status {response.status}")
+    except Exception as e:
+        logger.debug(f"[CONNECT] Could not report {phase} for session {session_id}: {e}")
+
+
+def report_connect_phase(session_id: str, phase: str):
+    """
+    Report a connect phase from bot code, wherever the bot runs.
+
+    Records directly when the bot runs inside app/main.py, otherwise posts the
+    phase to the pod in the background so the caller never waits on it.
+    """
+    ts = time.monotonic()
+    if _local_recording:
+        record_phase(session_id, phase, ts)
+        return
+
+    try:
+        task = asyncio.get_running_loop().create_task(_post_phase(session_id, phase, ts))
+    except RuntimeError:
+        return
+    _report_tasks.add(task)
+    task.add_done_callback(_report_tasks.discard)
+
+
+async def close_connect_reporting():
+    """Wait briefly for reports still being posted, then close the process's HTTP session."""
+    global _http_session
+    if _report_tasks:
+        await asyncio.wait(list(_report_tasks), timeout=2)
+    if _http_session is not None:
+        await _http_session.close()
+        _http_session = None
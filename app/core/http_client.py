@@ -0,0 +1,92 @@
+"""
+Shared aiohttp client for app/main.py, created on startup and closed on shutdown.
+"""
+import asyncio
+import random
+from typing import Any, Optional
+
+import aiohttp
+from loguru import logger
+
+
+# Statuses worth retrying: the router or a proxy in front of it is briefly unavailable
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class PooledHttpClient:
+    """
+    One aiohttp.ClientSession for the lifetime of the app.
+
+    Connections to the router and the Daily API are kept alive between calls,
+    so a burst of notifications reuses them instead of paying a TCP (and TLS)
+    handshake each time.
+
+    The session has no overall timeout of its own, since DailyRESTHelper
+    shares it; `timeout` applies to each post_with_retry attempt.
+    """
+
+    def __init__(self, limit: int = 32, keepalive_timeout: float = 60, timeout: float = 5):
+        self.limit = limit
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def start(self):
+        """Create the session; must run inside the app's event loop."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.limit, keepalive_timeout=self.keepalive_timeout),
+            )
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            raise RuntimeError("HTTP client is not started")
+        return self._session
+
+    async def post_with_retry(
+        self,
+        url: str,
+        json: Any,
+        attempts: int = 4,
+        base_delay: float = 0.25,
+        max_delay: float = 4.0,
+    ) -> Optional[int]:
+        """
+        POST JSON, retrying connection errors, timeouts and retryable statuses.
+
+        Waits between attempts use exponential backoff with full jitter, so
+        pods that fail together do not retry in lockstep.
+
+        Args:
+            url: URL to post to
+            json: JSON body
+            attempts: Total number of attempts
+            base_delay: Backoff before the second attempt, doubled after each one
+            max_delay: Upper bound for a single backoff
+
+        Returns:
+            Status of the last response, or None if no response was received
+        """
+        status = None
+        for attempt in range(attempts):
+            try:
+                async with self.session.post(url, json=json, timeout=aiohttp.ClientTimeout(total=self.timeout)) as response:
+                    status = response.status
+                    if status not in RETRY_STATUSES:
+                        return status
+                    logger.warning(f"[HTTP] POST {url} returned {status} (attempt {attempt + 1}/{attempts})")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"[HTTP] POST {url} failed: {e!r} (attempt {attempt + 1}/{attempts})")
+
+            if attempt < attempts - 1:
+                await asyncio.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** attempt)))
+        return status
+
+
+http_client = PooledHttpClient()
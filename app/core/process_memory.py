@@ -0,0 +1,62 @@
+"""
+Memory accounting for the pod's process tree, read from /proc.
+"""
+import os
+from typing import Dict, List
+
+
+def _children(pid: int) -> List[int]:
+    children = []
+    try:
+        for tid in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{tid}/children") as f:
+                children.extend(int(child) for child in f.read().split())
+    except OSError:
+        pass
+    return children
+
+
+def process_tree(root: int) -> List[int]:
+    """PIDs of `root` and all of its descendants."""
+    pids, pending = [], [root]
+    while pending:
+        pid = pending.pop()
+        pids.append(pid)
+        pending.extend(_children(pid))
+    return pids
+
+
+def _smaps_rollup(pid: int) -> Dict[str, int]:
+    """Rss and Pss of a process in bytes, empty if it is gone or unreadable."""
+    usage = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                if key in ("Rss", "Pss"):
+                    usage[key.lower()] = int(rest.split()[0]) * 1024
+    except (OSError, ValueError):
+        pass
+    return usage
+
+
+def tree_memory(root: int) -> Dict[str, int]:
+    """
+    Memory of a process tree.
+
+    RSS counts pages shared between processes (e.g. copy-on-write model weights
+    after a fork) once per process, PSS splits them between the sharers, so
+    PSS is the figure that sums to what the pod really uses.
+
+    Returns:
+        {"rss": bytes, "pss": bytes, "processes": count}
+    """
+    total = {"rss": 0, "pss": 0, "processes": 0}
+    for pid in process_tree(root):
+        usage = _smaps_rollup(pid)
+        if not usage:
+            continue
+        total["rss"] += usage.get("rss", 0)
+        total["pss"] += usage.get("pss", 0)
+        total["processes"] += 1
+    return total
@@ -0,0 +1,46 @@
+"""
+Event-driven exit detection for bot processes.
+"""
+import asyncio
+import os
+import subprocess
+
+from loguru import logger
+
+
+async def wait_for_exit(proc: subprocess.Popen) -> int:
+    """
+    Wait for a child process to exit without polling and reap it.
+
+    Uses a pidfd, which becomes readable the moment the process exits, so the
+    event loop is woken directly by the kernel. Falls back to a blocking wait in
+    a worker thread where pidfds are unavailable (non-Linux or kernels < 5.3).
+
+    Args:
+        proc: The child process to wait for
+
+    Returns:
+        The process return code
+    """
+    try:
+        pidfd = os.pidfd_open(proc.pid)
+    except (AttributeError, OSError) as e:
+        # Also raised when the process has already been reaped
+        logger.debug(f"pidfd unavailable for {proc.pid} ({e}), waiting in a thread")
+        return await asyncio.to_thread(proc.wait)
+
+    loop = asyncio.get_running_loop()
+    exited = loop.create_future()
+
+    def on_exit():
+        if not exited.done():
+            exited.set_result(None)
+
+    loop.add_reader(pidfd, on_exit)
+    try:
+        await exited
+    finally:
+        loop.remove_reader(pidfd)
+        os.close(pidfd)
+
+    return proc.wait()
@@ -0,0 +1,452 @@
+"""
+Durable upload queue for finished call recordings.
+
+Bot processes never talk to S3. When a call ends its recording is moved into
+a spool directory together with a small JSON manifest entry, and the
+RecordingUploader running in app/main.py drains the spool in the background
+with one shared S3 client, a concurrency limit and retries with backoff.
+Recordings spooled as WAV with a compressed codec are encoded by the uploader
+first, in a process pool it creates once at start().
+
+The manifest entry is written last (atomically), so an entry always points at
+a complete file, and entries left behind by a crash are picked up again by
+the next uploader that drains the spool. Pods are not restarted, so in the
+cluster the spool is a per-node hostPath volume that every pod on the node
+mounts at RECORDING_SPOOL_DIR: a later pod on the node uploads what an
+earlier one left. Uploaders sharing a spool claim an entry with a flock on
+its recording file, which the kernel releases if the holder dies.
+"""
+import asyncio
+import fcntl
+import multiprocessing
+import json
+import os
+import random
+import shutil
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, Any, Dict, List, Optional, Set, Tuple
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from loguru import logger
+
+from app.core.audio_codec import RECORDING_CODECS, encode_wav_file, encoded_path
+
+
+MANIFEST_SUFFIX = ".json"
+# Entries that ran out of attempts are moved here and kept for inspection
+FAILED_DIR = "failed"
+
+
+def _write_entry(spool_dir: str, entry: Dict[str, Any]):
+    path = os.path.join(spool_dir, entry["id"] + MANIFEST_SUFFIX)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(entry, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def spool_recording(
+    spool_dir: str,
+    path: str,
+    key: str,
+    content_type: str,
+    keep: bool = False,
+    codec: str = "wav",
+) -> str:
+    """
+    Hand a finished recording over to the upload queue.
+
+    Args:
+        spool_dir: Spool directory the uploader drains
+        path: The finished recording
+        key: S3 key to upload it as
+        content_type: Content type of the upload
+        keep: Leave `path` in place (hard-linked or copied into the spool)
+            instead of moving it
+        codec: Codec the uploader encodes the (WAV) recording with before
+            uploading it
+
+    Returns:
+        Id of the manifest entry
+    """
+    os.makedirs(spool_dir, exist_ok=True)
+    entry_id = uuid.uuid4().hex
+    spooled_path = os.path.join(spool_dir, entry_id + os.path.splitext(path)[1])
+    if keep:
+        try:
+            os.link(path, spooled_path)
+        except OSError:
+            shutil.copyfile(path, spooled_path)
+    else:
+        shutil.move(path, spooled_path)
+
+    _write_entry(spool_dir, {
+        "id": entry_id,
+        "file": os.path.basename(spooled_path),
+        "key": key,
+        "content_type": content_type,
+        # Codec to encode the WAV with before uploading, if any
+        "encode_to": codec if codec != "wav" else None,
+        "attempts": 0,
+        "next_attempt_at": 0,
+        "spooled_at": time.time(),
+    })
+    logger.info(f"[UPLOADER] Spooled {path} for upload as {key}")
+    return entry_id
+
+
+class RecordingUploader:
+    """
+    Uploads spooled recordings to `bucket`, at most `concurrency` at a time.
+
+    The spool is rescanned every `scan_interval` seconds, or right away after
+    wake(). A failed upload is retried with exponential backoff (capped at
+    `max_delay`) until `max_attempts` is reached; the backoff is stored in the
+    manifest entry so it holds across restarts. Recordings are encoded by
+    `encode_workers` worker processes.
+    """
+
+    def __init__(
+        self,
+        spool_dir: str,
+        bucket: str,
+        region: str,
+        concurrency: int = 2,
+        max_attempts: int = 8,
+        scan_interval: float = 5,
+        base_delay: float = 5,
+        max_delay: float = 600,
+        encode_workers: int = 1,
+    ):
+        self.spool_dir = spool_dir
+        self.bucket = bucket
+        self.region = region
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.scan_interval = scan_interval
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.encode_workers = encode_workers
+
+        self._s3 = None
+        self._encode_pool: Optional[ProcessPoolExecutor] = None
+        self._transfer_config = TransferConfig(max_concurrency=4, use_threads=True)
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._wake = asyncio.Event()
+        self._in_flight: Set[str] = set()
+        # Entries another uploader on the node held at the last attempt
+        self._claimed_elsewhere: Set[str] = set()
+        self._upload_tasks: Set[asyncio.Task] = set()
+        self._loop_task: Optional[asyncio.Task] = None
+
+        self.uploaded = 0
+        self.uploaded_bytes = 0
+        self.encoded = 0
+        self.retries = 0
+        self.failed = 0
+
+    def _entries(self) -> List[Dict[str, Any]]:
+        entries = []
+        for name in os.listdir(self.spool_dir):
+            if not name.endswith(MANIFEST_SUFFIX):
+                continue
+            try:
+                with open(os.path.join(self.spool_dir, name)) as f:
+                    entries.append(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.error(f"[UPLOADER] Unreadable manifest entry {name}: {e}")
+        return sorted(entries, key=lambda entry: entry["spooled_at"])
+
+    def _read_entry(self, entry_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(self.spool_dir, entry_id + MANIFEST_SUFFIX)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _lock(self, name: str) -> Optional[IO]:
+        try:
+            f = open(os.path.join(self.spool_dir, name), "rb")
+        except FileNotFoundError:
+            return None
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            f.close()
+            return None
+        return f
+
+    def _claim(self, entry: Dict[str, Any]) -> Optional[IO]:
+        """
+        Lock the entry's recording so no other uploader on the node works on
+        it at the same time. Returns the locked file, or None if another
+        uploader holds it or has already finished it.
+        """
+        f = self._lock(entry["file"])
+        if f is None:
+            return None
+        if not os.path.exists(os.path.join(self.spool_dir, entry["id"] + MANIFEST_SUFFIX)):
+            f.close()
+            return None
+        return f
+
+    def _due_entries(self) -> List[Dict[str, Any]]:
+        now = time.time()
+        return [
+            entry for entry in self._entries()
+            if entry["id"] not in self._in_flight and entry["next_attempt_at"] <= now
+        ]
+
+    # The manifest goes first in both, so a manifest whose file is missing
+    # always means the recording is lost, never that it is being removed
+
+    def _remove_entry(self, entry: Dict[str, Any]):
+        for name in (entry["id"] + MANIFEST_SUFFIX, entry["file"]):
+            try:
+                os.remove(os.path.join(self.spool_dir, name))
+            except FileNotFoundError:
+                pass
+
+    def _give_up(self, entry: Dict[str, Any]):
+        failed_dir = os.path.join(self.spool_dir, FAILED_DIR)
+        os.makedirs(failed_dir, exist_ok=True)
+        for name in (entry["id"] + MANIFEST_SUFFIX, entry["file"]):
+            try:
+                os.replace(os.path.join(self.spool_dir, name), os.path.join(failed_dir, name))
+            except FileNotFoundError:
+                pass
+
+    async def _upload(self, entry: Dict[str, Any]):
+        path = os.path.join(self.spool_dir, entry["file"])
+        try:
+            async with self._semaphore:
+                claim = self._claim(entry)
+                if claim is None:
+                    self._not_claimed(entry)
+                    return
+                try:
+                    # Another uploader may have retried or encoded it since it was listed
+                    current = self._read_entry(entry["id"])
+                    if current is None or current["file"] != entry["file"]:
+                        return
+                    entry = current
+                    if entry["next_attempt_at"] > time.time():
+                        return
+                    if entry.get("encode_to"):
+                        encoded = await self._encode_claimed(entry, path)
+                        if encoded:
+                            claim.close()
+                            claim, path = encoded
+                    await self._upload_claimed(entry, path)
+                finally:
+                    claim.close()
+        finally:
+            self._in_flight.discard(entry["id"])
+
+    def _not_claimed(self, entry: Dict[str, Any]):
+        """Sort out why an entry could not be claimed, without touching a live entry."""
+        current = self._read_entry(entry["id"])
+        if current is None or current["file"] != entry["file"]:
+            # Finished, or encoded by another uploader; the next scan sees what is left
+            return
+        if os.path.exists(os.path.join(self.spool_dir, current["file"])):
+            self._claimed_elsewhere.add(entry["id"])
+            return
+        # Manifests are removed before their files, so the recording is lost
+        self.failed += 1
+        self._give_up(current)
+        logger.error(f"[UPLOADER] Spooled file {current['file']} is missing, moved {current['key']} to {FAILED_DIR}/")
+
+    async def _encode_claimed(self, entry: Dict[str, Any], path: str) -> Optional[Tuple[IO, str]]:
+        """
+        Encode the entry's WAV recording with its codec and point the entry
+        at the encoded file. Returns the encoded file, locked, and its path;
+        if encoding fails the WAV is uploaded instead.
+        """
+        codec = entry["encode_to"]
+        out_path = encoded_path(path, codec)
+        started_at = time.monotonic()
+        try:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._encode_pool, encode_wav_file, path, out_path, codec)
+        except Exception as e:
+            logger.error(f"[UPLOADER] Failed to encode {entry['key']} to {codec}, uploading the WAV: {e}")
+            entry["key"] = encoded_path(entry["key"], "wav")
+            entry["content_type"] = RECORDING_CODECS["wav"][1]
+            entry["encode_to"] = None
+            _write_entry(self.spool_dir, entry)
+            try:
+                os.remove(out_path)
+            except FileNotFoundError:
+                pass
+            return None
+
+        # Locked before the entry points at it, so no other uploader picks it up
+        encoded = self._lock(os.path.basename(out_path))
+        wav_size, encoded_size = os.path.getsize(path), os.path.getsize(out_path)
+        entry["file"] = os.path.basename(out_path)
+        entry["encode_to"] = None
+        _write_entry(self.spool_dir, entry)
+        os.remove(path)
+        self.encoded += 1
+        logger.info(
+            f"[UPLOADER] Encoded {entry['key']} to {codec}: {wav_size} -> {encoded_size} bytes "
+            f"({wav_size / max(encoded_size, 1):.1f}x in {time.monotonic() - started_at:.1f}s)"
+        )
+        return encoded, out_path
+
+    async def _upload_claimed(self, entry: Dict[str, Any], path: str):
+        size = os.path.getsize(path)
+        started_at = time.monotonic()
+        try:
+            await asyncio.to_thread(
+                self._s3.upload_file,
+                path,
+                self.bucket,
+                entry["key"],
+                ExtraArgs={"ContentType": entry["content_type"]},
+                Config=self._transfer_config,
+            )
+        except Exception as e:
+            self._retry_later(entry, e)
+            return
+
+        self._remove_entry(entry)
+        self.uploaded += 1
+        self.uploaded_bytes += size
+        logger.info(
+            f"[UPLOADER] Uploaded s3://{self.bucket}/{entry['key']} "
+            f"({size} bytes in {time.monotonic() - started_at:.1f}s)"
+        )
+
+    def _retry_later(self, entry: Dict[str, Any], error: Exception):
+        entry["attempts"] += 1
+        if entry["attempts"] >= self.max_attempts:
+            self.failed += 1
+            self._give_up(entry)
+            logger.error(
+                f"[UPLOADER] Giving up on {entry['key']} after {entry['attempts']} attempts, "
+                f"kept in {FAILED_DIR}/: {error}"
+            )
+            return
+
+        self.retries += 1
+        delay = min(self.max_delay, self.base_delay * 2 ** (entry["attempts"] - 1))
+        delay *= random.uniform(0.5, 1)
+        entry["next_attempt_at"] = time.time() + delay
+        _write_entry(self.spool_dir, entry)
+        logger.warning(
+            f"[UPLOADER] Upload of {entry['key']} failed (attempt {entry['attempts']}), "
+            f"retrying in {delay:.0f}s: {error}"
+        )
+
+    def _schedule_due(self):
+        self._claimed_elsewhere = set()
+        for entry in self._due_entries():
+            self._in_flight.add(entry["id"])
+            task = asyncio.create_task(self._upload(entry))
+            self._upload_tasks.add(task)
+            task.add_done_callback(self._upload_tasks.discard)
+
+    async def _run(self):
+        while True:
+            try:
+                self._schedule_due()
+            except Exception as e:
+                logger.error(f"[UPLOADER] Failed to scan the spool: {e}")
+
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.scan_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        """
+        Create the S3 client and the encoding pool and start draining the
+        spool, including entries left by an earlier run.
+        """
+        if self._loop_task is None:
+            os.makedirs(self.spool_dir, exist_ok=True)
+            # Spawned, not forked: this process runs the event loop's threads
+            self._encode_pool = ProcessPoolExecutor(
+                max_workers=self.encode_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            self._s3 = boto3.client(
+                "s3",
+                region_name=self.region,
+                config=Config(
+                    max_pool_connections=self.concurrency * self._transfer_config.max_request_concurrency,
+                    retries={"max_attempts": 3, "mode": "standard"},
+                ),
+            )
+            self._loop_task = asyncio.create_task(self._run())
+            logger.info(f"[UPLOADER] Started recording uploader on {self.spool_dir} ({self.pending()} pending)")
+
+    def wake(self):
+        """Rescan the spool now, e.g. when a session has just ended."""
+        self._wake.set()
+
+    def pending(self) -> int:
+        return sum(1 for name in os.listdir(self.spool_dir) if name.endswith(MANIFEST_SUFFIX))
+
+    async def drain(self, timeout: float):
+        """
+        Wait up to `timeout` seconds for the spool to empty.
+
+        Entries waiting out a backoff are retried right away. Whatever is
+        still spooled afterwards stays on disk for the next uploader on the
+        node.
+        """
+        if self._loop_task is None:
+            return
+        for entry in self._entries():
+            if entry["id"] not in self._in_flight and entry["next_attempt_at"] > 0:
+                claim = self._claim(entry)
+                if claim:
+                    with claim:
+                        entry["next_attempt_at"] = 0
+                        _write_entry(self.spool_dir, entry)
+        self.wake()
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            # Entries other uploaders on the node are working on are theirs to finish
+            due = [entry for entry in self._due_entries() if entry["id"] not in self._claimed_elsewhere]
+            if not self._in_flight and not due:
+                break
+            await asyncio.sleep(0.5)
+
+        pending = self.pending()
+        if pending:
+            logger.warning(f"[UPLOADER] {pending} recordings still spooled after {timeout}s, left for the next uploader on the node")
+        else:
+            logger.info("[UPLOADER] Recording spool drained")
+
+    async def stop(self):
+        tasks = [task for task in (self._loop_task, *self._upload_tasks) if task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop_task = None
+        if self._encode_pool:
+            self._encode_pool.shutdown(wait=False, cancel_futures=True)
+            self._encode_pool = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": self.pending(),
+            "in_flight": len(self._in_flight),
+            "uploaded": self.uploaded,
+            "uploaded_bytes": self.uploaded_bytes,
+            "encoded": self.encoded,
+            "retries": self.retries,
+            "failed": self.failed,
+        }
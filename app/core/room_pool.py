@@ -0,0 +1,217 @@
+"""
+Pool of pre-provisioned Daily rooms and owner tokens.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Protocol
+
+from loguru import logger
+
+from pipecat.transports.daily.utils import (
+    DailyMeetingTokenParams,
+    DailyMeetingTokenProperties,
+    DailyRoomObject,
+    DailyRoomParams,
+    DailyRoomProperties,
+)
+
+
+class DailyRoomProvider(Protocol):
+    """
+    The part of pipecat's DailyRESTHelper the pool relies on. Anything with
+    these two coroutines (e.g. a local fake) can stand in for the REST client.
+    """
+
+    async def create_room(self, params: DailyRoomParams) -> DailyRoomObject: ...
+
+    async def get_token(
+        self,
+        room_url: str,
+        expiry_time: float = 60 * 60,
+        eject_at_token_exp: bool = False,
+        owner: bool = True,
+        params: Optional[DailyMeetingTokenParams] = None,
+    ) -> str: ...
+
+
+class PooledRoom:
+    """A Daily room URL with an owner token, both valid until `expires_at` (unix time)."""
+
+    def __init__(self, room_url: str, token: str, expires_at: float):
+        self.room_url = room_url
+        self.token = token
+        self.expires_at = expires_at
+
+    def remaining(self) -> float:
+        return self.expires_at - time.time()
+
+
+async def create_room_and_token(
+    rest: DailyRoomProvider,
+    lifetime: float,
+    session_time: float,
+    marks: Optional[Dict[str, float]] = None,
+) -> PooledRoom:
+    """
+    Create a Daily room and an owner token for the bot.
+
+    Args:
+        rest: Daily REST client
+        lifetime: Seconds the room and token stay valid from now
+        session_time: Seconds a participant may stay once joined
+        marks: If given, filled with time.monotonic() marks for
+            "room_created" and "token_issued"
+
+    Returns:
+        PooledRoom holding the room URL and token
+    """
+    expires_at = time.time() + lifetime
+
+    daily_room_properties = DailyRoomProperties(
+        exp=expires_at,
+        eject_at_room_exp=True,
+    )
+
+    room = await rest.create_room(
+        params=DailyRoomParams(properties=daily_room_properties)
+    )
+    if marks is not None:
+        marks["room_created"] = time.monotonic()
+
+    token_params = DailyMeetingTokenParams(
+        properties=DailyMeetingTokenProperties(
+            eject_after_elapsed=session_time,
+        )
+    )
+
+    token = await rest.get_token(
+        room.url,
+        expiry_time=lifetime,
+        eject_at_token_exp=True,
+        owner=True,
+        params=token_params,
+    )
+    if marks is not None:
+        marks["token_issued"] = time.monotonic()
+
+    return PooledRoom(room_url=room.url, token=token, expires_at=expires_at)
+
+
+class DailyRoomPool:
+    """
+    Keeps `size` rooms with owner tokens ready so /start-session only pops one.
+
+    Pooled rooms live for `room_ttl + session_time` seconds. A room is thrown
+    away once less than `session_time + margin` seconds remain, so every room
+    handed out can still carry a full session; eject_after_elapsed caps the
+    session itself at `session_time` regardless of how long the room waited.
+    """
+
+    def __init__(
+        self,
+        rest: DailyRoomProvider,
+        size: int,
+        room_ttl: float,
+        session_time: float,
+        margin: float = 30,
+        check_interval: float = 30,
+    ):
+        self.rest = rest
+        self.size = size
+        self.room_ttl = room_ttl
+        self.session_time = session_time
+        self.margin = margin
+        self.check_interval = check_interval
+
+        self._rooms: Deque[PooledRoom] = deque()
+        self._refill_needed = asyncio.Event()
+        self._refill_task: Optional[asyncio.Task] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+        self.refill_errors = 0
+
+    def _usable(self, room: PooledRoom) -> bool:
+        return room.remaining() >= self.session_time + self.margin
+
+    def _discard_expiring(self):
+        for room in list(self._rooms):
+            if not self._usable(room):
+                self._rooms.remove(room)
+                self.discarded += 1
+                logger.info(f"[ROOM POOL] Discarded room {room.room_url} with {room.remaining():.0f}s left")
+
+    async def acquire(self, marks: Optional[Dict[str, float]] = None) -> PooledRoom:
+        """
+        Get a room and owner token, from the pool if one is ready.
+
+        Falls back to creating a single-session room on a miss.
+
+        Args:
+            marks: If given, filled with "room_created" and "token_issued"
+                marks; on a hit both are the moment the room was popped
+        """
+        self._discard_expiring()
+        self._refill_needed.set()
+
+        if self._rooms:
+            self.hits += 1
+            room = self._rooms.popleft()
+            if marks is not None:
+                marks["room_created"] = marks["token_issued"] = time.monotonic()
+            return room
+
+        self.misses += 1
+        logger.warning("[ROOM POOL] Pool empty, creating a room on the connect path")
+        return await create_room_and_token(
+            self.rest, lifetime=self.session_time, session_time=self.session_time, marks=marks
+        )
+
+    async def _refill(self):
+        self._discard_expiring()
+        while len(self._rooms) < self.size:
+            room = await create_room_and_token(
+                self.rest,
+                lifetime=self.room_ttl + self.session_time,
+                session_time=self.session_time,
+            )
+            self._rooms.append(room)
+            logger.debug(f"[ROOM POOL] Added room {room.room_url} ({len(self._rooms)}/{self.size} ready)")
+
+    async def _refill_loop(self):
+        while True:
+            try:
+                await self._refill()
+            except Exception as e:
+                self.refill_errors += 1
+                logger.error(f"[ROOM POOL] Failed to refill room pool: {e}")
+
+            self._refill_needed.clear()
+            try:
+                await asyncio.wait_for(self._refill_needed.wait(), timeout=self.check_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        """Start the background refill task."""
+        if self._refill_task is None:
+            self._refill_task = asyncio.create_task(self._refill_loop())
+            logger.info(f"[ROOM POOL] Started room pool with size {self.size}")
+
+    async def stop(self):
+        if self._refill_task:
+            self._refill_task.cancel()
+            await asyncio.gather(self._refill_task, return_exceptions=True)
+            self._refill_task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "ready": len(self._rooms),
+            "hits": self.hits,
+            "misses": self.misses,
+            "discarded": self.discarded,
+            "refill_errors": self.refill_errors,
+        }
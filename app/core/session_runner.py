@@ -0,0 +1,144 @@
+"""
+In-process runner that carries several run_bot pipelines in one process.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from loguru import logger
+
+from app.core.session_manager import get_session_manager
+
+
+SessionEndedCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+class SessionSlotsFullError(Exception):
+    """Raised when a session is started while every slot is taken."""
+
+
+class InProcessSessionRunner:
+    """
+    Runs up to `slots` run_bot pipelines as asyncio tasks in the app/main.py process.
+
+    Every session keeps its data under its own session_id in the SessionManager,
+    can be cancelled on its own, and a crash in one pipeline is logged and
+    reported without touching the others. Pipecat's ConversationContextProvider
+    is process-global, so with tracing enabled concurrent sessions share it.
+    """
+
+    def __init__(self, slots: int, on_session_ended: Optional[SessionEndedCallback] = None):
+        self.slots = slots
+        self.on_session_ended = on_session_ended
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._room_urls: Dict[str, str] = {}
+
+    @property
+    def active_sessions(self) -> int:
+        return len(self._tasks)
+
+    @property
+    def free_slots(self) -> int:
+        return max(self.slots - len(self._tasks), 0)
+
+    def preload(self):
+        """Import the bot module up front so the first session does not pay for it."""
+        from app.agents.voice.driver import bot  # noqa: F401
+
+        logger.info(f"[RUNNER] In-process session runner ready with {self.slots} slots")
+
+    def start(self, session_args: Dict[str, Any]) -> asyncio.Task:
+        """
+        Start a run_bot pipeline for a session.
+
+        Args:
+            session_args: Keyword arguments for run_bot
+
+        Returns:
+            The asyncio task running the session
+
+        Raises:
+            SessionSlotsFullError: If every slot is already taken
+        """
+        if not self.free_slots:
+            raise SessionSlotsFullError(f"All {self.slots} session slots are taken")
+
+        session_id = session_args["session_id"]
+        task = asyncio.create_task(self._run(session_args), name=f"session-{session_id}")
+        self._tasks[session_id] = task
+        self._room_urls[session_id] = session_args["room_url"]
+        logger.info(f"[RUNNER] Started session {session_id} ({self.active_sessions}/{self.slots} slots used)")
+        return task
+
+    async def _run(self, session_args: Dict[str, Any]):
+        from app.agents.voice.driver.bot import load_bot_models, run_bot
+        from app.agents.voice.driver.analytics.startup_timings import StartupTimings
+
+        session_id = session_args["session_id"]
+        started_at = time.monotonic()
+        startup_timings = StartupTimings()
+        startup_timings.mark("dispatched", started_at)
+        exit_code = 0
+
+        try:
+            # Model loading is CPU bound, keep it off the loop the other sessions run on
+            models = await asyncio.to_thread(load_bot_models)
+            startup_timings.mark("models_loaded")
+            await run_bot(**session_args, models=models, startup_timings=startup_timings)
+        except asyncio.CancelledError:
+            logger.info(f"[RUNNER] Session {session_id} cancelled")
+            exit_code = -1
+        except Exception as e:
+            logger.exception(f"[RUNNER] Session {session_id} crashed: {e}")
+            exit_code = 1
+        finally:
+            self._tasks.pop(session_id, None)
+            room_url = self._room_urls.pop(session_id, None)
+
+            session_manager = get_session_manager()
+            if await session_manager.session_exists(session_id):
+                await session_manager.delete_session(session_id)
+
+            logger.info(f"[RUNNER] Session {session_id} ended with exit code {exit_code} ({self.active_sessions}/{self.slots} slots used)")
+
+            if self.on_session_ended:
+                try:
+                    await self.on_session_ended(session_id, {
+                        "exit_code": exit_code,
+                        "room_url": room_url,
+                        "duration": time.monotonic() - started_at,
+                    })
+                except Exception as e:
+                    logger.error(f"[RUNNER] Session ended callback failed for {session_id}: {e}")
+
+    async def cancel(self, session_id: str) -> bool:
+        """
+        Cancel a running session.
+
+        Returns:
+            True if the session was running and has been cancelled
+        """
+        task = self._tasks.get(session_id)
+        if not task:
+            return False
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return True
+
+    async def shutdown(self):
+        """Cancel every running session and wait for them to clean up."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "slots": self.slots,
+            "active": self.active_sessions,
+            "free": self.free_slots,
+            "sessions": [
+                {"session_id": session_id, "room_url": self._room_urls.get(session_id)}
+                for session_id in self._tasks
+            ],
+        }
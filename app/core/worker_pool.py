@@ -0,0 +1,111 @@
+"""
+Pool of pre-imported, pre-initialized bot worker processes.
+"""
+import json
+import subprocess
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from loguru import logger
+
+
+class BotWorkerPool:
+    """
+    Keeps idle bot workers (app/agents/voice/driver/worker.py) that have
+    already imported pipecat and loaded their models.
+
+    Each worker serves exactly one session: dispatch() writes the session
+    arguments to the worker's stdin as a JSON line and closes it. The pool is
+    only refilled from fill(), so a replacement worker never loads its models
+    while a live call on the same pod needs the CPU.
+    """
+
+    def __init__(self, size: int, worker_file: str, cwd: Path):
+        self.size = size
+        self.worker_file = worker_file
+        self.cwd = cwd
+        self._idle: Deque[Tuple[subprocess.Popen, float]] = deque()
+        self.hits = 0
+        self.misses = 0
+
+    def _spawn(self) -> subprocess.Popen:
+        spawned_at = time.monotonic()
+        proc = subprocess.Popen(
+            ["python3", self.worker_file, "--spawned-at", str(spawned_at)],
+            cwd=self.cwd,
+            stdin=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+        self._idle.append((proc, spawned_at))
+        logger.info(f"[WORKER POOL] Spawned warm worker with PID: {proc.pid}")
+        return proc
+
+    def _prune(self):
+        """Drop idle workers that died before they were handed a session."""
+        for proc, spawned_at in list(self._idle):
+            returncode = proc.poll()
+            if returncode is not None:
+                logger.warning(f"[WORKER POOL] Idle worker {proc.pid} exited with return code {returncode}")
+                self._idle.remove((proc, spawned_at))
+
+    def fill(self):
+        """Spawn workers until `size` idle workers are available."""
+        self._prune()
+        while len(self._idle) < self.size:
+            self._spawn()
+
+    def dispatch(self, session_args: Dict[str, Any]) -> Optional[subprocess.Popen]:
+        """
+        Hand a session to an idle worker.
+
+        Args:
+            session_args: Keyword arguments for run_bot
+
+        Returns:
+            The worker process now running the session, or None if no idle
+            worker could take it and the caller has to cold-start a bot
+        """
+        self._prune()
+        while self._idle:
+            proc, spawned_at = self._idle.popleft()
+            payload = dict(session_args, dispatched_at=time.monotonic())
+            try:
+                proc.stdin.write(json.dumps(payload) + "\n")
+                proc.stdin.close()
+            except (BrokenPipeError, OSError) as e:
+                logger.warning(f"[WORKER POOL] Worker {proc.pid} could not take the session: {e}")
+                proc.kill()
+                proc.wait()
+                continue
+
+            self.hits += 1
+            logger.info(f"[WORKER POOL] Dispatched session {session_args.get('session_id')} to worker {proc.pid} (warm for {time.monotonic() - spawned_at:.1f}s)")
+            return proc
+
+        self.misses += 1
+        logger.warning("[WORKER POOL] No idle worker available, falling back to a cold start")
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        self._prune()
+        now = time.monotonic()
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "hits": self.hits,
+            "misses": self.misses,
+            "idle_workers": [
+                {"pid": proc.pid, "warm_for_secs": round(now - spawned_at, 1)}
+                for proc, spawned_at in self._idle
+            ],
+        }
+
+    def shutdown(self):
+        """Terminate every idle worker."""
+        while self._idle:
+            proc, _ = self._idle.popleft()
+            proc.terminate()
+        logger.info("[WORKER POOL] Idle workers terminated")
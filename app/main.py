@@ -1,5 +1,7 @@
 import os
+import signal
 import subprocess
+import sys
 import time
 import uuid
 import asyncio
@@ -8,33 +10,62 @@ from pathlib import Path
 from typing import Any, Dict
 
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
+from pydantic import BaseModel
 
 from app.schemas import DriverParams, LanguageCode
 
-import aiohttp
 
-
-from pipecat.transports.daily.utils import (
-    DailyMeetingTokenParams,
-    DailyMeetingTokenProperties,
-    DailyRESTHelper,
-    DailyRoomParams,
-    DailyRoomProperties,
-)
+from pipecat.transports.daily.utils import DailyRESTHelper
 
 from app.core.config import (
+    ADMISSION_MAX_CPU,
+    ADMISSION_MAX_LOOP_LAG,
+    ADMISSION_MAX_MEMORY,
+    AWS_REGION,
+    BOT_LAUNCH_MODE,
+    CAPACITY_REPORT_INTERVAL,
     DAILY_API_KEY,
     DAILY_API_URL,
+    DAILY_DOMAIN_ID,
+    DRAIN_TIMEOUT,
+    ENABLE_ADMISSION_CONTROL,
+    ENABLE_LOCAL_TOKEN_MINTING,
+    ENABLE_S3_STORAGE,
+    ENABLE_TTS_CACHE,
     MAX_SESSION_TIME,
+    MAX_SESSIONS_PER_POD,
     NOTIFY_ENDPOINT,
     ROUTER_URL,
     POD_NAME,
     POD_IP,
     PORT,
+    RECORDING_ENCODE_WORKERS,
+    RECORDING_SPOOL_DIR,
+    RECORDING_UPLOAD_CONCURRENCY,
+    RECORDING_UPLOAD_DRAIN_TIMEOUT,
+    RECORDING_UPLOAD_MAX_ATTEMPTS,
+    ROOM_POOL_SIZE,
+    ROOM_POOL_TTL,
+    S3_BUCKET_NAME,
+    TTS_CACHE_DIR,
+    WORKER_POOL_SIZE,
+    ZYGOTE_SOCKET_PATH,
 )
+from app.core.worker_pool import BotWorkerPool
+from app.core.bot_zygote import BotZygote, ZygoteSession
+from app.core.process_memory import tree_memory
+from app.core.admission import AdmissionController
+from app.core.http_client import http_client
+from app.core.session_runner import InProcessSessionRunner, SessionSlotsFullError
+from app.core.room_pool import DailyRoomPool, create_room_and_token
+from app.core.process_reaper import wait_for_exit
+from app.core.daily_tokens import MintingDailyRESTHelper
+from app.core.connect_metrics import enable_local_recording, record_phase
+from app.core.metrics import Gauge, render_metrics
+from app.core.recording_uploader import RecordingUploader
 
 
 from loguru import logger
@@ -42,6 +73,106 @@ from loguru import logger
 
 
 bot_procs = {}
+# Keeps the per-process exit watchers referenced until they finish
+_reaper_tasks = set()
+
+BOT_FILE = "app/agents/voice/driver/bot.py"
+WORKER_FILE = "app/agents/voice/driver/worker.py"
+ZYGOTE_FILE = "app/agents/voice/driver/zygote.py"
+
+worker_pool = (
+    BotWorkerPool(size=WORKER_POOL_SIZE, worker_file=WORKER_FILE, cwd=Path(__file__).parent.parent)
+    if BOT_LAUNCH_MODE == "worker_pool"
+    else None
+)
+
+zygote = (
+    BotZygote(zygote_file=ZYGOTE_FILE, socket_path=ZYGOTE_SOCKET_PATH, cwd=Path(__file__).parent.parent)
+    if BOT_LAUNCH_MODE == "zygote"
+    else None
+)
+
+
+async def _on_inprocess_session_ended(session_id: str, report: Dict[str, Any]):
+    """Hand the freed slot back to the router instead of having the pod deleted."""
+    _session_finished()
+    if POD_NAME:
+        # A draining pod must not get its slot handed out again
+        await notify_session_ended(session_id, recycle=not _draining, **report)
+
+
+session_runner = (
+    InProcessSessionRunner(slots=MAX_SESSIONS_PER_POD, on_session_ended=_on_inprocess_session_ended)
+    if BOT_LAUNCH_MODE == "inprocess"
+    else None
+)
+
+
+# In-process sessions report their connect phases straight into this process
+if session_runner:
+    enable_local_recording()
+
+
+# Uploads the recordings every bot on the pod spools, so no bot waits on S3
+recording_uploader = (
+    RecordingUploader(
+        spool_dir=RECORDING_SPOOL_DIR,
+        bucket=S3_BUCKET_NAME,
+        region=AWS_REGION,
+        concurrency=RECORDING_UPLOAD_CONCURRENCY,
+        max_attempts=RECORDING_UPLOAD_MAX_ATTEMPTS,
+        encode_workers=RECORDING_ENCODE_WORKERS,
+    )
+    if ENABLE_S3_STORAGE
+    else None
+)
+
+
+def _advertised_slots() -> int:
+    """Number of concurrent sessions this pod takes."""
+    return session_runner.slots if session_runner else 1
+
+
+admission = (
+    AdmissionController(
+        max_cpu=ADMISSION_MAX_CPU,
+        max_memory=ADMISSION_MAX_MEMORY,
+        max_loop_lag=ADMISSION_MAX_LOOP_LAG,
+    )
+    if ENABLE_ADMISSION_CONTROL
+    else None
+)
+_capacity_task = None
+_tts_warm_task = None
+# Keeps out-of-band capacity reports referenced until they finish
+_capacity_reports = set()
+
+
+def _capacity() -> Dict[str, Any]:
+    """Sessions this pod can still take right now, with the load behind that figure."""
+    free_slots = session_runner.free_slots if session_runner else (0 if bot_procs else 1)
+    load = admission.stats() if admission else {"saturated": False}
+    if load["saturated"] or _draining:
+        free_slots = 0
+    return {"free_slots": free_slots, **load}
+
+
+_draining = False
+_drain_task = None
+# Set whenever the last running session on the pod finishes
+_sessions_finished = asyncio.Event()
+
+
+def _active_sessions() -> int:
+    return len(bot_procs) + (session_runner.active_sessions if session_runner else 0)
+
+
+def _session_finished():
+    # The session's recording has just been spooled
+    if recording_uploader:
+        recording_uploader.wake()
+    if not _active_sessions():
+        _sessions_finished.set()
 
 
 def _pod_endpoint() -> str | None:
@@ -53,7 +184,43 @@ def _pod_endpoint() -> str | None:
     return None
 
 
-daily_rest = DailyRESTHelper(daily_api_key=DAILY_API_KEY, daily_api_url=DAILY_API_URL,aiohttp_session=aiohttp.ClientSession())
+# Built on startup, once the shared HTTP client exists inside the event loop
+daily_rest = None
+daily_rooms = None
+room_pool = None
+
+
+async def _setup_daily():
+    global daily_rest, daily_rooms, room_pool
+    daily_rest = DailyRESTHelper(daily_api_key=DAILY_API_KEY, daily_api_url=DAILY_API_URL, aiohttp_session=http_client.session)
+
+    daily_rooms = daily_rest
+    if ENABLE_LOCAL_TOKEN_MINTING:
+        if not (DAILY_DOMAIN_ID and DAILY_API_KEY):
+            logger.warning("Local token minting needs DAILY_API_KEY and DAILY_DOMAIN_ID, using the REST API for tokens")
+        else:
+            minting = MintingDailyRESTHelper(daily_rest, api_key=DAILY_API_KEY, domain_id=DAILY_DOMAIN_ID)
+            if await minting.check_domain():
+                daily_rooms = minting
+            else:
+                logger.warning("Local token minting disabled, using the REST API for tokens")
+
+    if ROOM_POOL_SIZE > 0:
+        room_pool = DailyRoomPool(rest=daily_rooms, size=ROOM_POOL_SIZE, room_ttl=ROOM_POOL_TTL, session_time=MAX_SESSION_TIME)
+
+POOL_STAT = Gauge("voice_pool_stat", "Room and worker pool counters at scrape time", ["pool", "stat"])
+ACTIVE_SESSIONS = Gauge("voice_active_sessions", "Sessions currently running on this pod")
+POD_MEMORY_BYTES = Gauge("voice_pod_memory_bytes", "Memory of app/main.py and every bot process it started", ["kind"])
+POD_LOAD = Gauge("voice_pod_load", "Load measured by admission control (cpu and memory as share of the limit, loop_lag in seconds)", ["kind"])
+ADMISSION_REJECTED = Gauge("voice_admission_rejected", "Sessions rejected with 429 since the pod started")
+POD_PROCESSES = Gauge("voice_pod_processes", "Processes in the pod's process tree")
+RECORDING_UPLOADS = Gauge("voice_recording_uploads", "Recording upload queue counters at scrape time", ["stat"])
+
+
+class ConnectPhaseReport(BaseModel):
+    session_id: str
+    phase: str
+    ts: float
 
 
 # Create the FastAPI app instance
@@ -68,8 +235,40 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+def _bot_command(session_args: Dict[str, Any]) -> list[str]:
+    """Build the command line that cold-starts bot.py for a session."""
+    cmd = [
+    "python3",
+    BOT_FILE,
+    "-u",
+    session_args["room_url"],
+    "-t",
+    session_args["token"],
+    "--session-id",
+    session_args["session_id"],
+    "--language-code",
+    session_args["language_code"],
+    "--current-version-of-app",
+    session_args["current_version_of_app"],
+    "--latest-version-of-app",
+    session_args["latest_version_of_app"],
+    "--agent-name",
+    session_args["agent_name"],
+    "--ride-id",
+    session_args["ride_id"],
+    "--dispatched-at",
+    str(time.monotonic()),
+    ]
+
+    if session_args["driver_number"]:
+        cmd += ["--driver-number", session_args["driver_number"]]
+
+    return cmd
+
+
 @app.post("/start-session")
 async def driver_voice_connect(request: DriverParams):
+    received_at = time.monotonic()
     logger.info(f"Driver connected params: {request}")
 
     driver_number = request.phoneNumber
@@ -82,89 +281,86 @@ async def driver_voice_connect(request: DriverParams):
 
     logger.info(f"Driver connected params: {agent_name}")
 
-   
-    daily_room_properties = DailyRoomProperties(
-        exp=time.time() + MAX_SESSION_TIME,
-        eject_at_room_exp=True,
-    )
-
-    room = await daily_rest.create_room(
-        params=DailyRoomParams(properties=daily_room_properties)
-    )
-
-    token_params = DailyMeetingTokenParams(
-        properties=DailyMeetingTokenProperties(
-            eject_after_elapsed=MAX_SESSION_TIME,
-        )
-    )
-
-    token = await daily_rest.get_token(
-        room.url,
-        expiry_time=MAX_SESSION_TIME,
-        eject_at_token_exp=True,
-        owner=True,
-        params=token_params,
-    )
+    if _draining:
+        raise HTTPException(status_code=503, detail="Pod is draining")
+    if session_runner and not session_runner.free_slots:
+        raise HTTPException(status_code=503, detail="All session slots are taken")
+    if admission:
+        reason = admission.admit()
+        if reason:
+            # Let the router know straight away instead of at the next report
+            report = asyncio.create_task(report_capacity())
+            _capacity_reports.add(report)
+            report.add_done_callback(_capacity_reports.discard)
+            raise HTTPException(status_code=429, detail=f"Pod over budget: {reason}", headers={"Retry-After": "1"})
 
     session_id = str(uuid.uuid4()) 
 
     logger.info(f"Generated session ID for new voice agent: {session_id}")
+    record_phase(
+        session_id,
+        "request_received",
+        received_at,
+        agent=agent_name or "not_getting_rides",
+        launch_mode=BOT_LAUNCH_MODE,
+    )
 
-    bot_file = "app/agents/voice/driver/bot.py"
-
-    cmd = [
-    "python3",
-    bot_file,
-    "-u",
-    room.url,
-    "-t",
-    token,
-    "--session-id",
-    session_id,
-    ]
-
-    if driver_number:
-        cmd += ["--driver-number", driver_number]
-
-    if language_code:
-        cmd += ["--language-code", language_code]
-    else:
-        cmd += ["--language-code", "kn"]
-    
-    if current_version_of_app:
-        cmd += ["--current-version-of-app", current_version_of_app]
-    else:
-        cmd += ["--current-version-of-app", ""]
-    
-    if latest_version_of_app:
-        cmd += ["--latest-version-of-app", latest_version_of_app]
-    else:
-        cmd += ["--latest-version-of-app", ""]
-    
-    if agent_name:
-        cmd += ["--agent-name", agent_name]
+    room_marks = {}
+    if room_pool:
+        room = await room_pool.acquire(marks=room_marks)
     else:
-        cmd += ["--agent-name", "not_getting_rides"]
-    
-    if ride_id:
-        cmd += ["--ride-id", ride_id]
-    else:
-        cmd += ["--ride-id", ""]
-        
-
-    logger.info(f"Starting voice agent with command: {cmd}")
-
-    proc = subprocess.Popen(
-        cmd,
-        cwd=Path(__file__).parent.parent,
-        bufsize=1,
-    )
+        room = await create_room_and_token(
+            daily_rooms, lifetime=MAX_SESSION_TIME, session_time=MAX_SESSION_TIME, marks=room_marks
+        )
+    token = room.token
+    for phase, ts in room_marks.items():
+        record_phase(session_id, phase, ts)
+
+    session_args = {
+        "room_url": room.room_url,
+        "token": token,
+        "session_id": session_id,
+        "driver_number": driver_number,
+        "language_code": language_code or "kn",
+        "agent_name": agent_name or "not_getting_rides",
+        "current_version_of_app": current_version_of_app or "",
+        "latest_version_of_app": latest_version_of_app or "",
+        "ride_id": ride_id or "",
+    }
+
+    if session_runner:
+        try:
+            session_runner.start(session_args)
+        except SessionSlotsFullError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        record_phase(session_id, "process_spawned")
+        return {"room_url": room.room_url, "token": token}
+
+    proc = None
+    if zygote:
+        proc = await zygote.spawn(session_args)
+    elif worker_pool:
+        proc = worker_pool.dispatch(session_args)
+
+    if proc is None:
+        cmd = _bot_command(session_args)
+        logger.info(f"Starting voice agent with command: {cmd}")
+
+        proc = subprocess.Popen(
+            cmd,
+            cwd=Path(__file__).parent.parent,
+            bufsize=1,
+        )
 
-    bot_procs[proc.pid] = (proc, room.url)
+    record_phase(session_id, "process_spawned")
+    bot_procs[proc.pid] = (proc, room.room_url)
+    reaper = asyncio.create_task(watch_bot_process(proc, room.room_url, session_id))
+    _reaper_tasks.add(reaper)
+    reaper.add_done_callback(_reaper_tasks.discard)
 
     logger.info(f"Voice agent started with PID: {proc.pid}")
     
-    return {"room_url": room.url, "token": token}
+    return {"room_url": room.room_url, "token": token}
 
 async def register_with_router():
     endpoint = _pod_endpoint()
@@ -173,72 +369,205 @@ async def register_with_router():
         return
     
     try:
-        async with aiohttp.ClientSession() as session:
-            url = f"{ROUTER_URL}/register"
-            logger.info(f"[POD] Registering with endpoint {endpoint}")
-            async with session.post(url, json={
-                "pod_name": POD_NAME,
-                "endpoint": endpoint
-            }) as response:
-                if response.status == 200:
-                    logger.info(f"[POD] Successfully registered with router")
-                else:
-                    logger.error(f"[POD] Registration failed with status {response.status}")
+        url = f"{ROUTER_URL}/register"
+        logger.info(f"[POD] Registering with endpoint {endpoint}")
+        status = await http_client.post_with_retry(url, json={
+            "pod_name": POD_NAME,
+            "endpoint": endpoint,
+            "slots": _advertised_slots(),
+            "capacity": _capacity(),
+        }, attempts=6)
+        if status == 200:
+            logger.info(f"[POD] Successfully registered with router")
+        else:
+            logger.error(f"[POD] Registration failed with status {status}")
     except Exception as e:
         logger.error(f"[POD] Failed to register with router: {e}")
 
 
-async def notify_session_ended():
-    """Notify the router that a session has ended."""
+async def report_capacity():
+    """Push the pod's remaining capacity to the router."""
+    endpoint = _pod_endpoint()
+    if not endpoint or not POD_NAME or not ROUTER_URL:
+        return
+
+    try:
+        # Reports are periodic, a lost one is superseded by the next
+        status = await http_client.post_with_retry(f"{ROUTER_URL}/capacity", json={
+            "pod_name": POD_NAME,
+            "endpoint": endpoint,
+            **_capacity(),
+        }, attempts=1)
+        if status != 200:
+            logger.error(f"[POD] Capacity report failed with status {status}")
+    except Exception as e:
+        logger.error(f"[POD] Failed to report capacity to router: {e}")
+
+
+async def report_capacity_loop():
+    while True:
+        await asyncio.sleep(CAPACITY_REPORT_INTERVAL)
+        await report_capacity()
+
+
+async def deregister_from_router():
+    """Take every warm slot of this pod off the router so no new session is sent here."""
+    endpoint = _pod_endpoint()
+    if not endpoint or not POD_NAME or not ROUTER_URL:
+        logger.warning(f"[POD] Cannot deregister: endpoint={endpoint}, POD_NAME={POD_NAME}, ROUTER_URL={ROUTER_URL}")
+        return
+
+    try:
+        status = await http_client.post_with_retry(f"{ROUTER_URL}/deregister", json={
+            "pod_name": POD_NAME,
+            "endpoint": endpoint,
+        }, attempts=6)
+        if status == 200:
+            logger.info("[POD] Deregistered from router")
+        else:
+            logger.error(f"[POD] Deregistration failed with status {status}")
+    except Exception as e:
+        logger.error(f"[POD] Failed to deregister from router: {e}")
+
+
+async def notify_session_ended(
+    session_id: str,
+    recycle: bool = False,
+    exit_code: int | None = None,
+    room_url: str | None = None,
+    duration: float | None = None,
+):
+    """
+    Notify the router that a session has ended.
+
+    Args:
+        session_id: Session that ended; the router handles each session's
+            report once, so retrying a report that did arrive is harmless
+        recycle: Ask the router to hand the freed slot out again instead of
+            deleting the pod (used when the pod carries several sessions)
+        exit_code: Exit code of the bot process (or session task)
+        room_url: Daily room the session ran in
+        duration: Session duration in seconds
+    """
     endpoint = _pod_endpoint()
     if not endpoint or not POD_NAME or not ROUTER_URL:
         logger.warning(f"[POD] Cannot notify session ended: endpoint={endpoint}, POD_NAME={POD_NAME}, ROUTER_URL={ROUTER_URL}")
         return
     
     try:
-        async with aiohttp.ClientSession() as session:
-            url = f"{ROUTER_URL}/session-ended"
-            logger.info(f"[POD] Notifying session ended for pod: {POD_NAME}")
-            async with session.post(url, json={
-                "pod_name": POD_NAME,
-                "endpoint": endpoint
-            }) as response:
-                if response.status == 200:
-                    logger.info(f"[POD] Successfully notified session ended")
-                else:
-                    logger.error(f"[POD] Failed to notify session ended with status {response.status}")
+        url = f"{ROUTER_URL}/session-ended"
+        logger.info(f"[POD] Notifying session ended for pod: {POD_NAME}")
+        # A lost notification strands the pod in the active list, so retry harder
+        status = await http_client.post_with_retry(url, json={
+            "pod_name": POD_NAME,
+            "endpoint": endpoint,
+            "session_id": session_id,
+            "recycle": recycle,
+            "exit_code": exit_code,
+            "room_url": room_url,
+            "duration": duration,
+        }, attempts=6)
+        if status == 200:
+            logger.info(f"[POD] Successfully notified session ended")
+        else:
+            logger.error(f"[POD] Failed to notify session ended with status {status}")
     except Exception as e:
         logger.error(f"[POD] Failed to notify session ended: {e}")
 
 
-async def monitor_processes():
-    """Background task to monitor subprocesses and notify when they terminate."""
-    while True:
+async def watch_bot_process(proc: subprocess.Popen | ZygoteSession, room_url: str, session_id: str):
+    """Report a bot process to the router the moment it exits."""
+    started_at = time.monotonic()
+    try:
+        if isinstance(proc, ZygoteSession):
+            # Forked by the zygote, so not our child; the zygote reports its exit
+            returncode = await proc.wait()
+        else:
+            returncode = await wait_for_exit(proc)
+    except Exception as e:
+        logger.error(f"Error waiting for process {proc.pid}: {e}")
+        returncode = proc.wait() if isinstance(proc, subprocess.Popen) else -1
+    duration = time.monotonic() - started_at
+
+    logger.info(f"Process {proc.pid} terminated with return code {returncode} after {duration:.1f}s (room: {room_url})")
+    bot_procs.pop(proc.pid, None)
+    _session_finished()
+
+    # Refill only once the pod is idle so a new worker never loads
+    # its models while a live call needs the CPU.
+    if worker_pool and not bot_procs and not _draining:
+        worker_pool.fill()
+    if zygote and not bot_procs and not _draining:
+        zygote.start()
+
+    if POD_NAME:
+        await notify_session_ended(session_id, exit_code=returncode, room_url=room_url, duration=duration)
+
+
+
+async def drain():
+    """
+    Stop taking sessions, wait for the running ones and exit.
+
+    Sessions still running after DRAIN_TIMEOUT are ended. The exit goes
+    through uvicorn's SIGINT handling so the shutdown hooks still run.
+    """
+    global _draining
+    _draining = True
+    logger.info(f"[DRAIN] Draining pod with {_active_sessions()} active sessions (timeout {DRAIN_TIMEOUT}s)")
+
+    if POD_NAME:
+        await deregister_from_router()
+    if worker_pool:
+        worker_pool.shutdown()
+    if room_pool:
+        await room_pool.stop()
+
+    deadline = time.monotonic() + DRAIN_TIMEOUT
+    while _active_sessions():
+        _sessions_finished.clear()
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
         try:
-            dead_pids = []
-            for pid, (proc, room_url) in list(bot_procs.items()):
-                # Check if process has terminated
-                returncode = proc.poll()
-                if returncode is not None:
-                    # Process has terminated
-                    logger.info(f"Process {pid} terminated with return code {returncode} (room: {room_url})")
-                    dead_pids.append(pid)
-            
-            # Clean up dead processes and notify
-            if dead_pids:
-                for pid in dead_pids:
-                    bot_procs.pop(pid, None)
-                
-                # Notify router that session ended (only once, not per process)
-                if POD_NAME:
-                    await notify_session_ended()
-            
-            # Check every 10 seconds
-            await asyncio.sleep(10)
-        except Exception as e:
-            logger.error(f"Error monitoring processes: {e}")
-            await asyncio.sleep(10)
+            await asyncio.wait_for(_sessions_finished.wait(), timeout=remaining)
+        except asyncio.TimeoutError:
+            break
+
+    if _active_sessions():
+        logger.warning(f"[DRAIN] Drain timed out, ending {_active_sessions()} sessions")
+        for proc, _ in list(bot_procs.values()):
+            try:
+                os.kill(proc.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        if session_runner:
+            await session_runner.shutdown()
+        # Give the exit watchers a moment to notify the router
+        try:
+            await asyncio.wait_for(_sessions_finished.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            pass
+
+    if recording_uploader:
+        await recording_uploader.drain(RECORDING_UPLOAD_DRAIN_TIMEOUT)
+
+    logger.info("[DRAIN] Pod drained, shutting down")
+    os.kill(os.getpid(), signal.SIGINT)
+
 
+def start_drain() -> asyncio.Task:
+    """Start draining the pod, once; later calls return the running drain."""
+    global _drain_task
+    if _drain_task is None:
+        _drain_task = asyncio.create_task(drain())
+    return _drain_task
+
+
+@app.post("/drain")
+async def drain_pod():
+    start_drain()
+    return JSONResponse({"status": "draining", "active_sessions": _active_sessions(), "timeout": DRAIN_TIMEOUT})
 
 
 @app.get("/")
@@ -247,16 +576,165 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return JSONResponse({"status": "healthy"})
+    return JSONResponse({"status": "healthy", "draining": _draining})
+
+
+@app.get("/metrics")
+async def metrics():
+    if room_pool:
+        for stat, value in room_pool.stats().items():
+            POOL_STAT.set(value, pool="room", stat=stat)
+    if worker_pool:
+        for stat, value in worker_pool.stats().items():
+            if isinstance(value, (int, float)):
+                POOL_STAT.set(value, pool="worker", stat=stat)
+    ACTIVE_SESSIONS.set(session_runner.active_sessions if session_runner else len(bot_procs))
+    if admission:
+        load = admission.stats()
+        for kind in ("cpu", "memory", "loop_lag"):
+            if load[kind] is not None:
+                POD_LOAD.set(load[kind], kind=kind)
+        ADMISSION_REJECTED.set(load["rejected"])
+    if recording_uploader:
+        for stat, value in recording_uploader.stats().items():
+            RECORDING_UPLOADS.set(value, stat=stat)
+    memory = await asyncio.to_thread(tree_memory, os.getpid())
+    POD_MEMORY_BYTES.set(memory["rss"], kind="rss")
+    POD_MEMORY_BYTES.set(memory["pss"], kind="pss")
+    POD_PROCESSES.set(memory["processes"])
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+@app.post("/internal/connect-phase")
+async def connect_phase(report: ConnectPhaseReport):
+    """Connect phases reported by bot processes running on this pod."""
+    record_phase(report.session_id, report.phase, report.ts)
+    return JSONResponse({"status": "ok"})
+
+
+@app.get("/worker-pool")
+async def worker_pool_stats():
+    if not worker_pool:
+        return JSONResponse({"enabled": False})
+    return JSONResponse({"enabled": True, **worker_pool.stats()})
+
+
+@app.get("/capacity")
+async def capacity():
+    return JSONResponse(_capacity())
+
+
+@app.get("/zygote")
+async def zygote_stats():
+    if not zygote:
+        return JSONResponse({"enabled": False})
+    return JSONResponse({"enabled": True, **zygote.stats()})
+
+
+@app.get("/recording-uploads")
+async def recording_upload_stats():
+    if not recording_uploader:
+        return JSONResponse({"enabled": False})
+    return JSONResponse({"enabled": True, **recording_uploader.stats()})
+
+
+@app.get("/room-pool")
+async def room_pool_stats():
+    if not room_pool:
+        return JSONResponse({"enabled": False})
+    return JSONResponse({"enabled": True, **room_pool.stats()})
+
+
+@app.get("/sessions")
+async def list_sessions():
+    if not session_runner:
+        return JSONResponse({"enabled": False})
+    return JSONResponse({"enabled": True, **session_runner.stats()})
+
+
+@app.delete("/sessions/{session_id}")
+async def cancel_session(session_id: str):
+    if not session_runner or not await session_runner.cancel(session_id):
+        raise HTTPException(status_code=404, detail=f"Session {session_id} is not running in this process")
+    return JSONResponse({"status": "cancelled", "session_id": session_id})
+
+
+async def warm_tts_cache():
+    """
+    Synthesize fixed utterances missing from the node's TTS cache, in a
+    subprocess so this process never imports the TTS services. Does nothing
+    once an earlier pod on the node has filled the cache.
+    """
+    languages = [code.value for code in LanguageCode]
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "app.agents.voice.driver.tts.warm_cache",
+        "--languages", *languages,
+        "--cache-dir", TTS_CACHE_DIR,
+        cwd=Path(__file__).parent.parent,
+    )
+    try:
+        returncode = await proc.wait()
+    except asyncio.CancelledError:
+        proc.kill()
+        await proc.wait()
+        raise
+    if returncode == 0:
+        logger.info(f"[TTS CACHE] Cache in {TTS_CACHE_DIR} is warm")
+    else:
+        logger.error(f"[TTS CACHE] Warming {TTS_CACHE_DIR} failed with exit code {returncode}")
 
 
 @app.on_event("startup")
 async def startup_event():
+    global _capacity_task, _tts_warm_task
+    await http_client.start()
+    await _setup_daily()
+
+    if admission:
+        admission.start()
+    if room_pool:
+        room_pool.start()
+    if recording_uploader:
+        recording_uploader.start()
+    if session_runner:
+        session_runner.preload()
+
+    if worker_pool:
+        worker_pool.fill()
+        logger.info(f"Warm bot worker pool started with {worker_pool.size} workers")
+    if zygote:
+        zygote.start()
+    if ENABLE_TTS_CACHE:
+        _tts_warm_task = asyncio.create_task(warm_tts_cache())
+
+    # Spot reclaims and rollouts send SIGTERM; drain instead of dropping live calls
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, start_drain)
+
     if os.getenv("ENVIRONMENT") != "dev":
         await register_with_router()
-        asyncio.create_task(monitor_processes())
-        logger.info("Started subprocess monitoring task")
+        _capacity_task = asyncio.create_task(report_capacity_loop())
     else:
         logger.info("Not in production environment, skipping registration with router")
-    
-    
\ No newline at end of file
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if _capacity_task:
+        _capacity_task.cancel()
+    if _tts_warm_task:
+        _tts_warm_task.cancel()
+        await asyncio.gather(_tts_warm_task, return_exceptions=True)
+    if admission:
+        await admission.stop()
+    if room_pool:
+        await room_pool.stop()
+    if worker_pool:
+        worker_pool.shutdown()
+    if zygote:
+        zygote.shutdown()
+    if session_runner:
+        await session_runner.shutdown()
+    if recording_uploader:
+        await recording_uploader.stop()
+    # Last, so session-ended notifications from the shutdown above still go out
+    await http_client.close()
@@ -0,0 +1,133 @@
+"""
+Per-session against batched VAD and smart-turn inference.
+
+Runs N simulated sessions at once, each on its own thread the way pipecat
+runs every analyzer on its own executor thread. Every session feeds 32ms VAD
+windows and asks for a turn-end prediction every --turn-every seconds:
+
+    python benchmarks/batched_inference.py --sessions 1,4,16
+
+"per_session" gives every session its own SileroVADAnalyzer and
+LocalSmartTurnAnalyzerV3 (today's setup); "batched" shares one
+BatchedInferenceService. Sessions are paced to real time by default, which is
+what tail latency under load looks like on a pod; --unpaced feeds windows as
+fast as they are answered, which measures throughput.
+"""
+import argparse
+import math
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from pipecat.audio.turn.smart_turn.local_smart_turn_v3 import LocalSmartTurnAnalyzerV3
+from pipecat.audio.vad.silero import SileroVADAnalyzer
+
+from app.agents.voice.driver.utils.batched_inference import (
+    BatchedInferenceService,
+    BatchedSmartTurnAnalyzer,
+    BatchedVADAnalyzer,
+)
+
+
+SAMPLE_RATE = 16000
+WINDOW = 512
+
+
+def synthetic_audio(seconds: float, seed: int) -> np.ndarray:
+    """Speech-like bursts and pauses, as int16."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = rng.uniform(110, 240)
+    voice = sum(np.sin(2 * math.pi * pitch * h * t) / h for h in (1, 2, 3))
+    envelope = (np.sin(2 * math.pi * 0.25 * t + rng.uniform(0, math.pi)) > 0) * (0.5 + 0.5 * np.sin(2 * math.pi * 4 * t))
+    audio = 6000 * envelope * voice + rng.normal(0, 200, len(t))
+    return np.clip(audio, -32768, 32767).astype(np.int16)
+
+
+def percentiles(values):
+    if not values:
+        return "-"
+    ordered = sorted(values)
+    pick = lambda p: ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)] * 1000
+    return f"{pick(50):6.2f} {pick(95):7.2f} {pick(99):7.2f}"
+
+
+def run_session(vad, turn, audio: np.ndarray, paced: bool, turn_every: float, vad_latencies, turn_latencies):
+    vad.set_sample_rate(SAMPLE_RATE)
+    turn.set_sample_rate(SAMPLE_RATE)
+    windows_per_turn = int(turn_every * SAMPLE_RATE / WINDOW)
+    started_at = time.perf_counter()
+    for i in range(len(audio) // WINDOW):
+        if paced:
+            delay = started_at + i * WINDOW / SAMPLE_RATE - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        window = audio[i * WINDOW:(i + 1) * WINDOW]
+        call_at = time.perf_counter()
+        vad.voice_confidence(window.tobytes())
+        vad_latencies.append(time.perf_counter() - call_at)
+
+        if i and i % windows_per_turn == 0:
+            segment = audio[max(0, (i + 1) * WINDOW - 4 * SAMPLE_RATE):(i + 1) * WINDOW].astype(np.float32) / 32768
+            call_at = time.perf_counter()
+            turn._predict_endpoint(segment)
+            turn_latencies.append(time.perf_counter() - call_at)
+
+
+def run(mode: str, sessions: int, seconds: float, paced: bool, turn_every: float, threads: int):
+    if mode == "batched":
+        service = BatchedInferenceService(threads=threads)
+        analyzers = [(BatchedVADAnalyzer(service), BatchedSmartTurnAnalyzer(service)) for _ in range(sessions)]
+    else:
+        service = None
+        analyzers = [(SileroVADAnalyzer(), LocalSmartTurnAnalyzerV3()) for _ in range(sessions)]
+
+    vad_latencies, turn_latencies = [], []
+    workers = [
+        threading.Thread(
+            target=run_session,
+            args=(vad, turn, synthetic_audio(seconds, seed), paced, turn_every, vad_latencies, turn_latencies),
+        )
+        for seed, (vad, turn) in enumerate(analyzers)
+    ]
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    cpu, wall = time.process_time() - cpu_start, time.perf_counter() - wall_start
+
+    print(
+        f"{mode:<11} {sessions:>8} {len(vad_latencies) / wall:>9.0f} {cpu / (sessions * seconds):>8.3f} "
+        f"{percentiles(vad_latencies)}  {percentiles(turn_latencies)}"
+    )
+    if service:
+        stats = service.stats()
+        print(f"{'':<11} {'':>8} mean batch: vad {stats['vad']['mean_batch']:.1f}, smart-turn {stats['smart_turn']['mean_batch']:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", default="1,4,16", help="Comma-separated concurrent session counts")
+    parser.add_argument("--seconds", type=float, default=20, help="Seconds of audio per session")
+    parser.add_argument("--turn-every", type=float, default=2, help="Seconds of audio between turn-end queries")
+    parser.add_argument("--threads", type=int, default=2, help="Threads of the batched service")
+    parser.add_argument("--unpaced", action="store_true", help="Feed audio as fast as it is analyzed")
+    args = parser.parse_args()
+
+    print(f"{'paced' if not args.unpaced else 'unpaced'}, {args.seconds:.0f}s of audio per session, latencies in ms")
+    print(f"{'mode':<11} {'sessions':>8} {'windows/s':>9} {'cpu/s':>8} {'vad p50':>6} {'p95':>7} {'p99':>7}  {'turn p50':>6} {'p95':>7} {'p99':>7}")
+    for sessions in (int(count) for count in args.sessions.split(",")):
+        for mode in ("per_session", "batched"):
+            run(mode, sessions, args.seconds, not args.unpaced, args.turn_every, args.threads)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Encode CPU time against bytes saved for each recording codec.
+
+Encodes a WAV recording with every codec in RECORDING_CODECS, in this process
+so the CPU time of the encode itself is measured:
+
+    python benchmarks/recording_codec.py --wav recordings/<call>.wav
+
+Without --wav, a synthetic 5-minute 24kHz mono call (speech-like bursts with
+silence between turns) is used; real recordings give more representative
+compression ratios.
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.audio_codec import RECORDING_CODECS, encode_wav_file, wav_header
+
+
+def synthetic_call(path: str, seconds: int, sample_rate: int = 24000):
+    """Alternating turns of modulated harmonics plus noise, and near-silence."""
+    rng = random.Random(0)
+    samples = bytearray()
+    t = 0
+    while t < seconds * sample_rate:
+        turn = int(rng.uniform(1.5, 6) * sample_rate)
+        speaking = rng.random() < 0.7
+        pitch = rng.uniform(110, 240)
+        for i in range(turn):
+            n = t + i
+            if speaking:
+                envelope = 0.5 + 0.5 * math.sin(2 * math.pi * 4 * n / sample_rate)
+                voice = sum(math.sin(2 * math.pi * pitch * h * n / sample_rate) / h for h in (1, 2, 3))
+                value = 6000 * envelope * voice + rng.gauss(0, 300)
+            else:
+                value = rng.gauss(0, 40)
+            samples += int(max(-32768, min(32767, value))).to_bytes(2, "little", signed=True)
+        t += turn
+    with open(path, "wb") as f:
+        f.write(wav_header(sample_rate, 1, len(samples)))
+        f.write(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--wav", help="16-bit PCM WAV recording to encode")
+    parser.add_argument("--seconds", type=int, default=300, help="Length of the synthetic call")
+    parser.add_argument("--repeat", type=int, default=3, help="Encodes per codec; the fastest is reported")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        wav_path = os.path.join(tmp, "call.wav")
+        if args.wav:
+            with open(args.wav, "rb") as src, open(wav_path, "wb") as dst:
+                dst.write(src.read())
+        else:
+            synthetic_call(wav_path, args.seconds)
+        wav_size = os.path.getsize(wav_path)
+        audio_secs = (wav_size - 44) / 2 / 24000 if not args.wav else None
+
+        print(f"{'codec':<6} {'bytes':>12} {'ratio':>7} {'cpu_s':>8} {'wall_s':>8}")
+        for codec in RECORDING_CODECS:
+            out_path = os.path.join(tmp, "encoded" + RECORDING_CODECS[codec][0])
+            best_cpu = best_wall = float("inf")
+            for _ in range(args.repeat):
+                cpu_start, wall_start = time.process_time(), time.perf_counter()
+                size = encode_wav_file(wav_path, out_path, codec)
+                best_cpu = min(best_cpu, time.process_time() - cpu_start)
+                best_wall = min(best_wall, time.perf_counter() - wall_start)
+            print(f"{codec:<6} {size:>12} {wav_size / size:>6.1f}x {best_cpu:>8.3f} {best_wall:>8.3f}")
+
+        if audio_secs:
+            print(f"\n{audio_secs:.0f}s synthetic call, {wav_size} bytes as WAV")
+
+
+if __name__ == "__main__":
+    main()
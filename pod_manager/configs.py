@@ -14,6 +14,8 @@ UVICORN_LOG_LEVEL = os.environ.get("UVICORN_LOG_LEVEL", "info")
 
 DAILY_API_KEY = os.environ.get("DAILY_API_KEY")
 DAILY_API_URL = os.environ.get("DAILY_SAMPLE_ROOM_URL", "https://api.daily.co/v1/")
+ENABLE_LOCAL_TOKEN_MINTING = os.environ.get("ENABLE_LOCAL_TOKEN_MINTING", "false").lower() == "true"
+DAILY_DOMAIN_ID = os.environ.get("DAILY_DOMAIN_ID", "")
 
 
 TTS_PROVIDER=os.environ.get("TTS_PROVIDER", "sarvam")
@@ -50,6 +52,27 @@ ENABLE_LOCAL_STORAGE = os.environ.get("ENABLE_LOCAL_STORAGE", "false").lower() =
 
 MAX_SESSION_TIME = 5 * 60  # seconds or whatever you want
 
+BOT_LAUNCH_MODE = os.environ.get("BOT_LAUNCH_MODE", "subprocess")
+WORKER_POOL_SIZE = int(os.environ.get("WORKER_POOL_SIZE", "1"))
+MAX_SESSIONS_PER_POD = int(os.environ.get("MAX_SESSIONS_PER_POD", "1"))
+ENABLE_BATCHED_INFERENCE = os.environ.get("ENABLE_BATCHED_INFERENCE", "false").lower() == "true"
+ENABLE_ADMISSION_CONTROL = os.environ.get("ENABLE_ADMISSION_CONTROL", "true").lower() == "true"
+ADMISSION_MAX_CPU = os.environ.get("ADMISSION_MAX_CPU", "0.85")
+ADMISSION_MAX_MEMORY = os.environ.get("ADMISSION_MAX_MEMORY", "0.85")
+ADMISSION_MAX_LOOP_LAG = os.environ.get("ADMISSION_MAX_LOOP_LAG", "0.15")
+# Seconds a pod may spend draining its sessions after SIGTERM
+DRAIN_TIMEOUT = int(os.environ.get("DRAIN_TIMEOUT", str(MAX_SESSION_TIME + 30)))
+# Seconds a draining pod spends uploading spooled recordings before it exits
+RECORDING_UPLOAD_DRAIN_TIMEOUT = int(os.environ.get("RECORDING_UPLOAD_DRAIN_TIMEOUT", "60"))
+# Node directory holding the recording spool, so recordings outlive the pod that made them
+RECORDING_SPOOL_HOST_PATH = os.environ.get("RECORDING_SPOOL_HOST_PATH", "/var/lib/ny-voice/recording-spool")
+# Where pods mount it (their RECORDING_SPOOL_DIR)
+RECORDING_SPOOL_DIR = os.environ.get("RECORDING_SPOOL_DIR", "/var/spool/ny-voice/recordings")
+# Node directory holding the TTS audio cache, shared by every pod on the node
+TTS_CACHE_HOST_PATH = os.environ.get("TTS_CACHE_HOST_PATH", "/var/lib/ny-voice/tts-cache")
+# Where pods mount it (their TTS_CACHE_DIR)
+TTS_CACHE_DIR = os.environ.get("TTS_CACHE_DIR", "/var/cache/ny-voice/tts")
+
 
 ROUTER_URL = os.environ.get("ROUTER_URL", "http://router:8082")
 MCP_SERVER_URL = os.getenv("MCP_SERVER_URL", "http://localhost:8000")
@@ -58,6 +81,14 @@ MCP_SERVER_URL = os.getenv("MCP_SERVER_URL", "http://localhost:8000")
 
 REDIS_KEY_WARM_PODS = os.environ.get("REDIS_KEY_WARM_PODS", "ny-voice-warm-pods")
 REDIS_KEY_ACTIVE_PODS = os.environ.get("REDIS_KEY_ACTIVE_PODS", "ny-voice-active-pods")
+REDIS_KEY_POD_SLOTS = os.environ.get("REDIS_KEY_POD_SLOTS", "ny-voice-pod-slots")
+REDIS_KEY_POD_CAPACITY = os.environ.get("REDIS_KEY_POD_CAPACITY", "ny-voice-pod-capacity")
+# Prefix of the keys marking a session's end as handled, so retried reports are ignored
+REDIS_KEY_ENDED_SESSION = os.environ.get("REDIS_KEY_ENDED_SESSION", "ny-voice-ended-session")
+# Seconds a handled session end is remembered
+ENDED_SESSION_TTL = int(os.environ.get("ENDED_SESSION_TTL", "3600"))
+# Capacity reports older than this are ignored when picking a pod
+CAPACITY_STALE_SECS = int(os.environ.get("CAPACITY_STALE_SECS", "30"))
 NAMESPACE = os.environ.get("NAMESPACE", "ny-voicebot")
 IMAGE = os.environ.get("IMAGE", "")
 MIN_IDLE = int(os.environ.get("MIN_IDLE", "3"))
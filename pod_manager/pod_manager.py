@@ -15,6 +15,10 @@ from kafka_logger import KafkaLogProducer
 
 REDIS_KEY_WARM_PODS = configs.REDIS_KEY_WARM_PODS
 REDIS_KEY_ACTIVE_PODS = configs.REDIS_KEY_ACTIVE_PODS
+REDIS_KEY_POD_SLOTS = configs.REDIS_KEY_POD_SLOTS
+REDIS_KEY_POD_CAPACITY = configs.REDIS_KEY_POD_CAPACITY
+REDIS_KEY_ENDED_SESSION = configs.REDIS_KEY_ENDED_SESSION
+CAPACITY_STALE_SECS = configs.CAPACITY_STALE_SECS
 NAMESPACE = configs.NAMESPACE
 IMAGE = configs.IMAGE
 MIN_IDLE = configs.MIN_IDLE
@@ -67,13 +71,33 @@ class DriverParams(BaseModel):
     current_version_of_app: Optional[str] = None
     latest_version_of_app: Optional[str] = None
 
+class CapacityReq(BaseModel):
+    pod_name: str
+    endpoint: str
+    free_slots: int
+    saturated: bool = False
+    cpu: Optional[float] = None
+    memory: Optional[float] = None
+    loop_lag: Optional[float] = None
+
 class RegisterReq(BaseModel):
     pod_name: str
     endpoint: str
+    slots: int = 1
+    capacity: Optional[dict] = None
+
+class DeregisterReq(BaseModel):
+    pod_name: str
+    endpoint: str
 
 class EndReq(BaseModel):
     pod_name: str
     endpoint: str
+    session_id: Optional[str] = None
+    recycle: bool = False
+    exit_code: Optional[int] = None
+    room_url: Optional[str] = None
+    duration: Optional[float] = None
 
 
 
@@ -86,6 +110,26 @@ def async_thread(fn):
 
 
 
+def store_capacity(pod_name: str, capacity: dict):
+    """Remember the last capacity a pod reported, with the time it was received."""
+    redis_client.hset(REDIS_KEY_POD_CAPACITY, pod_name, json.dumps({**capacity, "reported_at": time.time()}))
+
+
+def is_saturated(pod_name: str) -> bool:
+    """True if the pod's latest, still fresh, capacity report says it cannot take a session."""
+    try:
+        report = redis_client.hget(REDIS_KEY_POD_CAPACITY, pod_name)
+    except Exception as e:
+        logger.bind(sessionId=pod_name).warning(f"Redis error reading pod capacity: {e}")
+        return False
+    if not report:
+        return False
+    capacity = json.loads(report)
+    if time.time() - capacity.get("reported_at", 0) > CAPACITY_STALE_SECS:
+        return False
+    return capacity.get("saturated", False) or capacity.get("free_slots", 1) <= 0
+
+
 def ensure_idle_pool():
     """Ensures always 3 warm pods."""
     try:
@@ -130,6 +174,8 @@ def delete_pod(name: str, active_entry: str):
         )
         try:
             redis_client.lrem(REDIS_KEY_ACTIVE_PODS, 0, active_entry)
+            redis_client.hdel(REDIS_KEY_POD_SLOTS, name)
+            redis_client.hdel(REDIS_KEY_POD_CAPACITY, name)
             logger.bind(sessionId=name).info(f"Removed from active pods: {name}")
         except Exception as e:
             logger.bind(sessionId=name).error(f"Redis error when deleting pod: {e}")
@@ -162,9 +208,29 @@ def create_pod():
         ),
         spec=client.V1PodSpec(
             restart_policy="Never",
+            # Leave room for the pod to drain its sessions and recording uploads after SIGTERM
+            termination_grace_period_seconds=configs.DRAIN_TIMEOUT + configs.RECORDING_UPLOAD_DRAIN_TIMEOUT + 30,
             **({"node_selector": {
                 "node-type": "generic-compute-spot"
             }} if configs.ENVIRONMENT == "prod" else {}),
+            # Pods are never restarted; the spool stays on the node for the next pod to upload,
+            # and the TTS cache for the next pod to play from
+            volumes=[
+                client.V1Volume(
+                    name="recording-spool",
+                    host_path=client.V1HostPathVolumeSource(
+                        path=configs.RECORDING_SPOOL_HOST_PATH,
+                        type="DirectoryOrCreate",
+                    ),
+                ),
+                client.V1Volume(
+                    name="tts-cache",
+                    host_path=client.V1HostPathVolumeSource(
+                        path=configs.TTS_CACHE_HOST_PATH,
+                        type="DirectoryOrCreate",
+                    ),
+                ),
+            ],
             containers=[
                 client.V1Container(
                     name="agent",
@@ -177,6 +243,8 @@ def create_pod():
                         client.V1EnvVar(name="UVICORN_LOG_LEVEL", value=configs.UVICORN_LOG_LEVEL),
                         client.V1EnvVar(name="DAILY_API_KEY", value=configs.DAILY_API_KEY or ""),
                         client.V1EnvVar(name="DAILY_SAMPLE_ROOM_URL", value=configs.DAILY_API_URL),
+                        client.V1EnvVar(name="ENABLE_LOCAL_TOKEN_MINTING", value=str(configs.ENABLE_LOCAL_TOKEN_MINTING).lower()),
+                        client.V1EnvVar(name="DAILY_DOMAIN_ID", value=configs.DAILY_DOMAIN_ID),
                         client.V1EnvVar(name="TTS_PROVIDER", value=configs.TTS_PROVIDER),
                         client.V1EnvVar(name="STT_PROVIDER", value=configs.STT_PROVIDER),
                         client.V1EnvVar(name="LLM_PROVIDER", value=configs.LLM_PROVIDER),
@@ -204,6 +272,18 @@ def create_pod():
                         client.V1EnvVar(name="LANGFUSE_BASE_URL", value=configs.LANGFUSE_BASE_URL),
                         client.V1EnvVar(name="LANGFUSE_SECRET_KEY", value=configs.LANGFUSE_SECRET_KEY),
                         client.V1EnvVar(name="LANGFUSE_PUBLIC_KEY", value=configs.LANGFUSE_PUBLIC_KEY),
+                        client.V1EnvVar(name="BOT_LAUNCH_MODE", value=configs.BOT_LAUNCH_MODE),
+                        client.V1EnvVar(name="WORKER_POOL_SIZE", value=str(configs.WORKER_POOL_SIZE)),
+                        client.V1EnvVar(name="MAX_SESSIONS_PER_POD", value=str(configs.MAX_SESSIONS_PER_POD)),
+                        client.V1EnvVar(name="ENABLE_BATCHED_INFERENCE", value=str(configs.ENABLE_BATCHED_INFERENCE).lower()),
+                        client.V1EnvVar(name="ENABLE_ADMISSION_CONTROL", value=str(configs.ENABLE_ADMISSION_CONTROL).lower()),
+                        client.V1EnvVar(name="ADMISSION_MAX_CPU", value=configs.ADMISSION_MAX_CPU),
+                        client.V1EnvVar(name="ADMISSION_MAX_MEMORY", value=configs.ADMISSION_MAX_MEMORY),
+                        client.V1EnvVar(name="ADMISSION_MAX_LOOP_LAG", value=configs.ADMISSION_MAX_LOOP_LAG),
+                        client.V1EnvVar(name="DRAIN_TIMEOUT", value=str(configs.DRAIN_TIMEOUT)),
+                        client.V1EnvVar(name="RECORDING_UPLOAD_DRAIN_TIMEOUT", value=str(configs.RECORDING_UPLOAD_DRAIN_TIMEOUT)),
+                        client.V1EnvVar(name="RECORDING_SPOOL_DIR", value=configs.RECORDING_SPOOL_DIR),
+                        client.V1EnvVar(name="TTS_CACHE_DIR", value=configs.TTS_CACHE_DIR),
                         client.V1EnvVar(
                             name="POD_NAME",
                             value_from=client.V1EnvVarSource(
@@ -217,6 +297,10 @@ def create_pod():
                             )
                         ),
                     ],
+                    volume_mounts=[
+                        client.V1VolumeMount(name="recording-spool", mount_path=configs.RECORDING_SPOOL_DIR),
+                        client.V1VolumeMount(name="tts-cache", mount_path=configs.TTS_CACHE_DIR),
+                    ],
                     resources=client.V1ResourceRequirements(
                         requests={
                             "cpu": POD_CPU,
@@ -276,17 +360,38 @@ def watch_pipecat_pods():
             continue
             
 
+def trim_warm_pods():
+    """
+    Delete idle pods while the warm list holds more than MIN_IDLE entries.
+
+    A pod is only deleted when every one of its slots is in the warm list (no
+    session running on it) and its entries can go without taking the list
+    below MIN_IDLE. Pods are visited newest first, once each.
+    """
+    entries = redis_client.lrange(REDIS_KEY_WARM_PODS, 0, -1)
+    pods = list(dict.fromkeys(reversed(entries)))
+    for pod in pods:
+        idle_count = redis_client.llen(REDIS_KEY_WARM_PODS)
+        if idle_count <= MIN_IDLE:
+            break
+        pod_info = json.loads(pod)
+        slots = int(redis_client.hget(REDIS_KEY_POD_SLOTS, pod_info["pod_name"]) or 1)
+        idle_slots = redis_client.lrange(REDIS_KEY_WARM_PODS, 0, -1).count(pod)
+        if idle_slots < slots or idle_count - idle_slots < MIN_IDLE:
+            continue
+        removed = redis_client.lrem(REDIS_KEY_WARM_PODS, 0, pod)
+        if removed < slots:
+            # A slot was handed out in between; the pod has a session now
+            if removed:
+                redis_client.rpush(REDIS_KEY_WARM_PODS, *([pod] * removed))
+            continue
+        delete_pod(pod_info["pod_name"], pod)
+
+
 def maintain_warm_pods():
     while True:
         try:
-            idle_count = redis_client.llen(REDIS_KEY_WARM_PODS)
-            if idle_count > MIN_IDLE:
-                excess = idle_count - MIN_IDLE
-                for _ in range(excess):
-                    pod = redis_client.rpop(REDIS_KEY_WARM_PODS)
-                    if pod:
-                        pod_info = json.loads(pod)
-                        delete_pod(pod_info["pod_name"], pod)
+            trim_warm_pods()
         except Exception as e:
             logger.error(f"Error maintaining warm pods: {e}")
         time.sleep(300)  
@@ -294,9 +399,13 @@ def maintain_warm_pods():
 
 @app.post("/driver/voice/connect")
 async def assign_call(req: DriverParams):
+    # Saturated pods are put back at the end of the warm list; once every
+    # warm entry has been skipped there is no pod that can take the call.
+    skipped = 0
     while True:
         try:
-            pod = redis_client.lpop(REDIS_KEY_WARM_PODS)
+            all_skipped = skipped and skipped >= redis_client.llen(REDIS_KEY_WARM_PODS)
+            pod = None if all_skipped else redis_client.lpop(REDIS_KEY_WARM_PODS)
         except (redis.ConnectionError, redis.TimeoutError) as e:
             logger.error(f"Redis connection error when assigning call: {e}")
             raise HTTPException(status_code=503, detail="Redis unavailable. Service temporarily unavailable.")
@@ -304,6 +413,10 @@ async def assign_call(req: DriverParams):
             logger.error(f"Redis error when assigning call: {e}")
             raise HTTPException(status_code=503, detail="Service temporarily unavailable.")
 
+        if all_skipped:
+            async_thread(ensure_idle_pool)
+            raise HTTPException(status_code=503, detail="All warm pods are at capacity. Try again shortly.")
+
         if not pod:
             async_thread(ensure_idle_pool)
             raise HTTPException(status_code=503, detail="No warm pods available. Try again immediately.")
@@ -312,6 +425,12 @@ async def assign_call(req: DriverParams):
         pod_endpoint = pod_info["endpoint"]
         pod_name = pod_info["pod_name"]
 
+        if is_saturated(pod_name):
+            logger.bind(sessionId=pod_name, userId=req.phoneNumber).info(f"Pod {pod_name} is at capacity, trying next")
+            redis_client.rpush(REDIS_KEY_WARM_PODS, pod)
+            skipped += 1
+            continue
+
         # Check if pod exists in Kubernetes before making HTTP request
         try:
             k8s.read_namespaced_pod(name=pod_name, namespace=NAMESPACE)
@@ -338,6 +457,16 @@ async def assign_call(req: DriverParams):
                         "latest_version_of_app": req.latest_version_of_app
                     }
                 )
+                if response.status_code == 429:
+                    logger.bind(sessionId=pod_name, userId=req.phoneNumber).warning(f"Pod {pod_name} rejected start-session as over budget, trying next")
+                    store_capacity(pod_name, {"free_slots": 0, "saturated": True})
+                    redis_client.rpush(REDIS_KEY_WARM_PODS, pod)
+                    skipped += 1
+                    continue
+                if response.status_code == 503:
+                    # Draining or out of slots; the pod re-adds its slots itself if it can take more
+                    logger.bind(sessionId=pod_name, userId=req.phoneNumber).warning(f"Pod {pod_name} is not accepting sessions, trying next")
+                    continue
                 response.raise_for_status()
                 redis_client.rpush(REDIS_KEY_ACTIVE_PODS, json.dumps({
                     "pod_name": pod_name,
@@ -347,6 +476,14 @@ async def assign_call(req: DriverParams):
                 return response.json()  
         except Exception as e:
             logger.bind(sessionId=pod_name, userId=req.phoneNumber).error(f"Pod {pod_name} failed to accept start-session: {e}")
+            try:
+                slots = int(redis_client.hget(REDIS_KEY_POD_SLOTS, pod_name) or 1)
+            except Exception:
+                slots = 1
+            if slots > 1:
+                # Other sessions may be running on the pod; keep it and give the slot back
+                redis_client.rpush(REDIS_KEY_WARM_PODS, pod)
+                raise HTTPException(status_code=503, detail="Pod did not accept the session. Retrying recommended.")
             active_entry = json.dumps({
                 "pod_name": pod_name,
                 "endpoint": pod_endpoint
@@ -358,13 +495,17 @@ async def assign_call(req: DriverParams):
 
 @app.post("/register")
 def register_pod(req: RegisterReq):
-    """Pod calls this when it starts."""
+    """Pod calls this when it starts. A pod carrying several sessions gets one warm entry per slot."""
     try:
-        redis_client.rpush(REDIS_KEY_WARM_PODS, json.dumps({
+        entry = json.dumps({
             "pod_name": req.pod_name,
             "endpoint": req.endpoint
-        }))
-        logger.bind(sessionId=req.pod_name).info(f"Registered warm pod → {req.pod_name}")
+        })
+        redis_client.rpush(REDIS_KEY_WARM_PODS, *([entry] * max(req.slots, 1)))
+        redis_client.hset(REDIS_KEY_POD_SLOTS, req.pod_name, max(req.slots, 1))
+        if req.capacity:
+            store_capacity(req.pod_name, req.capacity)
+        logger.bind(sessionId=req.pod_name).info(f"Registered warm pod → {req.pod_name} ({req.slots} slots)")
     except (redis.ConnectionError, redis.TimeoutError) as e:
         logger.bind(sessionId=req.pod_name).error(f"Redis connection error when registering pod: {e}")
         return {"status": "registered", "warning": "Redis unavailable, registration may not persist"}
@@ -376,14 +517,76 @@ def register_pod(req: RegisterReq):
 
 
 
+@app.post("/capacity")
+def report_capacity(req: CapacityReq):
+    """Pods push their remaining capacity here periodically and whenever they start rejecting sessions."""
+    try:
+        store_capacity(req.pod_name, req.dict(exclude={"pod_name", "endpoint"}))
+    except Exception as e:
+        logger.bind(sessionId=req.pod_name).error(f"Redis error when storing pod capacity: {e}")
+        raise HTTPException(status_code=503, detail="Redis unavailable")
+    if req.saturated:
+        logger.bind(sessionId=req.pod_name).warning(
+            f"Pod {req.pod_name} saturated: cpu={req.cpu}, memory={req.memory}, loop_lag={req.loop_lag}"
+        )
+    return {"status": "ok"}
+
+
+@app.post("/deregister")
+def deregister_pod(req: DeregisterReq):
+    """A draining pod calls this so no new session is sent to it. Its active sessions are untouched."""
+    entry = json.dumps({
+        "pod_name": req.pod_name,
+        "endpoint": req.endpoint
+    })
+    try:
+        removed = redis_client.lrem(REDIS_KEY_WARM_PODS, 0, entry)
+        logger.bind(sessionId=req.pod_name).info(f"Deregistered pod → {req.pod_name} ({removed} warm slots removed)")
+    except Exception as e:
+        logger.bind(sessionId=req.pod_name).error(f"Redis error when deregistering pod: {e}")
+        raise HTTPException(status_code=503, detail="Redis unavailable")
+    async_thread(ensure_idle_pool)
+    return {"status": "deregistered", "removed": removed}
+
+
 @app.post("/session-ended")
 def end_call(req: EndReq):
-    """Pod notifies pod_manager it is done. Pod Manager deletes pod."""
-    logger.bind(sessionId=req.pod_name).info(f"Deleting pod after session → {req.pod_name}")
+    """
+    Pod notifies pod_manager it is done. Pod Manager deletes pod, or, when the
+    pod asks to recycle, moves the freed slot back to the warm list.
+
+    Pods retry this call, so a report carrying a session_id is only acted on
+    the first time it arrives.
+    """
+    logger.bind(sessionId=req.pod_name).info(
+        f"Session ended on {req.pod_name}: session_id={req.session_id}, exit_code={req.exit_code}, "
+        f"room_url={req.room_url}, duration={req.duration}"
+    )
+    if req.session_id:
+        try:
+            first_report = redis_client.set(
+                f"{REDIS_KEY_ENDED_SESSION}:{req.session_id}", req.pod_name, nx=True, ex=configs.ENDED_SESSION_TTL
+            )
+        except Exception as e:
+            logger.bind(sessionId=req.pod_name).error(f"Redis error when checking session end: {e}")
+            raise HTTPException(status_code=503, detail="Redis unavailable")
+        if not first_report:
+            logger.bind(sessionId=req.pod_name).info(f"Session {req.session_id} end already handled, ignoring retry")
+            return {"status": "duplicate"}
     active_entry = json.dumps({
         "pod_name": req.pod_name,
         "endpoint": req.endpoint
     })
+    if req.recycle:
+        try:
+            redis_client.lrem(REDIS_KEY_ACTIVE_PODS, 1, active_entry)
+            redis_client.rpush(REDIS_KEY_WARM_PODS, active_entry)
+            logger.bind(sessionId=req.pod_name).info(f"Recycled session slot → {req.pod_name}")
+            return {"status": "recycled"}
+        except Exception as e:
+            logger.bind(sessionId=req.pod_name).error(f"Redis error when recycling slot, deleting pod: {e}")
+
+    logger.bind(sessionId=req.pod_name).info(f"Deleting pod after session → {req.pod_name}")
     async_thread(lambda: delete_pod(req.pod_name, active_entry))
     return {"status": "deleted"}
 
@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
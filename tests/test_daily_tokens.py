@@ -0,0 +1,109 @@
+import asyncio
+import base64
+import json
+
+from app.core.daily_tokens import MintingDailyRESTHelper, mint_meeting_token
+
+
+API_KEY = "test-api-key"
+DOMAIN_ID = "0b1c2d3e-4f50-6172-8394-a5b6c7d8e9f0"
+# HS256 over the header and payload below with API_KEY, checked with
+# `openssl dgst -sha256 -hmac test-api-key`
+EXPECTED_TOKEN = (
+    "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9"
+    ".eyJkIjoiMGIxYzJkM2UtNGY1MC02MTcyLTgzOTQtYTViNmM3ZDhlOWYwIiwiZWplIjoxODAwLCJleHAiOjE3NjAwMDM2MDAsImlhdCI6"
+    "MTc2MDAwMDAwMCwibyI6dHJ1ZSwiciI6InBvb2wtM2Y5YSJ9"
+    ".MN6u-D54rfUEMmNh7z9ZKqfxuj6jAEvm0h_duGBSyRQ"
+)
+
+
+def _decode(segment: str) -> dict:
+    return json.loads(base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4)))
+
+
+def _mint(**kwargs) -> str:
+    return mint_meeting_token(
+        api_key=API_KEY,
+        domain_id=DOMAIN_ID,
+        room_name="pool-3f9a",
+        expires_at=1760003600,
+        eject_after_elapsed=1800,
+        issued_at=1760000000,
+        **kwargs,
+    )
+
+
+def test_mint_meeting_token_matches_known_vector():
+    assert _mint() == EXPECTED_TOKEN
+
+
+def test_mint_meeting_token_claims():
+    header, payload, _ = _mint().split(".")
+    assert _decode(header) == {"alg": "HS256", "typ": "JWT"}
+    assert _decode(payload) == {
+        "d": DOMAIN_ID,
+        "r": "pool-3f9a",
+        "o": True,
+        "exp": 1760003600,
+        "iat": 1760000000,
+        "eje": 1800,
+    }
+
+
+def test_mint_meeting_token_optional_claims():
+    _, payload, _ = _mint(owner=False, eject_at_token_exp=True).split(".")
+    claims = _decode(payload)
+    assert claims["o"] is False
+    assert claims["ejt"] is True
+
+
+class FakeResponse:
+    def __init__(self, status: int, body: dict):
+        self.status = status
+        self._body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def json(self):
+        return self._body
+
+    async def text(self):
+        return json.dumps(self._body)
+
+
+class FakeSession:
+    def __init__(self, response: FakeResponse):
+        self.response = response
+        self.requests = []
+
+    def get(self, url, headers=None):
+        self.requests.append((url, headers))
+        return self.response
+
+
+class FakeRest:
+    daily_api_url = "https://api.daily.co/v1"
+
+    def __init__(self, response: FakeResponse):
+        self.aiohttp_session = FakeSession(response)
+
+
+def _check_domain(response: FakeResponse) -> bool:
+    helper = MintingDailyRESTHelper(FakeRest(response), api_key=API_KEY, domain_id=DOMAIN_ID)
+    return asyncio.run(helper.check_domain())
+
+
+def test_check_domain_accepts_the_api_keys_domain():
+    assert _check_domain(FakeResponse(200, {"domain_name": "ny", "domain_id": DOMAIN_ID}))
+
+
+def test_check_domain_rejects_another_domain():
+    assert not _check_domain(FakeResponse(200, {"domain_name": "other", "domain_id": "not-" + DOMAIN_ID}))
+
+
+def test_check_domain_assumes_minting_works_when_daily_cannot_be_asked():
+    assert _check_domain(FakeResponse(500, {"error": "server-error"}))
@@ -0,0 +1,140 @@
+import asyncio
+import itertools
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import room_pool
+from app.core.room_pool import DailyRoomPool
+
+
+class InMemoryRoomProvider:
+    """DailyRoomProvider that hands out numbered rooms without calling Daily."""
+
+    def __init__(self):
+        self._ids = itertools.count()
+        self.rooms = []
+        self.tokens = []
+
+    async def create_room(self, params):
+        room = SimpleNamespace(url=f"https://test.daily.co/room-{next(self._ids)}", params=params)
+        self.rooms.append(room)
+        return room
+
+    async def get_token(self, room_url, expiry_time=60 * 60, eject_at_token_exp=False, owner=True, params=None):
+        token = f"token-for-{room_url.rsplit('/', 1)[-1]}"
+        self.tokens.append((room_url, expiry_time, params))
+        return token
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controls time.time() as the pool sees it."""
+    now = [1_760_000_000.0]
+    monkeypatch.setattr(room_pool.time, "time", lambda: now[0])
+    return now
+
+
+async def _wait_for(condition, timeout: float = 1):
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+def _pool(rest, size=2):
+    return DailyRoomPool(rest=rest, size=size, room_ttl=600, session_time=300, margin=30, check_interval=60)
+
+
+def test_refills_to_size_and_after_each_hit(clock):
+    async def scenario():
+        rest = InMemoryRoomProvider()
+        pool = _pool(rest)
+        pool.start()
+        try:
+            await _wait_for(lambda: pool.stats()["ready"] == 2)
+            assert len(rest.rooms) == 2
+            # Pooled rooms and tokens live for room_ttl + session_time
+            assert all(expiry_time == 900 for _, expiry_time, _ in rest.tokens)
+
+            room = await pool.acquire()
+            assert room.room_url == rest.rooms[0].url
+            assert room.token == "token-for-room-0"
+            await _wait_for(lambda: pool.stats()["ready"] == 2)
+            assert len(rest.rooms) == 3
+        finally:
+            await pool.stop()
+
+    asyncio.run(scenario())
+
+
+def test_counts_hits_and_misses(clock):
+    async def scenario():
+        rest = InMemoryRoomProvider()
+        pool = _pool(rest, size=1)
+        await pool._refill()
+
+        marks = {}
+        await pool.acquire(marks)
+        assert marks["room_created"] == marks["token_issued"]
+        # Not started, so nothing refills the pool and the next one is created on the spot
+        room = await pool.acquire()
+        stats = pool.stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+        assert room.room_url == rest.rooms[1].url
+        # A room created on a miss only needs to last one session
+        assert rest.tokens[-1][1] == 300
+
+    asyncio.run(scenario())
+
+
+def test_discards_rooms_that_cannot_carry_a_full_session(clock):
+    async def scenario():
+        rest = InMemoryRoomProvider()
+        pool = _pool(rest)
+        await pool._refill()
+
+        # 900s rooms are usable while at least session_time + margin = 330s remain
+        clock[0] += 570
+        assert pool.stats()["ready"] == 2
+        await pool.acquire()
+        assert pool.stats()["discarded"] == 0
+
+        clock[0] += 1
+        room = await pool.acquire()
+        stats = pool.stats()
+        assert stats["discarded"] == 1
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+        assert room.room_url == rest.rooms[2].url
+
+        await pool._refill()
+        assert pool.stats()["ready"] == 2
+        assert [room.room_url for room in pool._rooms] == [rest.rooms[3].url, rest.rooms[4].url]
+
+    asyncio.run(scenario())
+
+
+def test_refill_errors_are_counted_and_retried(clock):
+    async def scenario():
+        rest = InMemoryRoomProvider()
+        create_room = rest.create_room
+        failures = [RuntimeError("daily down")]
+
+        async def flaky_create_room(params):
+            if failures:
+                raise failures.pop()
+            return await create_room(params)
+
+        rest.create_room = flaky_create_room
+        pool = _pool(rest, size=1)
+        pool.start()
+        try:
+            await _wait_for(lambda: pool.stats()["refill_errors"] == 1)
+            # The next acquire wakes the refill loop
+            await pool.acquire()
+            await _wait_for(lambda: pool.stats()["ready"] == 1)
+        finally:
+            await pool.stop()
+
+    asyncio.run(scenario())